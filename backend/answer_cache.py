@@ -0,0 +1,198 @@
+"""
+Shared cache of LLM answers to player questions.
+
+Players keep asking the same things about the same words ("is it an animal?"
+for "tiger"). Each of those was a fresh OpenRouter call, and the response
+cache in llm_cache.py only helps when the raw prompt text is byte-for-byte
+identical. Answers are cached here by (word, normalized question). The
+question is normalized the same way GameLogic.ask_question does for its
+duplicate check, so "Is it an animal?" and "is it  an animal" share an entry.
+
+The word itself is never stored:
+    - the key is HMAC-SHA256 of word and question, under a secret kept
+      outside the database (ANSWER_CACHE_SECRET, or a random key file
+      created next to it)
+    - answers that mention the word are not cached
+
+Rows expire after ANSWER_CACHE_TTL_S. The least recently used rows go once
+there are more than ANSWER_CACHE_MAX_ENTRIES. stats() reports this process's
+hit rate and the API calls saved across all processes (per-row hit counts).
+
+Env:
+    ANSWER_CACHE_ENABLED=true
+    ANSWER_CACHE_PATH=game_data/answer_cache.sqlite3
+    ANSWER_CACHE_TTL_S=604800
+    ANSWER_CACHE_MAX_ENTRIES=50000
+    ANSWER_CACHE_SECRET=              (default: random key in <ANSWER_CACHE_PATH>.key)
+"""
+
+import os
+import re
+import hmac
+import time
+import sqlite3
+import hashlib
+import logging
+import secrets
+import threading
+from typing import Dict, Optional
+from .env_utils import env_float
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ANSWER_CACHE_PATH = os.path.join('game_data', 'answer_cache.sqlite3')
+
+# Evict at most this often (seconds); between sweeps the table may briefly exceed the cap
+_EVICT_INTERVAL_S = 30.0
+
+
+def normalize_question(question: str) -> str:
+    """Lower-case, drop punctuation, collapse whitespace (GameLogic.ask_question's duplicate check)."""
+    normalized = re.sub(r'[^\w\s]', '', (question or '').lower()).strip()
+    return ' '.join(normalized.split())
+
+
+def _load_secret(path: str) -> bytes:
+    env = os.getenv('ANSWER_CACHE_SECRET', '')
+    if env:
+        return env.encode('utf-8')
+    key_path = f"{path}.key"
+    try:
+        with open(key_path, 'rb') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        pass
+    key = secrets.token_hex(32).encode('ascii')
+    try:
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(key)
+        return key
+    except FileExistsError:
+        # Another process created it first
+        with open(key_path, 'rb') as f:
+            return f.read().strip()
+
+
+class AnswerCache:
+    """SQLite-backed TTL + LRU cache of answers keyed by a keyed hash of (word, question)."""
+
+    def __init__(self, path: str, ttl_s: float = 7 * 86400, max_entries: int = 50000):
+        self.path = path
+        self.ttl_s = max(0.0, float(ttl_s))
+        self.max_entries = max(1, int(max_entries))
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._secret = _load_secret(path)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'stores': 0, 'rejected': 0}
+        self._last_evict = 0.0
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS answer_cache ("
+            " key TEXT PRIMARY KEY, answer TEXT NOT NULL, created_at REAL NOT NULL,"
+            " expires_at REAL NOT NULL, last_access REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS answer_cache_last_access ON answer_cache(last_access)")
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def key(self, word: str, question: str) -> str:
+        message = f"{(word or '').strip().lower()}\x00{normalize_question(question)}".encode('utf-8')
+        return hmac.new(self._secret, message, hashlib.sha256).hexdigest()
+
+    def get(self, word: str, question: str) -> Optional[str]:
+        if self.ttl_s <= 0:
+            return None
+        now = time.time()
+        key = self.key(word, question)
+        conn = self._conn()
+        row = conn.execute("SELECT answer, expires_at FROM answer_cache WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] <= now:
+            self._count('misses')
+            return None
+        conn.execute("UPDATE answer_cache SET last_access = ?, hits = hits + 1 WHERE key = ?", (now, key))
+        conn.commit()
+        self._count('hits')
+        return row[0]
+
+    def put(self, word: str, question: str, answer: str) -> bool:
+        """Cache an API answer; refuses empty answers and answers that mention the word."""
+        word_l = (word or '').strip().lower()
+        answer = (answer or '').strip()
+        if self.ttl_s <= 0 or not answer or not word_l:
+            return False
+        if word_l in answer.lower():
+            self._count('rejected')
+            return False
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO answer_cache (key, answer, created_at, expires_at, last_access, hits)"
+            " VALUES (?, ?, ?, ?, ?, 0)",
+            (self.key(word, question), answer, now, now + self.ttl_s, now),
+        )
+        conn.commit()
+        self._count('stores')
+        if now - self._last_evict >= _EVICT_INTERVAL_S:
+            self._last_evict = now
+            self.evict(now)
+        return True
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """Drop expired rows, then the least recently used beyond max_entries."""
+        now = time.time() if now is None else now
+        conn = self._conn()
+        removed = conn.execute("DELETE FROM answer_cache WHERE expires_at <= ?", (now,)).rowcount or 0
+        (total,) = conn.execute("SELECT COUNT(*) FROM answer_cache").fetchone()
+        if total > self.max_entries:
+            removed += conn.execute(
+                "DELETE FROM answer_cache WHERE key IN"
+                " (SELECT key FROM answer_cache ORDER BY last_access ASC LIMIT ?)",
+                (total - self.max_entries,),
+            ).rowcount or 0
+        conn.commit()
+        return removed
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self._counters)
+        entries, saved = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM answer_cache").fetchone()
+        lookups = counters['hits'] + counters['misses']
+        return dict(counters, entries=entries, api_calls_saved=saved,
+                    hit_rate=(counters['hits'] / lookups) if lookups else 0.0)
+
+
+_cache: Optional[AnswerCache] = None
+_cache_lock = threading.Lock()
+_cache_failed = False
+
+
+def get_answer_cache() -> Optional[AnswerCache]:
+    """Process-wide AnswerCache from env, or None when disabled/unavailable."""
+    global _cache, _cache_failed
+    if os.getenv('ANSWER_CACHE_ENABLED', 'true').strip().lower() not in ('1', 'true', 'yes', 'on'):
+        return None
+    if _cache is None and not _cache_failed:
+        with _cache_lock:
+            if _cache is None and not _cache_failed:
+                path = os.getenv('ANSWER_CACHE_PATH', DEFAULT_ANSWER_CACHE_PATH)
+                try:
+                    _cache = AnswerCache(path, env_float('ANSWER_CACHE_TTL_S', 7 * 86400),
+                                         int(env_float('ANSWER_CACHE_MAX_ENTRIES', 50000)))
+                except Exception as e:
+                    _cache_failed = True
+                    logger.warning(f"[ANSWER_CACHE] unavailable at '{path}': {e}")
+    return _cache
@@ -0,0 +1,467 @@
+"""
+Offline yes/no attribute table for corpus words.
+
+Free-form questions like "is it alive?", "can you eat it?" or "is it bigger
+than a car?" used to go to OpenRouter every time. ATTRIBUTE_QUESTIONS maps the
+common phrasings to a small set of attributes, with one compiled matcher
+(same approach as backend/word_features.py). The answer comes from a table of
+(category, word) -> {attribute: true/false}, which lives next to the hints
+corpus in backend/data/attributes.json.
+
+The table holds per-word values only. CATEGORY_DEFAULTS (e.g. animals are
+alive) are category-wide guesses that do not hold for every corpus entry, so
+they are never written into the table; default() offers them as a weaker
+answer for when the API cannot be asked.
+
+On a miss, answer_question asks the API as before. If the reply starts with a
+plain yes or no, it is written back to a small SQLite overlay
+(ATTRIBUTE_TABLE_LEARNED_PATH). `merge` folds the overlay into the JSON table.
+
+Building the table:
+    python -m backend.attribute_table build --source hints        (hint keywords, offline)
+    python -m backend.attribute_table build --source llm --categories animals,food --concurrency 4
+    python -m backend.attribute_table merge                        (fold learned answers into the JSON)
+    python -m backend.attribute_table stats
+    python -m backend.attribute_table ask animals cat "Can it fly?"
+
+Env:
+    ATTRIBUTE_TABLE_ENABLED=true
+    ATTRIBUTE_TABLE_PATH=backend/data/attributes.json
+    ATTRIBUTE_TABLE_LEARNED_PATH=game_data/attributes_learned.sqlite3
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .word_features import normalize_question
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ATTRIBUTE_TABLE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'attributes.json')
+DEFAULT_LEARNED_PATH = os.path.join('game_data', 'attributes_learned.sqlite3')
+
+# attribute -> description used in the LLM build prompt
+ATTRIBUTES = {
+    'alive': 'is a living thing',
+    'animal': 'is an animal',
+    'plant': 'is a plant',
+    'person': 'is a person',
+    'edible': 'can be eaten',
+    'man_made': 'is made by people rather than occurring in nature',
+    'electronic': 'is electronic or needs electricity',
+    'bigger_than_car': 'is bigger than a car',
+    'fits_in_hand': 'can be held in one hand',
+    'found_indoors': 'is commonly found indoors',
+    'can_fly': 'can fly',
+    'lives_in_water': 'lives in water',
+    'has_legs': 'has legs',
+    'place': 'is a place or location',
+    'used_daily': 'is used by most people every day',
+    'physical_object': 'is a physical thing you can touch',
+}
+
+_IT = r'(?:it|they|this|that|the word|this word|the thing)'
+_BE = r'(?:is|are) ' + _IT + r' '
+_YOU = r'(?:you|i|we|one|people|someone|a person)'
+
+# (attribute, polarity, pattern) in priority order; polarity False means a "yes" is attribute=false.
+ATTRIBUTE_QUESTIONS = [
+    ('bigger_than_car', True, _BE + r'(?:bigger|larger) than an? (?:car|automobile)'),
+    ('bigger_than_car', False, _BE + r'smaller than an? (?:car|automobile)'),
+    ('man_made', True, _BE + r'(?:an? )?(?:man made|manmade|human made|artificial|manufactured|made by (?:humans|people|man))(?: object| thing| item)?'),
+    ('man_made', False, _BE + r'(?:natural|(?:found )?in nature|naturally occurring)(?: object| thing)?'),
+    ('alive', True, _BE + r'(?:an? )?(?:alive|living|living (?:thing|creature|being|organism))'),
+    ('alive', True, r'(?:does|do) ' + _IT + r' (?:live|breathe)'),
+    ('alive', False, _BE + r'(?:an? )?(?:dead|inanimate|non ?living)(?: object| thing)?'),
+    ('animal', True, _BE + r'(?:an? )?(?:animal|creature)s?'),
+    ('plant', True, _BE + r'(?:an? )?(?:plant|tree|flower)s?'),
+    ('person', True, _BE + r'(?:an? )?(?:person|human|people|real person|human being)'),
+    ('edible', True, r'(?:can|could|do|would|will) ' + _YOU + r' eat ' + _IT),
+    ('edible', True, _BE + r'(?:edible|food|eaten|something (?:you|to) eat)'),
+    ('edible', False, _BE + r'inedible'),
+    ('electronic', True, _BE + r'(?:an? )?(?:electronic|electrical|electric)(?: device| thing| object| item| gadget)?'),
+    ('electronic', True, r'(?:does|do) ' + _IT + r' (?:use|need|run on|require) (?:electricity|power|batteries|a battery)'),
+    ('fits_in_hand', True, r'(?:can|could) ' + _YOU + r' (?:hold|carry|pick up) ' + _IT + r'(?: in (?:your|one|a|my) hands?| with one hand)?'),
+    ('fits_in_hand', True, r'(?:does|do|would|will|can|could) ' + _IT + r' fit in (?:your|a|my|one) (?:hand|pocket)'),
+    ('found_indoors', True, r'(?:can|could|would|do|will) ' + _YOU + r' (?:find|see|keep|have) ' + _IT + r' (?:indoors|inside|in (?:a|the|your|my) (?:house|home))'),
+    ('found_indoors', True, _BE + r'(?:found |kept |used )?(?:indoors|inside|in (?:a|the|your) (?:house|home))'),
+    ('can_fly', True, r'(?:can|does|do) ' + _IT + r' fly'),
+    ('lives_in_water', True, r'(?:does|do) ' + _IT + r' live in (?:the )?(?:water|sea|ocean)'),
+    ('lives_in_water', True, _BE + r'(?:aquatic|a sea creature|a marine animal|found in (?:the )?(?:water|sea|ocean))'),
+    ('has_legs', True, r'(?:does|do) ' + _IT + r' have legs'),
+    ('place', True, _BE + r'an? (?:place|location|city|country|continent)'),
+    ('place', True, r'(?:can|could) ' + _YOU + r' (?:go|travel) (?:to )?(?:it|there)'),
+    ('used_daily', True, r'(?:do|would|could) ' + _YOU + r' use ' + _IT + r' (?:every ?day|daily)'),
+    ('used_daily', True, _BE + r'used (?:every ?day|daily)'),
+    ('physical_object', True, _BE + r'an? (?:physical|tangible|real) (?:object|thing)'),
+    ('physical_object', True, r'(?:can|could) ' + _YOU + r' touch ' + _IT),
+    ('physical_object', False, _BE + r'(?:an? )?(?:abstract|idea|concept|feeling|emotion)(?: idea| concept| thing)?'),
+]
+
+_ATTRIBUTE_MATCHER = re.compile(
+    '^(?:' + '|'.join(f'(?P<q{i}>{p})' for i, (_, _, p) in enumerate(ATTRIBUTE_QUESTIONS)) + ')$')
+_YES_NO = re.compile(r'^\W*(yes|no)\b', re.IGNORECASE)
+
+
+def match_attribute(question: str) -> Optional[Tuple[str, bool]]:
+    """Return (attribute, polarity) for a common yes/no question form, or None."""
+    m = _ATTRIBUTE_MATCHER.match(normalize_question(question))
+    if m is None:
+        return None
+    attribute, polarity, _ = ATTRIBUTE_QUESTIONS[int(m.lastgroup[1:])]
+    return attribute, polarity
+
+
+def parse_yes_no(answer: str) -> Optional[bool]:
+    m = _YES_NO.match(answer or '')
+    return None if m is None else m.group(1).lower() == 'yes'
+
+
+def _norm(value: str) -> str:
+    return str(value or '').strip().lower()
+
+
+class AttributeTable:
+    """(category, word) -> {attribute: bool} from the JSON table, plus answers learned at runtime."""
+
+    def __init__(self, path: str, learned_path: Optional[str] = None):
+        self.path = path
+        self.learned_path = learned_path
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._table: Dict[str, Dict[str, Dict[str, bool]]] = {}
+        self._mtime = None
+        self._load()
+        if learned_path:
+            os.makedirs(os.path.dirname(os.path.abspath(learned_path)), exist_ok=True)
+            conn = self._conn()
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS learned ("
+                " category TEXT NOT NULL, word TEXT NOT NULL, attribute TEXT NOT NULL, value INTEGER NOT NULL,"
+                " source TEXT, model TEXT, created_at REAL NOT NULL, PRIMARY KEY (category, word, attribute))"
+            )
+            conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.learned_path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _load(self) -> None:
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        with self._lock:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._table = {
+                _norm(category): {_norm(word): dict(attrs) for word, attrs in (words or {}).items()}
+                for category, words in ((data or {}).get('attributes') or {}).items()
+            }
+            self._mtime = mtime
+
+    def get(self, category: str, word: str, attribute: str) -> Optional[bool]:
+        value = self._table.get(_norm(category), {}).get(_norm(word), {}).get(attribute)
+        if value is not None:
+            return bool(value)
+        if self.learned_path:
+            row = self._conn().execute(
+                "SELECT value FROM learned WHERE category = ? AND word = ? AND attribute = ?",
+                (_norm(category), _norm(word), attribute),
+            ).fetchone()
+            if row is not None:
+                return bool(row[0])
+        return None
+
+    def lookup(self, category: str, word: str, attribute: str, polarity: bool = True) -> Optional[bool]:
+        """Yes/no answer to a matched question, or None when the table does not know."""
+        value = self.get(category, word, attribute)
+        return None if value is None else value == polarity
+
+    def default(self, category: str, attribute: str, polarity: bool = True) -> Optional[bool]:
+        """Category-wide guess for a matched question (CATEGORY_DEFAULTS); only for when the API is unavailable."""
+        value = CATEGORY_DEFAULTS.get(_norm(category), {}).get(attribute)
+        return None if value is None else value == polarity
+
+    def learn(self, category: str, word: str, attribute: str, value: bool, source: str = 'api',
+              model: Optional[str] = None) -> None:
+        if not self.learned_path:
+            return
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO learned (category, word, attribute, value, source, model, created_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (_norm(category), _norm(word), attribute, int(bool(value)), source, model, time.time()),
+        )
+        conn.commit()
+
+    def learn_answer(self, category: str, word: str, attribute: str, polarity: bool, answer: str,
+                     model: Optional[str] = None) -> bool:
+        """Store an API answer to a matched question if it is a plain yes/no; returns True if stored."""
+        said_yes = parse_yes_no(answer)
+        if said_yes is None:
+            return False
+        self.learn(category, word, attribute, said_yes == polarity, model=model)
+        return True
+
+    def learned_rows(self) -> List[Tuple[str, str, str, bool]]:
+        if not self.learned_path:
+            return []
+        rows = self._conn().execute("SELECT category, word, attribute, value FROM learned").fetchall()
+        return [(c, w, a, bool(v)) for c, w, a, v in rows]
+
+    def stats(self) -> Dict:
+        by_category = {c: len(words) for c, words in sorted(self._table.items())}
+        return {
+            'words': sum(by_category.values()),
+            'values': sum(len(a) for words in self._table.values() for a in words.values()),
+            'by_category': by_category,
+            'learned': len(self.learned_rows()),
+        }
+
+
+_table: Optional[AttributeTable] = None
+_table_lock = threading.Lock()
+_table_failed = False
+
+
+def get_attribute_table() -> Optional[AttributeTable]:
+    """Process-wide AttributeTable from env, or None when disabled/unavailable."""
+    global _table, _table_failed
+    if os.getenv('ATTRIBUTE_TABLE_ENABLED', 'true').strip().lower() not in ('1', 'true', 'yes', 'on'):
+        return None
+    if _table is None and not _table_failed:
+        with _table_lock:
+            if _table is None and not _table_failed:
+                path = os.getenv('ATTRIBUTE_TABLE_PATH', DEFAULT_ATTRIBUTE_TABLE_PATH)
+                learned = os.getenv('ATTRIBUTE_TABLE_LEARNED_PATH', DEFAULT_LEARNED_PATH)
+                try:
+                    _table = AttributeTable(path, learned or None)
+                except Exception as e:
+                    _table_failed = True
+                    logger.warning(f"[ATTR_TABLE] unavailable at '{path}': {e}")
+    return _table
+
+
+# ---- building the table ----
+
+# Values that hold for most words of a corpus category. The corpus has odd entries (an animals
+# 'reel', a places 'Eiffel'), so these are guesses: never stored per word, see AttributeTable.default.
+CATEGORY_DEFAULTS = {
+    'animals': {'alive': True, 'animal': True, 'plant': False, 'person': False, 'man_made': False,
+                'electronic': False, 'place': False, 'physical_object': True},
+    'food': {'edible': True, 'person': False, 'place': False, 'electronic': False, 'bigger_than_car': False,
+             'physical_object': True},
+    'places': {'place': True, 'alive': False, 'animal': False, 'person': False, 'edible': False,
+               'electronic': False, 'fits_in_hand': False, 'can_fly': False, 'bigger_than_car': True},
+    'cities': {'place': True, 'alive': False, 'animal': False, 'plant': False, 'person': False, 'edible': False,
+               'electronic': False, 'fits_in_hand': False, 'can_fly': False, 'bigger_than_car': True,
+               'found_indoors': False},
+    'medicines': {'alive': False, 'animal': False, 'plant': False, 'person': False, 'place': False,
+                  'electronic': False, 'bigger_than_car': False, 'fits_in_hand': True, 'can_fly': False},
+    'anatomy': {'animal': False, 'plant': False, 'person': False, 'place': False, 'electronic': False,
+                'man_made': False, 'can_fly': False, 'bigger_than_car': False},
+}
+
+# (category, attribute, value, pattern over the joined hints text, pattern that vetoes it)
+HINT_KEYWORDS = [
+    ('animals', 'can_fly', False, r'\b(?:flightless|cannot fly|can\'t fly|unable to fly)\b', None),
+    ('animals', 'can_fly', True, r'\b(?:flies|flying|soars?|wingspan|in flight)\b', r'\b(?:flightless|cannot fly|can\'t fly)\b'),
+]
+
+
+def attributes_from_hints(category: str, hints: Iterable[str]) -> Dict[str, bool]:
+    """Conservative keyword evidence from the hint texts."""
+    category = _norm(category)
+    out: Dict[str, bool] = {}
+    text = ' '.join(str(h) for h in hints or []).lower()
+    for cat, attribute, value, pattern, veto in HINT_KEYWORDS:
+        if cat != category or attribute in out:
+            continue
+        if re.search(pattern, text) and not (veto and re.search(veto, text)):
+            out[attribute] = value
+    return out
+
+
+class OpenRouterAttributeGenerator:
+    """Asks an OpenRouter-compatible chat endpoint for every attribute of one word."""
+
+    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None, model: Optional[str] = None):
+        from .http_client import HttpClient, chat_completions_url
+        self.url = f"{base_url.rstrip('/')}/chat/completions" if base_url else chat_completions_url()
+        self.model = model or os.getenv('OPENROUTER_MODEL', 'openai/gpt-4o-mini')
+        self.headers = {
+            'Authorization': f"Bearer {api_key or os.getenv('OPENROUTER_API_KEY', '')}",
+            'Content-Type': 'application/json',
+        }
+        self.http = HttpClient()
+
+    def __call__(self, word: str, category: str) -> Dict[str, bool]:
+        listing = '\n'.join(f"- {name}: {desc}" for name, desc in ATTRIBUTES.items())
+        messages = [
+            {"role": "system", "content": (
+                "You label words for a yes/no guessing game. For the given word (in the given category), answer "
+                "each property with true or false as most players would, or null if it is unclear. Return only a "
+                "JSON object mapping property name to true/false/null.\n" + listing)},
+            {"role": "user", "content": f"Category: {category}\nWord: {word}"},
+        ]
+        response = self.http.post(self.url, json={"model": self.model, "messages": messages},
+                                  headers=self.headers, timeout=self.http.timeout())
+        response.raise_for_status()
+        content = response.json()["choices"][0]["message"]["content"]
+        start, end = content.find('{'), content.rfind('}')
+        data = json.loads(content[start:end + 1]) if start >= 0 and end > start else {}
+        return {k: v for k, v in data.items() if k in ATTRIBUTES and isinstance(v, bool)}
+
+
+def _load_json(path: str) -> Dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {'version': 1, 'attributes': {}}
+
+
+def _write_json_atomic(path: str, data: Dict) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp, path)
+
+
+def build_table(path: str, corpus: Dict[str, Dict[str, List[str]]], source: str = 'hints', generate=None,
+                concurrency: int = 4, flush_every: int = 50, limit: int = 0) -> Dict:
+    """Fill missing attribute values for every (category, word) in `corpus` ({category: {word: hints}}).
+
+    Existing values are never overwritten, so an interrupted llm build resumes where it stopped.
+    """
+    data = _load_json(path)
+    table = data.setdefault('attributes', {})
+    stats = {'words': 0, 'values_added': 0, 'failed': 0}
+    if source == 'hints':
+        for category, words in corpus.items():
+            for word, hints in words.items():
+                attrs = attributes_from_hints(category, hints)
+                if not attrs:
+                    continue
+                entry = table.setdefault(_norm(category), {}).setdefault(_norm(word), {})
+                added = {k: v for k, v in attrs.items() if k not in entry}
+                entry.update(added)
+                stats['words'] += 1
+                stats['values_added'] += len(added)
+        data['attributes'] = {c: w for c, w in table.items() if w}
+        _write_json_atomic(path, data)
+        return stats
+
+    tasks = [(category, word) for category, words in corpus.items() for word in words
+             if len(table.get(_norm(category), {}).get(_norm(word), {})) < len(ATTRIBUTES)]
+    if limit:
+        tasks = tasks[:limit]
+    pending = 0
+    with ThreadPoolExecutor(max_workers=max(1, int(concurrency))) as pool:
+        futures = {pool.submit(generate, word, category): (category, word) for category, word in tasks}
+        for fut in as_completed(futures):
+            category, word = futures[fut]
+            try:
+                attrs = fut.result()
+            except Exception as e:
+                stats['failed'] += 1
+                logger.warning(f"[ATTR_TABLE] {category}/{word} failed: {e}")
+                continue
+            entry = table.setdefault(_norm(category), {}).setdefault(_norm(word), {})
+            added = {k: v for k, v in attrs.items() if k not in entry}
+            entry.update(added)
+            stats['words'] += 1
+            stats['values_added'] += len(added)
+            pending += 1
+            if pending >= flush_every:
+                _write_json_atomic(path, data)
+                pending = 0
+    _write_json_atomic(path, data)
+    return stats
+
+
+def merge_learned(table: AttributeTable) -> int:
+    """Fold learned runtime answers into the JSON table (table values win); returns values added."""
+    data = _load_json(table.path)
+    attributes = data.setdefault('attributes', {})
+    added = 0
+    for category, word, attribute, value in table.learned_rows():
+        entry = attributes.setdefault(category, {}).setdefault(word, {})
+        if attribute not in entry:
+            entry[attribute] = value
+            added += 1
+    _write_json_atomic(table.path, data)
+    return added
+
+
+def main() -> int:
+    from .hint_corpus import HINTS_FILES_BY_LANGUAGE
+    parser = argparse.ArgumentParser(description="Build and inspect the yes/no attribute table")
+    parser.add_argument('--path', default=os.getenv('ATTRIBUTE_TABLE_PATH', DEFAULT_ATTRIBUTE_TABLE_PATH))
+    parser.add_argument('--learned-path', default=os.getenv('ATTRIBUTE_TABLE_LEARNED_PATH', DEFAULT_LEARNED_PATH))
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_build = sub.add_parser('build', help='fill missing values for corpus words')
+    p_build.add_argument('--source', choices=('hints', 'llm'), default='hints')
+    p_build.add_argument('--hints-file', default=os.path.join('backend', 'data', HINTS_FILES_BY_LANGUAGE['english']))
+    p_build.add_argument('--categories', help='comma-separated subset of categories')
+    p_build.add_argument('--limit', type=int, default=0)
+    p_build.add_argument('--concurrency', type=int, default=4)
+    p_build.add_argument('--base-url', help='OpenRouter-compatible base URL (e.g. a local stand-in)')
+    p_build.add_argument('--model')
+    sub.add_parser('merge', help='fold learned runtime answers into the JSON table')
+    sub.add_parser('stats', help='word and value counts')
+    p_ask = sub.add_parser('ask', help='answer one question from the table')
+    p_ask.add_argument('category')
+    p_ask.add_argument('word')
+    p_ask.add_argument('question')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if args.command == 'build':
+        with open(args.hints_file, 'r', encoding='utf-8') as f:
+            corpus = json.load(f).get('templates') or {}
+        if args.categories:
+            wanted = {_norm(c) for c in args.categories.split(',') if c.strip()}
+            corpus = {c: w for c, w in corpus.items() if _norm(c) in wanted}
+        generate = None
+        if args.source == 'llm':
+            generate = OpenRouterAttributeGenerator(base_url=args.base_url, model=args.model)
+        stats = build_table(args.path, corpus, source=args.source, generate=generate,
+                            concurrency=args.concurrency, limit=args.limit)
+        print(json.dumps(stats, indent=2))
+        return 0 if stats['failed'] == 0 else 1
+    table = AttributeTable(args.path, args.learned_path)
+    if args.command == 'merge':
+        print(f"Merged {merge_learned(table)} learned values into {args.path}")
+    elif args.command == 'stats':
+        print(json.dumps(table.stats(), indent=2))
+    else:
+        matched = match_attribute(args.question)
+        if matched is None:
+            print("no attribute matches this question")
+            return 1
+        value = table.lookup(args.category, args.word, *matched)
+        print(f"{matched[0]}: {'unknown' if value is None else ('Yes' if value else 'No')}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
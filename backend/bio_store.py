@@ -1,95 +1,356 @@
+"""
+Per-user profile (bio, personal pool) and FlashCard set storage.
+
+Two storage engines sit behind the same function API:
+    json    (default) users_bio.json / users.flashcards.json; each call reads
+            the whole file and each write rewrites it
+    sqlite  one row per user in a WAL-mode SQLite file (BIO_STORE_DB_PATH);
+            reads touch one row and each read-modify-write runs in its own
+            transaction, so concurrent sessions do not lose each other's writes
+
+CLI (moving between engines):
+    python -m backend.bio_store import [--bio users_bio.json] [--flash users.flashcards.json]
+    python -m backend.bio_store export --bio users_bio.backup.json --flash users.flashcards.backup.json
+    python -m backend.bio_store stats
+    python -m backend.bio_store migrate [--batch-size 500] [--force]
+
+Legacy FlashCard fields kept on bio records (flash_sets / flash_text /
+flash_pool) are moved into the flash store by one streaming pass over all
+users (migrate_flash_store), run from the CLI or once per process at startup
+(ensure_flash_migrated). It writes a schema marker next to the flash store;
+once that is present, the flash getters skip the per-user legacy check.
+
+Reads inside `with snapshot():` (one word selection, one Streamlit rerun) share
+a single parsed copy of each JSON file.
+
+Env:
+    USERS_BIO_FILE=users_bio.json
+    USERS_FLASH_FILE=users.flashcards.json
+    BIO_STORE_BACKEND=json            (json | sqlite)
+    BIO_STORE_DB_PATH=game_data/bio_store.sqlite3
+    BIO_STORE_MIGRATE_ON_STARTUP=true
+"""
+
 import os
+import sys
+import copy
 import json
+import time
 import uuid
-from typing import Dict, Any, List, Optional
+import sqlite3
+import argparse
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
 
 USERS_BIO_FILE = os.getenv('USERS_BIO_FILE', 'users_bio.json')
 USERS_FLASH_FILE = os.getenv('USERS_FLASH_FILE', 'users.flashcards.json')
 FLASHCARD_MAX_SETS = int(os.getenv('FLASHCARD_MAX_SETS', '3') or '3')
+BIO_STORE_BACKEND = os.getenv('BIO_STORE_BACKEND', 'json').strip().lower()
+BIO_STORE_DB_PATH = os.getenv('BIO_STORE_DB_PATH', os.path.join('game_data', 'bio_store.sqlite3'))
 
+# Bump when a new bulk migration of the flash store is added
+FLASH_SCHEMA_VERSION = 1
 
-def _read_all() -> Dict[str, Any]:
+
+_snapshot_state = threading.local()
+
+
+@contextmanager
+def snapshot():
+    """Share one parsed copy of each JSON store across all reads inside the block (this thread).
+
+    A cached copy is reused only while the file's (mtime, size) is unchanged, so writes by
+    other processes are still seen; writes through bio_store drop it. Nested blocks join
+    the outer one. The SQLite engine reads single rows and is not cached.
+    """
+    if getattr(_snapshot_state, 'cache', None) is not None:
+        yield
+        return
+    _snapshot_state.cache = {}
     try:
-        if not os.path.exists(USERS_BIO_FILE):
-            # Initialize file with an empty JSON object
-            try:
-                with open(USERS_BIO_FILE, 'w', encoding='utf-8') as f:
-                    f.write('{}')
-            except Exception:
-                pass
+        yield
+    finally:
+        _snapshot_state.cache = None
+
+
+class _JsonEngine:
+    """Whole-file JSON object of username -> record (the original layout)."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def read_all(self) -> Dict[str, Any]:
+        cache = getattr(_snapshot_state, 'cache', None)
+        if cache is None:
+            return self._load()
+        try:
+            st = os.stat(self.path)
+            signature = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return self._load()
+        hit = cache.get(self.path)
+        if hit is not None and hit[0] == signature:
+            return hit[1]
+        data = self._load()
+        cache[self.path] = (signature, data)
+        return data
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            if not os.path.exists(self.path):
+                # Initialize file with an empty JSON object
+                try:
+                    with open(self.path, 'w', encoding='utf-8') as f:
+                        f.write('{}')
+                except Exception:
+                    pass
+                return {}
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                return data if isinstance(data, dict) else {}
+        except Exception:
             return {}
-        with open(USERS_BIO_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data if isinstance(data, dict) else {}
-    except Exception:
-        return {}
+
+    def write_all(self, data: Dict[str, Any]) -> None:
+        cache = getattr(_snapshot_state, 'cache', None)
+        if cache is not None:
+            cache.pop(self.path, None)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def get(self, key: str) -> Dict[str, Any]:
+        rec = self.read_all().get(key)
+        if not isinstance(rec, dict):
+            return {}
+        # Snapshot copies are shared by later reads; hand out a private copy
+        return copy.deepcopy(rec) if getattr(_snapshot_state, 'cache', None) is not None else rec
+
+    def update(self, key: str, fn: Callable[[Dict[str, Any]], Any]) -> Any:
+        # Always start a write from the file on disk, never from a snapshot copy
+        data = self._load()
+        if key not in data or not isinstance(data[key], dict):
+            data[key] = {}
+        result = fn(data[key])
+        self.write_all(data)
+        return result
+
+    def delete(self, key: str) -> bool:
+        data = self._load()
+        if key not in data:
+            return False
+        data.pop(key, None)
+        self.write_all(data)
+        return True
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        return iter(list(self.read_all().items()))
+
+    def keys(self) -> List[str]:
+        return list(self.read_all().keys())
+
+    def add_many(self, items) -> int:
+        """Insert records for keys that are not present yet; existing records are kept."""
+        data = self._load()
+        added = 0
+        for k, v in items:
+            if isinstance(v, dict) and k not in data:
+                data[k] = v
+                added += 1
+        if added:
+            self.write_all(data)
+        return added
+
+
+class SqliteEngine:
+    """One JSON row per user in a WAL-mode SQLite table; a connection per thread."""
+
+    def __init__(self, path: str, table: str):
+        self.path = path
+        self.table = table
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            " username TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def read_all(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def write_all(self, data: Dict[str, Any]) -> None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(f"DELETE FROM {self.table}")
+            self._put_many(conn, data.items())
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _put_many(self, conn: sqlite3.Connection, items) -> int:
+        now = time.time()
+        rows = [(str(k), json.dumps(v, ensure_ascii=False), now) for k, v in items if isinstance(v, dict)]
+        conn.executemany(f"INSERT OR REPLACE INTO {self.table} (username, data, updated_at) VALUES (?, ?, ?)", rows)
+        return len(rows)
+
+    def put_many(self, items) -> int:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            count = self._put_many(conn, items)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return count
+
+    def get(self, key: str) -> Dict[str, Any]:
+        row = self._conn().execute(f"SELECT data FROM {self.table} WHERE username = ?", (key,)).fetchone()
+        if row is None:
+            return {}
+        rec = json.loads(row[0])
+        return rec if isinstance(rec, dict) else {}
+
+    def update(self, key: str, fn: Callable[[Dict[str, Any]], Any]) -> Any:
+        conn = self._conn()
+        # IMMEDIATE takes the write lock up front, so the read-modify-write cannot interleave
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(f"SELECT data FROM {self.table} WHERE username = ?", (key,)).fetchone()
+            rec = json.loads(row[0]) if row else {}
+            if not isinstance(rec, dict):
+                rec = {}
+            result = fn(rec)
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (username, data, updated_at) VALUES (?, ?, ?)",
+                (key, json.dumps(rec, ensure_ascii=False), time.time()),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    def delete(self, key: str) -> bool:
+        return bool(self._conn().execute(f"DELETE FROM {self.table} WHERE username = ?", (key,)).rowcount)
+
+    def keys(self) -> List[str]:
+        return [row[0] for row in self._conn().execute(f"SELECT username FROM {self.table}")]
+
+    def add_many(self, items) -> int:
+        """Insert records for keys that are not present yet; existing rows are kept."""
+        now = time.time()
+        rows = [(str(k), json.dumps(v, ensure_ascii=False), now) for k, v in items if isinstance(v, dict)]
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            before = conn.total_changes
+            conn.executemany(f"INSERT OR IGNORE INTO {self.table} (username, data, updated_at) VALUES (?, ?, ?)", rows)
+            added = conn.total_changes - before
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        for username, data in self._conn().execute(f"SELECT username, data FROM {self.table} ORDER BY username"):
+            rec = json.loads(data)
+            if isinstance(rec, dict):
+                yield username, rec
+
+
+_sqlite_engines: Dict[Tuple[str, str], SqliteEngine] = {}
+_sqlite_engines_lock = threading.Lock()
+
+
+def _sqlite_engine(path: str, table: str) -> SqliteEngine:
+    engine = _sqlite_engines.get((path, table))
+    if engine is None:
+        with _sqlite_engines_lock:
+            engine = _sqlite_engines.get((path, table))
+            if engine is None:
+                engine = _sqlite_engines[(path, table)] = SqliteEngine(path, table)
+    return engine
+
+
+def _bio_engine():
+    if BIO_STORE_BACKEND == 'sqlite':
+        return _sqlite_engine(BIO_STORE_DB_PATH, 'bio_users')
+    return _JsonEngine(USERS_BIO_FILE)
+
+
+def _flash_engine():
+    if BIO_STORE_BACKEND == 'sqlite':
+        return _sqlite_engine(BIO_STORE_DB_PATH, 'flash_users')
+    return _JsonEngine(USERS_FLASH_FILE)
+
+
+def _key(username: str) -> str:
+    return (username or '').lower()
+
+
+def _read_all() -> Dict[str, Any]:
+    return _bio_engine().read_all()
 
 
 def _write_all(data: Dict[str, Any]) -> None:
-    with open(USERS_BIO_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    _bio_engine().write_all(data)
 
 
 def get_user_record(username: str) -> Dict[str, Any]:
-    users = _read_all()
-    return users.get((username or '').lower(), {}) if isinstance(users, dict) else {}
+    return _bio_engine().get(_key(username))
 
 
 def update_user_record(username: str, updates: Dict[str, Any]) -> None:
-    users = _read_all()
-    key = (username or '').lower()
-    if key not in users or not isinstance(users[key], dict):
-        users[key] = {}
-    users[key].update(updates or {})
-    _write_all(users)
+    _bio_engine().update(_key(username), lambda rec: rec.update(updates or {}))
+
+
+def delete_user_record(username: str) -> bool:
+    """Remove a user's profile record. Returns True if one existed."""
+    return _bio_engine().delete(_key(username))
 
 
 # --- Separate FlashCard store ---
 def _read_flash_all() -> Dict[str, Any]:
-    try:
-        if not os.path.exists(USERS_FLASH_FILE):
-            try:
-                with open(USERS_FLASH_FILE, 'w', encoding='utf-8') as f:
-                    f.write('{}')
-            except Exception:
-                pass
-            return {}
-        with open(USERS_FLASH_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data if isinstance(data, dict) else {}
-    except Exception:
-        return {}
+    return _flash_engine().read_all()
 
 
 def _write_flash_all(data: Dict[str, Any]) -> None:
-    with open(USERS_FLASH_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    _flash_engine().write_all(data)
 
 
 def _get_flash_user_record(username: str) -> Dict[str, Any]:
-    users = _read_flash_all()
-    return users.get((username or '').lower(), {}) if isinstance(users, dict) else {}
+    return _flash_engine().get(_key(username))
 
 
 def _update_flash_user_record(username: str, updates: Dict[str, Any]) -> None:
-    users = _read_flash_all()
-    key = (username or '').lower()
-    if key not in users or not isinstance(users[key], dict):
-        users[key] = {}
-    users[key].update(updates or {})
-    _write_flash_all(users)
+    _flash_engine().update(_key(username), lambda rec: rec.update(updates or {}))
 
 
-def _maybe_migrate_flash_from_bio(username: str) -> None:
-    """If flashcard data exists in users_bio.json but not in flash store, migrate it."""
-    uname = (username or '').lower()
-    flash_users = _read_flash_all()
-    if isinstance(flash_users.get(uname), dict) and flash_users.get(uname):
-        return  # already present
-    # Look for legacy in bio
-    rec = get_user_record(uname)
+def _ensure_sets(rec: Dict[str, Any]) -> Dict[str, Any]:
+    if 'flash_sets' not in rec or not isinstance(rec['flash_sets'], dict):
+        rec['flash_sets'] = {}
+    return rec['flash_sets']
+
+
+def _legacy_flash_record(rec: Dict[str, Any]) -> Dict[str, Any]:
+    """Flash-store record built from legacy flash fields on a bio record ({} if none)."""
     if not isinstance(rec, dict):
-        return
+        return {}
     legacy_sets = rec.get('flash_sets')
     legacy_active = rec.get('flash_active_set')
     legacy_text = rec.get('flash_text')
@@ -113,6 +374,97 @@ def _maybe_migrate_flash_from_bio(username: str) -> None:
             }
         }
         migrated['flash_active_set'] = 'default'
+    return migrated
+
+
+def _schema_marker_path() -> str:
+    store = BIO_STORE_DB_PATH if BIO_STORE_BACKEND == 'sqlite' else USERS_FLASH_FILE
+    return f"{store}.schema.json"
+
+
+def flash_schema_version() -> int:
+    """Schema version recorded for the current flash store (0 = never migrated)."""
+    try:
+        with open(_schema_marker_path(), 'r', encoding='utf-8') as f:
+            return int(json.load(f).get('flash_schema_version') or 0)
+    except Exception:
+        return 0
+
+
+# Marker paths already confirmed current in this process; the per-call check is a set lookup
+_migrated_markers: set = set()
+_migrate_lock = threading.Lock()
+
+
+def _is_migrated() -> bool:
+    marker = _schema_marker_path()
+    if marker in _migrated_markers:
+        return True
+    if flash_schema_version() >= FLASH_SCHEMA_VERSION:
+        _migrated_markers.add(marker)
+        return True
+    return False
+
+
+def migrate_flash_store(batch_size: int = 500) -> Dict[str, int]:
+    """Move legacy flash fields from every bio record into the flash store, then write the marker.
+
+    Streams the bio records and inserts in batches. Users that already have a flash
+    record are left alone, so running it again is harmless.
+    """
+    flash = _flash_engine()
+    existing = set(flash.keys())
+    batch: List[Tuple[str, Dict[str, Any]]] = []
+    scanned = migrated = 0
+    for key, rec in _bio_engine().items():
+        scanned += 1
+        uname = _key(key)
+        if uname in existing:
+            continue
+        moved = _legacy_flash_record(rec)
+        if not moved:
+            continue
+        existing.add(uname)
+        batch.append((uname, moved))
+        if len(batch) >= max(1, batch_size):
+            migrated += flash.add_many(batch)
+            batch = []
+    if batch:
+        migrated += flash.add_many(batch)
+    marker = _schema_marker_path()
+    tmp = f"{marker}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'flash_schema_version': FLASH_SCHEMA_VERSION, 'migrated_at': time.time(),
+                   'scanned': scanned, 'migrated': migrated}, f)
+    os.replace(tmp, marker)
+    _migrated_markers.add(marker)
+    return {'scanned': scanned, 'migrated': migrated, 'version': FLASH_SCHEMA_VERSION}
+
+
+def ensure_flash_migrated() -> bool:
+    """Run migrate_flash_store once if the marker is missing (startup hook). Returns True when current."""
+    if _is_migrated():
+        return True
+    if os.getenv('BIO_STORE_MIGRATE_ON_STARTUP', 'true').strip().lower() not in ('1', 'true', 'yes', 'on'):
+        return False
+    with _migrate_lock:
+        if _is_migrated():
+            return True
+        try:
+            migrate_flash_store()
+            return True
+        except Exception:
+            return False
+
+
+def _maybe_migrate_flash_from_bio(username: str) -> None:
+    """Per-user legacy migration, only until the bulk migration has recorded its marker."""
+    if _is_migrated():
+        return
+    uname = _key(username)
+    if _get_flash_user_record(uname):
+        return  # already present
+    migrated = _legacy_flash_record(get_user_record(uname))
     if migrated:
         _update_flash_user_record(uname, migrated)
 
@@ -168,24 +520,18 @@ def get_flash_text(username: str) -> str:
 
 
 def set_flash_text(username: str, text: str) -> None:
-    users = _read_flash_all()
-    key = (username or '').lower()
-    if key not in users or not isinstance(users[key], dict):
-        users[key] = {}
-    rec = users[key]
-    if 'flash_sets' not in rec or not isinstance(rec['flash_sets'], dict):
-        rec['flash_sets'] = {}
-    if not rec.get('flash_active_set'):
-        rec['flash_active_set'] = 'default'
-    active = rec['flash_active_set']
-    if active not in rec['flash_sets'] and len(rec['flash_sets']) >= FLASHCARD_MAX_SETS:
-        # Cannot create new set due to limit; ignore write
-        pass
-    else:
-        if active not in rec['flash_sets']:
-            rec['flash_sets'][active] = {'text': '', 'pool': []}
-        rec['flash_sets'][active]['text'] = str(text or '')
-    _write_flash_all(users)
+    def apply(rec: Dict[str, Any]) -> None:
+        sets = _ensure_sets(rec)
+        if not rec.get('flash_active_set'):
+            rec['flash_active_set'] = 'default'
+        active = rec['flash_active_set']
+        if active not in sets and len(sets) >= FLASHCARD_MAX_SETS:
+            # Cannot create new set due to limit; ignore write
+            return
+        if active not in sets:
+            sets[active] = {'text': '', 'pool': []}
+        sets[active]['text'] = str(text or '')
+    _flash_engine().update(_key(username), apply)
 
 
 def get_flash_pool(username: str) -> List[Dict[str, Any]]:
@@ -211,32 +557,25 @@ def get_flash_pool(username: str) -> List[Dict[str, Any]]:
 
 
 def set_flash_pool(username: str, pool: List[Dict[str, Any]]) -> None:
-    users = _read_flash_all()
-    key = (username or '').lower()
-    if key not in users or not isinstance(users[key], dict):
-        users[key] = {}
-    rec = users[key]
-    if 'flash_sets' not in rec or not isinstance(rec['flash_sets'], dict):
-        rec['flash_sets'] = {}
-    if not rec.get('flash_active_set'):
-        rec['flash_active_set'] = 'default'
-    active = rec['flash_active_set']
-    # Do not overwrite a referenced set's pool
-    try:
-        cur = rec['flash_sets'].get(active) or {}
-        if isinstance(cur.get('ref_token'), str) and cur.get('ref_token'):
-            _write_flash_all(users)
+    def apply(rec: Dict[str, Any]) -> None:
+        sets = _ensure_sets(rec)
+        if not rec.get('flash_active_set'):
+            rec['flash_active_set'] = 'default'
+        active = rec['flash_active_set']
+        # Do not overwrite a referenced set's pool
+        try:
+            cur = sets.get(active) or {}
+            if isinstance(cur.get('ref_token'), str) and cur.get('ref_token'):
+                return
+        except Exception:
+            pass
+        if active not in sets and len(sets) >= FLASHCARD_MAX_SETS:
+            # Cannot create new set due to limit; ignore write
             return
-    except Exception:
-        pass
-    if active not in rec['flash_sets'] and len(rec['flash_sets']) >= FLASHCARD_MAX_SETS:
-        # Cannot create new set due to limit; ignore write
-        pass
-    else:
-        if active not in rec['flash_sets']:
-            rec['flash_sets'][active] = {'text': '', 'pool': []}
-        rec['flash_sets'][active]['pool'] = pool if isinstance(pool, list) else []
-    _write_flash_all(users)
+        if active not in sets:
+            sets[active] = {'text': '', 'pool': []}
+        sets[active]['pool'] = pool if isinstance(pool, list) else []
+    _flash_engine().update(_key(username), apply)
 
 
 # --- FlashCard multi-set management ---
@@ -259,13 +598,7 @@ def get_active_flash_set_name(username: str) -> str:
 
 
 def set_active_flash_set_name(username: str, name: str) -> None:
-    users = _read_flash_all()
-    key = (username or '').lower()
-    if key not in users or not isinstance(users[key], dict):
-        users[key] = {}
-    rec = users[key]
-    rec['flash_active_set'] = str(name or '')
-    _write_flash_all(users)
+    _update_flash_user_record(username, {'flash_active_set': str(name or '')})
 
 
 def get_flash_set_text(username: str, name: str) -> str:
@@ -292,88 +625,100 @@ def upsert_flash_set(username: str, name: str, text: str = '', pool: List[Dict[s
     """
     if not name:
         return False
-    users = _read_flash_all()
-    key = (username or '').lower()
-    if key not in users or not isinstance(users[key], dict):
-        users[key] = {}
-    rec = users[key]
-    if 'flash_sets' not in rec or not isinstance(rec['flash_sets'], dict):
-        rec['flash_sets'] = {}
-    is_new = name not in rec['flash_sets']
-    if is_new and len(rec['flash_sets']) >= FLASHCARD_MAX_SETS:
-        return False
-    if is_new:
-        rec['flash_sets'][name] = {
-            'text': str(text or ''),
-            'pool': list(pool or []),
-            'token': uuid.uuid4().hex[:8]
-        }
-    else:
-        if text is not None:
-            rec['flash_sets'][name]['text'] = str(text or '')
-        if pool is not None:
-            rec['flash_sets'][name]['pool'] = list(pool)
-        # If set exists but has no token and is not a reference, ensure token
-        if not rec['flash_sets'][name].get('ref_token') and not rec['flash_sets'][name].get('token'):
-            rec['flash_sets'][name]['token'] = uuid.uuid4().hex[:8]
-    # Ensure active set points to this name if not set
-    if not rec.get('flash_active_set'):
-        rec['flash_active_set'] = name
-    _write_flash_all(users)
-    return True
+
+    def apply(rec: Dict[str, Any]) -> bool:
+        sets = _ensure_sets(rec)
+        is_new = name not in sets
+        if is_new and len(sets) >= FLASHCARD_MAX_SETS:
+            return False
+        if is_new:
+            sets[name] = {
+                'text': str(text or ''),
+                'pool': list(pool or []),
+                'token': uuid.uuid4().hex[:8]
+            }
+        else:
+            if text is not None:
+                sets[name]['text'] = str(text or '')
+            if pool is not None:
+                sets[name]['pool'] = list(pool)
+            # If set exists but has no token and is not a reference, ensure token
+            if not sets[name].get('ref_token') and not sets[name].get('token'):
+                sets[name]['token'] = uuid.uuid4().hex[:8]
+        # Ensure active set points to this name if not set
+        if not rec.get('flash_active_set'):
+            rec['flash_active_set'] = name
+        return True
+    return _flash_engine().update(_key(username), apply)
 
 
 def delete_flash_set(username: str, name: str) -> bool:
     """Delete a named flashcard set for user. Returns True on success."""
-    users = _read_flash_all()
-    key = (username or '').lower()
-    rec = users.get(key)
-    if not isinstance(rec, dict):
-        return False
+    engine = _flash_engine()
+    key = _key(username)
+    rec = engine.get(key)
     sets = rec.get('flash_sets')
     if not isinstance(sets, dict) or name not in sets:
         return False
-    # Capture token for cascading removal of imported references
-    try:
-        removed_token = (sets.get(name) or {}).get('token')
-    except Exception:
-        removed_token = None
-    try:
-        del sets[name]
-    except Exception:
-        return False
-    # Adjust active set if we deleted the active one
-    if rec.get('flash_active_set') == name:
+
+    def apply(rec: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
+        sets = rec.get('flash_sets')
+        if not isinstance(sets, dict) or name not in sets:
+            return False, None
+        # Capture token for cascading removal of imported references
+        try:
+            removed_token = (sets.get(name) or {}).get('token')
+        except Exception:
+            removed_token = None
         try:
-            rec['flash_active_set'] = next(iter(sets.keys())) if sets else ''
+            del sets[name]
         except Exception:
-            rec['flash_active_set'] = ''
+            return False, None
+        # Adjust active set if we deleted the active one
+        if rec.get('flash_active_set') == name:
+            try:
+                rec['flash_active_set'] = next(iter(sets.keys())) if sets else ''
+            except Exception:
+                rec['flash_active_set'] = ''
+        return True, removed_token
+
+    deleted, removed_token = engine.update(key, apply)
+    if not deleted:
+        return False
+
+    def is_ref(item: Dict[str, Any]) -> bool:
+        ref_tok = item.get('ref_token')
+        ref_owner = item.get('ref_owner')
+        ref_title = item.get('ref_title')
+        return (isinstance(ref_tok, str) and ref_tok == removed_token) or \
+            ((ref_owner or '').lower() == key and (ref_title or '') == name)
+
+    def drop_refs(u_rec: Dict[str, Any]) -> None:
+        u_sets = u_rec.get('flash_sets') or {}
+        if not isinstance(u_sets, dict):
+            return
+        for s_name in list(u_sets.keys()):
+            if not is_ref(u_sets.get(s_name) or {}):
+                continue
+            try:
+                del u_sets[s_name]
+            except Exception:
+                continue
+            # Fix up active set for that user if needed
+            if u_rec.get('flash_active_set') == s_name:
+                try:
+                    u_rec['flash_active_set'] = next(iter(u_sets.keys())) if u_sets else ''
+                except Exception:
+                    u_rec['flash_active_set'] = ''
+
     # Cascade: remove any imported/reference sets in other users that point to this token
     try:
         if removed_token:
-            for u_key, u_rec in list(users.items()):
-                if not isinstance(u_rec, dict):
-                    continue
-                u_sets = u_rec.get('flash_sets') or {}
-                if not isinstance(u_sets, dict):
-                    continue
-                for s_name in list(u_sets.keys()):
-                    item = u_sets.get(s_name) or {}
-                    ref_tok = item.get('ref_token')
-                    ref_owner = item.get('ref_owner')
-                    ref_title = item.get('ref_title')
-                    if (isinstance(ref_tok, str) and ref_tok == removed_token) or \
-                       ((ref_owner or '').lower() == key and (ref_title or '') == name):
-                        try:
-                            del u_sets[s_name]
-                        except Exception:
-                            continue
-                        # Fix up active set for that user if needed
-                        if u_rec.get('flash_active_set') == s_name:
-                            try:
-                                u_rec['flash_active_set'] = next(iter(u_sets.keys())) if u_sets else ''
-                            except Exception:
-                                u_rec['flash_active_set'] = ''
+            referencing = [u_key for u_key, u_rec in engine.items()
+                           if isinstance(u_rec.get('flash_sets'), dict)
+                           and any(is_ref(item or {}) for item in u_rec['flash_sets'].values())]
+            for u_key in referencing:
+                engine.update(u_key, drop_refs)
             # Also remove from flash_shares store if present
             try:
                 from backend.flash_share import delete_share
@@ -385,48 +730,38 @@ def delete_flash_set(username: str, name: str) -> bool:
                 pass
     except Exception:
         pass
-    _write_flash_all(users)
     return True
 
 def ensure_flash_set_token(username: str, name: str) -> str:
     """Ensure the named flash set has a token; create and persist if missing. Return token."""
-    users = _read_flash_all()
-    key = (username or '').lower()
-    if key not in users or not isinstance(users[key], dict):
-        users[key] = {}
-    rec = users[key]
-    if 'flash_sets' not in rec or not isinstance(rec['flash_sets'], dict):
-        rec['flash_sets'] = {}
-    # If this is a reference set, prefer ref_token and do not create an owner token
-    if name in rec['flash_sets'] and isinstance(rec['flash_sets'][name], dict):
-        ref_tok = rec['flash_sets'][name].get('ref_token')
-        if isinstance(ref_tok, str) and ref_tok:
-            return ref_tok
-    if name not in rec['flash_sets']:
-        # Create minimal set with token when missing (respecting limit)
-        if len(rec['flash_sets']) >= FLASHCARD_MAX_SETS:
-            # As a fallback, attach token to active set
-            active = rec.get('flash_active_set') or ''
-            if active and active in rec['flash_sets']:
-                tok = rec['flash_sets'][active].get('token') or uuid.uuid4().hex[:8]
-                rec['flash_sets'][active]['token'] = tok
-                _write_flash_all(users)
-                return tok
-            # Otherwise generate a token unattached (rare)
+    def apply(rec: Dict[str, Any]) -> str:
+        sets = _ensure_sets(rec)
+        # If this is a reference set, prefer ref_token and do not create an owner token
+        if name in sets and isinstance(sets[name], dict):
+            ref_tok = sets[name].get('ref_token')
+            if isinstance(ref_tok, str) and ref_tok:
+                return ref_tok
+        if name not in sets:
+            # Create minimal set with token when missing (respecting limit)
+            if len(sets) >= FLASHCARD_MAX_SETS:
+                # As a fallback, attach token to active set
+                active = rec.get('flash_active_set') or ''
+                if active and active in sets:
+                    tok = sets[active].get('token') or uuid.uuid4().hex[:8]
+                    sets[active]['token'] = tok
+                    return tok
+                # Otherwise generate a token unattached (rare)
+                return uuid.uuid4().hex[:8]
+            sets[name] = {'text': '', 'pool': [], 'token': uuid.uuid4().hex[:8]}
+            if not rec.get('flash_active_set'):
+                rec['flash_active_set'] = name
+            return sets[name]['token']
+        tok = sets[name].get('token')
+        if not tok:
             tok = uuid.uuid4().hex[:8]
-            _write_flash_all(users)
-            return tok
-        rec['flash_sets'][name] = {'text': '', 'pool': [], 'token': uuid.uuid4().hex[:8]}
-        if not rec.get('flash_active_set'):
-            rec['flash_active_set'] = name
-        _write_flash_all(users)
-        return rec['flash_sets'][name]['token']
-    tok = rec['flash_sets'][name].get('token')
-    if not tok:
-        tok = uuid.uuid4().hex[:8]
-        rec['flash_sets'][name]['token'] = tok
-        _write_flash_all(users)
-    return tok
+            sets[name]['token'] = tok
+        return tok
+    return _flash_engine().update(_key(username), apply)
 
 
 def get_flash_set_token(username: str, name: str) -> Optional[str]:
@@ -449,21 +784,105 @@ def get_flash_set_token(username: str, name: str) -> Optional[str]:
 
 def add_flash_set_ref(username: str, name: str, token: str, owner: str = '', title: str = '') -> bool:
     """Create/update a named set that references a shared FlashCard by token (no copy)."""
-    users = _read_flash_all()
-    key = (username or '').lower()
-    if key not in users or not isinstance(users[key], dict):
-        users[key] = {}
-    rec = users[key]
-    if 'flash_sets' not in rec or not isinstance(rec['flash_sets'], dict):
-        rec['flash_sets'] = {}
-    rec['flash_sets'][name] = {
-        'ref_token': str(token or ''),
-        'ref_owner': str(owner or ''),
-        'ref_title': str(title or ''),
-    }
-    if not rec.get('flash_active_set'):
-        rec['flash_active_set'] = name
-    _write_flash_all(users)
+    def apply(rec: Dict[str, Any]) -> None:
+        _ensure_sets(rec)[name] = {
+            'ref_token': str(token or ''),
+            'ref_owner': str(owner or ''),
+            'ref_title': str(title or ''),
+        }
+        if not rec.get('flash_active_set'):
+            rec['flash_active_set'] = name
+    _flash_engine().update(_key(username), apply)
     return True
 
 
+def users_with_active_flash_token(token: str, include_owner: bool = True) -> List[str]:
+    """Users whose active flash set references `token` (or owns it, with include_owner)."""
+    token = str(token or '')
+    if not token:
+        return []
+    users = []
+    for username, rec in _flash_engine().items():
+        sets = rec.get('flash_sets')
+        active = rec.get('flash_active_set')
+        if not (isinstance(sets, dict) and active and active in sets):
+            continue
+        item = sets.get(active) or {}
+        if str(item.get('ref_token') or '') == token or (include_owner and str(item.get('token') or '') == token):
+            users.append(str(username or '').lower())
+    return users
+
+
+def find_flash_set_by_token(token: str) -> Optional[Tuple[str, str, List[Dict[str, Any]]]]:
+    """(owner, set name, pool) of the owned flash set carrying `token`, or None."""
+    token = str(token or '').strip()
+    if not token:
+        return None
+    for username, rec in _flash_engine().items():
+        sets = rec.get('flash_sets')
+        if not isinstance(sets, dict):
+            continue
+        for name, item in sets.items():
+            if str((item or {}).get('token') or '') == token:
+                return str(username or '').lower(), str(name or 'flashcard'), (item or {}).get('pool') or []
+    return None
+
+# --- Moving data between engines ---
+def import_json(bio_path: str, flash_path: str, db_path: str) -> Dict[str, int]:
+    """Load users_bio.json / users.flashcards.json into the SQLite engine (rows are replaced)."""
+    counts = {}
+    for label, path, table in (('bio', bio_path, 'bio_users'), ('flash', flash_path, 'flash_users')):
+        data = _JsonEngine(path).read_all() if path and os.path.exists(path) else {}
+        counts[label] = _sqlite_engine(db_path, table).put_many((_key(k), v) for k, v in data.items())
+    return counts
+
+
+def export_json(db_path: str, bio_path: str, flash_path: str) -> Dict[str, int]:
+    """Write the SQLite engine's rows back out in the JSON file layout (atomic replace)."""
+    counts = {}
+    for label, path, table in (('bio', bio_path, 'bio_users'), ('flash', flash_path, 'flash_users')):
+        data = _sqlite_engine(db_path, table).read_all()
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+        counts[label] = len(data)
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import/export the bio and FlashCard stores (SQLite engine)")
+    parser.add_argument('--db', default=BIO_STORE_DB_PATH)
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_import = sub.add_parser('import', help='load the JSON files into SQLite')
+    p_import.add_argument('--bio', default=USERS_BIO_FILE)
+    p_import.add_argument('--flash', default=USERS_FLASH_FILE)
+    p_export = sub.add_parser('export', help='write SQLite rows out as JSON files (backups)')
+    p_export.add_argument('--bio', required=True)
+    p_export.add_argument('--flash', required=True)
+    sub.add_parser('stats', help='row counts')
+    p_migrate = sub.add_parser('migrate', help='move legacy flash fields into the flash store (current backend)')
+    p_migrate.add_argument('--batch-size', type=int, default=500)
+    p_migrate.add_argument('--force', action='store_true', help='run even if the schema marker is current')
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        counts = import_json(args.bio, args.flash, args.db)
+        print(f"Imported {counts['bio']} bio and {counts['flash']} flash users into {args.db}")
+    elif args.command == 'export':
+        counts = export_json(args.db, args.bio, args.flash)
+        print(f"Exported {counts['bio']} bio and {counts['flash']} flash users")
+    elif args.command == 'migrate':
+        if not args.force and flash_schema_version() >= FLASH_SCHEMA_VERSION:
+            print(f"Flash store already at schema version {FLASH_SCHEMA_VERSION} ({_schema_marker_path()})")
+            return 0
+        result = migrate_flash_store(args.batch_size)
+        print(f"Scanned {result['scanned']} users, migrated {result['migrated']}; schema version {result['version']}")
+    else:
+        print(json.dumps({table: sum(1 for _ in _sqlite_engine(args.db, table).items())
+                          for table in ('bio_users', 'flash_users')}, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Per-model circuit breakers for OpenRouter.
+
+Each model gets a breaker that watches a sliding window of recent calls:
+
+    closed     calls flow; once the window holds OPENROUTER_CB_MIN_CALLS calls and the
+               share of failed-or-slow calls reaches OPENROUTER_CB_ERROR_RATE, it opens
+    open       calls are refused for OPENROUTER_CB_OPEN_S; callers go straight to the
+               hints corpus / offline answers
+    half-open  after the open period one probe call is let through; success closes
+               the breaker (API mode is restored), failure re-opens it
+
+Breakers are process-wide (shared by every session's WordSelector), so one
+session discovering an outage spares all the others the retry ladder.
+
+Env:
+    OPENROUTER_CB_WINDOW_S=60
+    OPENROUTER_CB_MIN_CALLS=5
+    OPENROUTER_CB_ERROR_RATE=0.5
+    OPENROUTER_CB_SLOW_CALL_S=10     calls slower than this count as failures
+    OPENROUTER_CB_OPEN_S=30
+    OPENROUTER_CB_QUOTA_OPEN_S=600   open period after a critical quota warning
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict, Iterable, Optional
+from .env_utils import env_float
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(RuntimeError):
+    """Every candidate model's breaker is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, window_s: Optional[float] = None, min_calls: Optional[int] = None,
+                 error_rate: Optional[float] = None, slow_call_s: Optional[float] = None,
+                 open_s: Optional[float] = None):
+        self.name = name
+        self.window_s = window_s if window_s is not None else env_float('OPENROUTER_CB_WINDOW_S', 60.0)
+        self.min_calls = int(min_calls if min_calls is not None else env_float('OPENROUTER_CB_MIN_CALLS', 5))
+        self.error_rate = error_rate if error_rate is not None else env_float('OPENROUTER_CB_ERROR_RATE', 0.5)
+        self.slow_call_s = slow_call_s if slow_call_s is not None else env_float('OPENROUTER_CB_SLOW_CALL_S', 10.0)
+        self.open_s = open_s if open_s is not None else env_float('OPENROUTER_CB_OPEN_S', 30.0)
+        self.state = CLOSED
+        self._open_until = 0.0
+        self._probe_in_flight = False
+        # (timestamp, failed_or_slow)
+        self._calls: deque = deque()
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window_s
+        while self._calls and self._calls[0][0] < cutoff:
+            self._calls.popleft()
+
+    def _open(self, now: float, duration: float, reason: str) -> None:
+        self.state = OPEN
+        self._open_until = now + duration
+        self._probe_in_flight = False
+        logger.warning(f"[CIRCUIT] '{self.name}' OPEN for {duration:.0f}s ({reason})")
+
+    def available(self) -> bool:
+        """Whether a call could be let through now (does not reserve the half-open probe)."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                return time.monotonic() >= self._open_until
+            return not self._probe_in_flight
+
+    def allow(self) -> bool:
+        """Reserve permission for one call; in half-open only a single probe is admitted."""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN and now >= self._open_until:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+                logger.info(f"[CIRCUIT] '{self.name}' HALF_OPEN (probing)")
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record(self, ok: bool, latency_s: float = 0.0) -> None:
+        failed = (not ok) or latency_s >= self.slow_call_s
+        with self._lock:
+            now = time.monotonic()
+            if self.state == HALF_OPEN:
+                if failed:
+                    self._open(now, self.open_s, 'probe failed')
+                else:
+                    self.state = CLOSED
+                    self._calls.clear()
+                    self._probe_in_flight = False
+                    logger.info(f"[CIRCUIT] '{self.name}' CLOSED (probe succeeded)")
+                return
+            if self.state == OPEN:
+                return
+            self._calls.append((now, failed))
+            self._prune(now)
+            if len(self._calls) >= self.min_calls:
+                rate = sum(1 for _, f in self._calls if f) / len(self._calls)
+                if rate >= self.error_rate:
+                    self._open(now, self.open_s, f"failure rate {rate:.0%} over {len(self._calls)} calls")
+
+    def record_success(self, latency_s: float = 0.0) -> None:
+        self.record(True, latency_s)
+
+    def record_failure(self, latency_s: float = 0.0) -> None:
+        self.record(False, latency_s)
+
+    def trip(self, duration: Optional[float] = None, reason: str = 'manual') -> None:
+        with self._lock:
+            self._open(time.monotonic(), self.open_s if duration is None else duration, reason)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            failures = sum(1 for _, f in self._calls if f)
+            return {
+                'state': self.state,
+                'calls': len(self._calls),
+                'failures': failures,
+                'open_for_s': max(0.0, self._open_until - now) if self.state == OPEN else 0.0,
+            }
+
+
+class BreakerRegistry:
+    """Lazily created breaker per model name."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(model)
+            if breaker is None:
+                breaker = CircuitBreaker(model)
+                self._breakers[model] = breaker
+            return breaker
+
+    def any_available(self, models: Iterable[str]) -> bool:
+        return any(self.get(m).available() for m in models if m)
+
+    def trip_all(self, models: Iterable[str], duration: Optional[float] = None, reason: str = 'manual') -> None:
+        for m in models:
+            if m:
+                self.get(m).trip(duration, reason)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: b.snapshot() for name, b in breakers.items()}
+
+
+# Global instance
+openrouter_breakers = BreakerRegistry()
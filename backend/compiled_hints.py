@@ -0,0 +1,279 @@
+"""
+Compiled, memory-mappable hints corpus.
+
+`build` compiles the `templates` tree of every backend/data/hints*.json into one
+binary file (default backend/data/hints.bin). CompiledHints maps that file
+read-only and answers lookups with binary searches over fixed-size records, so
+nothing is deserialised up front and every process on the host shares the same
+page-cache copy.
+
+Layout (little-endian):
+    header   magic 'WZHC', version, counts, section offsets
+    strings  u32 offsets[n_strings + 1] + utf-8 data (deduplicated)
+    langs    (name_sid, source_sid, cat_start, cat_count, source_mtime_ns)  sorted by name;
+             source_sid is the source file's base name
+    cats     (name_sid, lower_sid, word_start, word_count)       sorted by lower-cased name per language
+    words    (word_sid, hint_start, hint_count)                  sorted by word per category
+    hints    u32 string ids
+
+Usage:
+    python -m backend.compiled_hints build [--data-dir backend/data] [--out backend/data/hints.bin]
+    python -m backend.compiled_hints lookup english animals [tiger]
+"""
+
+import os
+import sys
+import json
+import mmap
+import struct
+import argparse
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from backend.hint_corpus import HINTS_FILES_BY_LANGUAGE, HINTS_COMPILED_PATH
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'WZHC'
+VERSION = 2
+_HEADER = struct.Struct('<4sIIIIII6Q')
+_LANG = struct.Struct('<IIIIQ')
+_CAT = struct.Struct('<IIII')
+_WORD = struct.Struct('<III')
+_U32 = struct.Struct('<I')
+
+
+def default_sources(data_dir: str = os.path.join('backend', 'data')) -> Dict[str, str]:
+    """language -> hints file path for every language file that exists in data_dir."""
+    sources = {}
+    for lang, fname in HINTS_FILES_BY_LANGUAGE.items():
+        path = os.path.join(data_dir, fname)
+        if os.path.exists(path):
+            sources[lang] = path
+    return sources
+
+
+def compile_hints(sources: Dict[str, str], out_path: str = HINTS_COMPILED_PATH) -> Dict[str, int]:
+    """Compile the given language -> JSON file map into out_path (written atomically).
+
+    Returns counts of languages, categories, words, hints and strings written.
+    """
+    strings: List[bytes] = []
+    sids: Dict[str, int] = {}
+
+    def sid(s: str) -> int:
+        if s not in sids:
+            sids[s] = len(strings)
+            strings.append(s.encode('utf-8'))
+        return sids[s]
+
+    langs, cats, words, hints = [], [], [], []
+    for lang in sorted(sources, key=lambda l: l.encode('utf-8')):
+        path = sources[lang]
+        with open(path, 'r', encoding='utf-8') as f:
+            templates = (json.load(f) or {}).get('templates', {})
+        # First occurrence wins for case-insensitive duplicates, matching HintIndex
+        by_lower: Dict[str, str] = {}
+        for key, entries in (templates or {}).items():
+            if isinstance(entries, dict):
+                by_lower.setdefault(str(key).lower(), key)
+        cat_start = len(cats)
+        for lower in sorted(by_lower, key=lambda k: k.encode('utf-8')):
+            key = by_lower[lower]
+            entries = templates[key]
+            word_start = len(words)
+            for word in sorted((w for w in entries if isinstance(w, str)), key=lambda w: w.encode('utf-8')):
+                word_hints = [str(h) for h in (entries.get(word) or []) if isinstance(h, str)]
+                words.append((sid(word), len(hints), len(word_hints)))
+                hints.extend(sid(h) for h in word_hints)
+            cats.append((sid(key), sid(lower), word_start, len(words) - word_start))
+        langs.append((sid(lang), sid(os.path.basename(path)), cat_start, len(cats) - cat_start,
+                      os.stat(path).st_mtime_ns))
+
+    str_offsets = [0]
+    for b in strings:
+        str_offsets.append(str_offsets[-1] + len(b))
+    off = _HEADER.size
+    sections = []
+    for size in (4 * len(str_offsets), str_offsets[-1], _LANG.size * len(langs),
+                 _CAT.size * len(cats), _WORD.size * len(words), 4 * len(hints)):
+        sections.append(off)
+        off += size
+
+    tmp_path = f"{out_path}.tmp.{os.getpid()}"
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(strings), len(langs), len(cats), len(words), len(hints), *sections))
+        f.write(struct.pack(f'<{len(str_offsets)}I', *str_offsets))
+        f.write(b''.join(strings))
+        for rec in langs:
+            f.write(_LANG.pack(*rec))
+        for rec in cats:
+            f.write(_CAT.pack(*rec))
+        for rec in words:
+            f.write(_WORD.pack(*rec))
+        f.write(struct.pack(f'<{len(hints)}I', *hints))
+    # Replace atomically so mapped readers keep their old inode until they reopen
+    os.replace(tmp_path, out_path)
+    return {'languages': len(langs), 'categories': len(cats), 'words': len(words), 'hints': len(hints), 'strings': len(strings)}
+
+
+class CompiledHints:
+    """Read-only, mmap-backed reader for a compiled hints file."""
+
+    def __init__(self, path: str = HINTS_COMPILED_PATH):
+        self.path = os.path.abspath(path)
+        with open(self.path, 'rb') as f:
+            self.mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self._n_strings, self._n_langs, _n_cats, _n_words, _n_hints,
+         self._str_off, self._str_data, self._langs_off, self._cats_off,
+         self._words_off, self._hints_off) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mm.close()
+            raise ValueError(f"Not a compiled hints file (v{VERSION}): {self.path}")
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def _bytes(self, string_id: int) -> bytes:
+        start, end = struct.unpack_from('<II', self._mm, self._str_off + 4 * string_id)
+        return self._mm[self._str_data + start:self._str_data + end]
+
+    def _str(self, string_id: int) -> str:
+        return self._bytes(string_id).decode('utf-8')
+
+    def _search(self, rec: struct.Struct, base: int, start: int, count: int, key: bytes, field: int = 0) -> Optional[Tuple]:
+        """Binary search records [start, start+count) whose `field` string equals key."""
+        lo, hi = start, start + count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            row = rec.unpack_from(self._mm, base + rec.size * mid)
+            probe = self._bytes(row[field])
+            if probe == key:
+                return row
+            if probe < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def languages(self) -> List[str]:
+        return [self._str(_LANG.unpack_from(self._mm, self._langs_off + _LANG.size * i)[0]) for i in range(self._n_langs)]
+
+    def language(self, language: str) -> Optional['CompiledHintView']:
+        row = self._search(_LANG, self._langs_off, 0, self._n_langs, str(language or '').encode('utf-8'))
+        if row is None:
+            return None
+        return CompiledHintView(self, language, row[2], row[3], row[4], self._str(row[1]))
+
+
+class CompiledHintView:
+    """HintIndex-compatible view of one language inside a CompiledHints file."""
+
+    def __init__(self, reader: CompiledHints, language: str, cat_start: int, cat_count: int, source_mtime_ns: int,
+                 source_name: str = ''):
+        self._r = reader
+        self.language = language
+        self.path = reader.path
+        self.mtime_ns = source_mtime_ns
+        self.source_name = source_name
+        self._cat_start = cat_start
+        self._cat_count = cat_count
+        # Per-category decoded word lists, filled on first use only
+        self._words: Dict[str, Tuple[str, ...]] = {}
+        self._by_length: Dict[str, Dict[int, Tuple[str, ...]]] = {}
+
+    def _cat(self, subject: str) -> Optional[Tuple]:
+        if subject is None:
+            return None
+        key = str(subject).strip().lower().encode('utf-8')
+        return self._r._search(_CAT, self._r._cats_off, self._cat_start, self._cat_count, key, field=1)
+
+    def _word(self, subject: str, word: str) -> Optional[Tuple]:
+        cat = self._cat(subject)
+        if cat is None or not isinstance(word, str):
+            return None
+        return self._r._search(_WORD, self._r._words_off, cat[2], cat[3], word.encode('utf-8'))
+
+    def categories(self) -> List[str]:
+        r = self._r
+        return [r._str(_CAT.unpack_from(r._mm, r._cats_off + _CAT.size * i)[0])
+                for i in range(self._cat_start, self._cat_start + self._cat_count)]
+
+    def subject_key(self, subject: str) -> Optional[str]:
+        cat = self._cat(subject)
+        return self._r._str(cat[0]) if cat else None
+
+    def words(self, subject: str) -> Tuple[str, ...]:
+        cat = self._cat(subject)
+        if cat is None:
+            return ()
+        key = self._r._str(cat[0])
+        if key not in self._words:
+            r = self._r
+            self._words[key] = tuple(r._str(_WORD.unpack_from(r._mm, r._words_off + _WORD.size * i)[0])
+                                     for i in range(cat[2], cat[2] + cat[3]))
+        return self._words[key]
+
+    def words_of_length(self, subject: str, length: int) -> Tuple[str, ...]:
+        key = self.subject_key(subject)
+        if not key:
+            return ()
+        if key not in self._by_length:
+            buckets: Dict[int, List[str]] = {}
+            for w in self.words(key):
+                buckets.setdefault(len(w), []).append(w)
+            self._by_length[key] = {n: tuple(ws) for n, ws in buckets.items()}
+        try:
+            return self._by_length[key].get(int(length), ())
+        except (TypeError, ValueError):
+            return ()
+
+    def has_word(self, subject: str, word: str) -> bool:
+        return self._word(subject, word) is not None
+
+    def hints(self, subject: str, word: str) -> List[str]:
+        row = self._word(subject, word)
+        if row is None:
+            return []
+        r = self._r
+        return [r._str(_U32.unpack_from(r._mm, r._hints_off + 4 * i)[0]) for i in range(row[1], row[1] + row[2])]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build or query the compiled hints corpus")
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_build = sub.add_parser('build', help='compile backend/data/hints*.json')
+    p_build.add_argument('--data-dir', default=os.path.join('backend', 'data'))
+    p_build.add_argument('--out', default=HINTS_COMPILED_PATH)
+    p_lookup = sub.add_parser('lookup', help='look up a category or word')
+    p_lookup.add_argument('language')
+    p_lookup.add_argument('category')
+    p_lookup.add_argument('word', nargs='?')
+    p_lookup.add_argument('--path', default=HINTS_COMPILED_PATH)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        sources = default_sources(args.data_dir)
+        if not sources:
+            print(f"No hints files found in {args.data_dir}")
+            return 1
+        stats = compile_hints(sources, args.out)
+        print(f"Wrote {args.out} ({os.path.getsize(args.out)} bytes): {stats}")
+        return 0
+
+    reader = CompiledHints(args.path)
+    view = reader.language(args.language)
+    if view is None:
+        print(f"Language '{args.language}' not in {args.path}; available: {reader.languages()}")
+        return 1
+    if args.word:
+        print(json.dumps(view.hints(args.category, args.word), ensure_ascii=False, indent=2))
+    else:
+        print(json.dumps(list(view.words(args.category)), ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
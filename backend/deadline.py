@@ -0,0 +1,122 @@
+"""
+End-to-end latency budgets for LLM-backed calls.
+
+A Deadline is an absolute point on the monotonic clock. Public WordSelector
+entry points open a deadline scope for the current thread. Everything beneath
+them (HTTP timeouts, retry backoff, 429 cooldowns, the primary -> fallback
+model switch, hint retries) is scheduled against current_deadline(), so a
+call never blocks the Streamlit script run for longer than its budget. Once
+the budget is spent the call falls back to offline logic.
+
+Nested scopes never extend an outer deadline; the earlier of the two wins.
+
+Default budgets per entry point (seconds, 0 = unbounded):
+    LLM_DEADLINE_SELECT_WORD_S=12
+    LLM_DEADLINE_ANSWER_S=8
+    LLM_DEADLINE_HINTS_S=15
+    LLM_DEADLINE_PERSONAL_POOL_S=25
+"""
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+from typing import Optional, Union
+
+_DEFAULT_BUDGETS = {
+    'select_word': ('LLM_DEADLINE_SELECT_WORD_S', 12.0),
+    'answer_question': ('LLM_DEADLINE_ANSWER_S', 8.0),
+    'get_api_hints': ('LLM_DEADLINE_HINTS_S', 15.0),
+    'generate_personal_pool': ('LLM_DEADLINE_PERSONAL_POOL_S', 25.0),
+}
+
+_local = threading.local()
+
+
+class DeadlineExceeded(RuntimeError):
+    """The latency budget for the current call has been spent."""
+
+
+class Deadline:
+    """Absolute deadline on time.monotonic(); `None` budget means unbounded."""
+
+    def __init__(self, budget_s: Optional[float] = None):
+        self.at = None if budget_s is None else time.monotonic() + max(0.0, float(budget_s))
+
+    @classmethod
+    def for_call(cls, call: str) -> 'Deadline':
+        """Deadline from the env budget configured for `call` (see module docstring)."""
+        env_name, default = _DEFAULT_BUDGETS.get(call, (None, 0.0))
+        budget = default
+        if env_name:
+            try:
+                budget = float(os.getenv(env_name, str(default)))
+            except Exception:
+                budget = default
+        return cls(budget if budget > 0 else None)
+
+    @classmethod
+    def coerce(cls, value: Union['Deadline', float, int, None], call: str) -> 'Deadline':
+        """Accept a Deadline, a budget in seconds, or None (use the env default for `call`)."""
+        if isinstance(value, Deadline):
+            return value
+        if isinstance(value, (int, float)):
+            return cls(value if value > 0 else None)
+        return cls.for_call(call)
+
+    def remaining(self) -> float:
+        if self.at is None:
+            return float('inf')
+        return max(0.0, self.at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.at is not None and time.monotonic() >= self.at
+
+    def check(self) -> None:
+        if self.expired():
+            raise DeadlineExceeded("LLM call budget exhausted")
+
+    def timeout(self, cap: float) -> float:
+        """`cap` shortened to the time left."""
+        return min(float(cap), self.remaining())
+
+    def sleep(self, seconds: float) -> bool:
+        """Sleep `seconds` if that fits in the budget; returns False (without sleeping) otherwise."""
+        if seconds > self.remaining():
+            return False
+        if seconds > 0:
+            time.sleep(seconds)
+        return True
+
+    def share(self, fraction: float) -> 'Deadline':
+        """A sub-deadline ending after `fraction` of the remaining time (used to reserve time for fallbacks)."""
+        child = Deadline()
+        if self.at is not None:
+            child.at = time.monotonic() + self.remaining() * max(0.0, min(1.0, fraction))
+        return child
+
+    def earliest(self, other: Optional['Deadline']) -> 'Deadline':
+        if other is None or other.at is None:
+            return self
+        if self.at is None or other.at < self.at:
+            return other
+        return self
+
+
+def current_deadline() -> Deadline:
+    """Innermost deadline for this thread (unbounded when no scope is open)."""
+    return getattr(_local, 'deadline', None) or Deadline()
+
+
+@contextmanager
+def deadline_scope(value: Union[Deadline, float, int, None], call: str):
+    """Open a deadline for `call` on this thread, never later than an enclosing one."""
+    previous = getattr(_local, 'deadline', None)
+    deadline = Deadline.coerce(value, call)
+    if previous is not None:
+        deadline = deadline.earliest(previous)
+    _local.deadline = deadline
+    try:
+        yield deadline
+    finally:
+        _local.deadline = previous
@@ -3,6 +3,7 @@ import json
 import httpx
 import logging
 from dotenv import load_dotenv, find_dotenv
+from .http_client import chat_completions_url
 
 # Load shared .env (prefer project root) without overriding existing env
 _ENV_PATH = find_dotenv(usecwd=True)
@@ -14,7 +15,6 @@ try:
 except Exception:
     pass
 
-OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
 MODEL = os.getenv("OPENROUTER_MODEL", "gpt-4o")
 
 
@@ -84,7 +84,7 @@ async def generate_hints_from_text(doc_text: str, count: int) -> dict:
     }
     body = _build_prompt(doc_text, count)
     async with httpx.AsyncClient(timeout=60) as client:
-        r = await client.post(OPENROUTER_URL, headers=headers, json=body)
+        r = await client.post(chat_completions_url(), headers=headers, json=body)
         r.raise_for_status()
         data = r.json()
     content = data["choices"][0]["message"]["content"].strip()
@@ -0,0 +1,17 @@
+"""Numeric environment knobs: parsed on each call, falling back to the default when unset or malformed."""
+
+import os
+
+
+def env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except Exception:
+        return default
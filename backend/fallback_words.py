@@ -9,6 +9,7 @@ from typing import Dict, List, Optional
 import logging
 import json
 import os
+from .hint_corpus import get_hint_index
 
 FALLBACK_WORDS: Dict[str, Dict[int, List[str]]] = {
     "general": {
@@ -161,15 +162,13 @@ def get_fallback_word(word_length: int, subject: str) -> Optional[str]:
     subject = CATEGORY_ALIASES.get(subject, subject)
     hints_file = os.path.join('backend', 'data', 'hints.json')
     try:
-        with open(hints_file, 'r', encoding='utf-8') as f:
-            hints_data = json.load(f)
-        templates = hints_data.get('templates', {})
+        index = get_hint_index(hints_file)
         # Use subject or fallback to general
-        if subject not in templates:
+        if not index.subject_key(subject):
             logger.warning(f"Subject '{subject}' not found in hints.json, falling back to 'general'")
             subject = 'general'
         if word_length == 'any':
-            words = list(templates.get(subject, {}).keys())
+            words = index.words(subject)
         else:
             
             try:
@@ -177,7 +176,7 @@ def get_fallback_word(word_length: int, subject: str) -> Optional[str]:
             except Exception as e:
                 
                 return None
-            words = [w for w in templates.get(subject, {}).keys() if len(w) == wl]
+            words = index.words_of_length(subject, wl)
         if not words:
             
             logger.error(f"No words found for subject '{subject}' in hints.json")
@@ -187,4 +186,4 @@ def get_fallback_word(word_length: int, subject: str) -> Optional[str]:
         return selected_word
     except Exception as e:
         logger.error(f"Error loading hints.json: {e}")
-        return None 
\ No newline at end of file
+        return None
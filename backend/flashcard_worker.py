@@ -124,53 +124,42 @@ def _improve_flashcard_hints_once() -> None:
                         pass
             if not pool:
                 continue
-            updated_pool = []
-            changed = False
-            attempts_made = 0
+            # Pick this pass's candidates (at most per_user_batch), then fetch their hints concurrently
+            candidates = []
             for item in pool:
-                # Stop early per-user to avoid aggressive usage
-                if attempts_made >= per_user_batch:
-                    updated_pool.extend(pool[len(updated_pool):])
+                if len(candidates) >= per_user_batch:
                     break
                 if not isinstance(item, dict):
-                    # normalize missing metadata
-                    if isinstance(item, dict) and 'hint_source' not in item:
-                        item['hint_source'] = 'api' if str(item.get('hint','')).strip() else 'local'
-                    if isinstance(item, dict) and 'api_attempts' not in item:
-                        item['api_attempts'] = 0
-                    if isinstance(item, dict) and 'hint_source' not in item:
-                        item['hint_source'] = 'api' if str(item.get('hint','')).strip() else 'local'
-                    if isinstance(item, dict) and 'api_attempts' not in item:
-                        item['api_attempts'] = 0
-                    updated_pool.append(item)
                     continue
                 w = str(item.get('word', '')).strip()
-                hint = str(item.get('hint', '')).strip()
                 src = item.get('hint_source', 'local')
                 tries = int(item.get('api_attempts', 0))
                 if w and src != 'api' and tries < max_attempts:
-                    # Respect quota warnings (already logged once at pass start)
-                    if _quota_critical:
-                        updated_pool.append(item)
-                        continue
-                    # One API attempt this pass
-                    got = None
-                    try:
-                        api_h = ws.get_api_hints_force(w, 'flashcard', n=1, attempts=1)
-                        got = str(api_h[0]) if api_h else None
-                    except Exception as e:
-                        logger.info(f"[FlashWorker] API attempt failed for '{w}': {e}")
-                        got = None
-                    tries += 1
-                    attempts_made += 1
-                    if got:
-                        updated_pool.append({"word": w, "hint": got, 'hint_source': 'api', 'api_attempts': tries})
-                        changed = True
-                    else:
-                        updated_pool.append({"word": w, "hint": hint, 'hint_source': src, 'api_attempts': tries})
-                        changed = True
-                else:
+                    candidates.append(item)
+            # Respect quota warnings (already logged once at pass start)
+            if _quota_critical or not candidates:
+                continue
+            results = ws.get_api_hints_many([str(it.get('word', '')).strip() for it in candidates], 'flashcard',
+                                            n=1, attempts=1, force=True)
+            # Only the items picked above are rewritten (not duplicates or later items with the same word)
+            candidate_ids = {id(it) for it in candidates}
+            updated_pool = []
+            changed = False
+            for item in pool:
+                w = str(item.get('word', '')).strip() if isinstance(item, dict) else ''
+                if id(item) not in candidate_ids or w not in results:
                     updated_pool.append(item)
+                    continue
+                api_h = results.get(w) or []
+                got = str(api_h[0]) if api_h else None
+                tries = int(item.get('api_attempts', 0)) + 1
+                if got:
+                    updated_pool.append({"word": w, "hint": got, 'hint_source': 'api', 'api_attempts': tries})
+                else:
+                    logger.info(f"[FlashWorker] API attempt failed for '{w}'")
+                    updated_pool.append({"word": w, "hint": str(item.get('hint', '')).strip(),
+                                         'hint_source': item.get('hint_source', 'local'), 'api_attempts': tries})
+                changed = True
             if changed:
                 try:
                     bio_store.update_user_record(username, {'flash_pool': updated_pool})
@@ -211,41 +200,41 @@ def _improve_personal_hints_once() -> None:
             pool = rec.get('personal_pool') if isinstance(rec, dict) else None
             if not isinstance(pool, list) or not pool:
                 continue
-            updated_pool = []
-            changed = False
-            attempts_made = 0
+            candidates = []
             for item in pool:
-                if attempts_made >= per_user_batch:
-                    updated_pool.extend(pool[len(updated_pool):])
+                if len(candidates) >= per_user_batch:
                     break
                 if not isinstance(item, dict):
-                    updated_pool.append(item)
                     continue
                 w = str(item.get('word', '')).strip()
                 hint = str(item.get('hint', '')).strip()
                 src = item.get('hint_source', 'api' if hint else 'local')
                 tries = int(item.get('api_attempts', 0))
                 if w and src != 'api' and tries < max_attempts:
-                    warning = get_quota_warning()
-                    if warning and warning.get('level') == 'error':
-                        updated_pool.append(item)
-                        continue
-                    got = None
-                    try:
-                        ah = ws.get_api_hints_force(w, 'personal', n=1, attempts=1)
-                        got = str(ah[0]) if ah else None
-                    except Exception:
-                        got = None
-                    tries += 1
-                    attempts_made += 1
-                    if got:
-                        updated_pool.append({"word": w, "hint": got, 'hint_source': 'api', 'api_attempts': tries})
-                        changed = True
-                    else:
-                        updated_pool.append({"word": w, "hint": hint, 'hint_source': src, 'api_attempts': tries})
-                        changed = True
-                else:
+                    candidates.append(item)
+            warning = get_quota_warning()
+            if not candidates or (warning and warning.get('level') == 'error'):
+                continue
+            results = ws.get_api_hints_many([str(it.get('word', '')).strip() for it in candidates], 'personal',
+                                            n=1, attempts=1, force=True)
+            candidate_ids = {id(it) for it in candidates}
+            updated_pool = []
+            changed = False
+            for item in pool:
+                w = str(item.get('word', '')).strip() if isinstance(item, dict) else ''
+                if id(item) not in candidate_ids or w not in results:
                     updated_pool.append(item)
+                    continue
+                hint = str(item.get('hint', '')).strip()
+                ah = results.get(w) or []
+                got = str(ah[0]) if ah else None
+                tries = int(item.get('api_attempts', 0)) + 1
+                if got:
+                    updated_pool.append({"word": w, "hint": got, 'hint_source': 'api', 'api_attempts': tries})
+                else:
+                    updated_pool.append({"word": w, "hint": hint, 'hint_source': item.get('hint_source', 'api' if hint else 'local'),
+                                         'api_attempts': tries})
+                changed = True
             if changed:
                 try:
                     bio_store.update_user_record(username, {'personal_pool': updated_pool})
@@ -2,12 +2,13 @@ from typing import Dict, List, Tuple, Optional
 from .word_selector import WordSelector
 from .game_stats import GameStats
 import time
-import re
 import logging
 import json
 import os
 import random
 from backend.fallback_words import get_fallback_word
+from backend.hint_corpus import get_hint_index
+from backend.answer_cache import normalize_question
 
 logger = logging.getLogger(__name__)
 
@@ -28,12 +29,22 @@ def _log_info_safe(prefix: str, text: str) -> None:
         pass
 
 class GameLogic:
-    def __init__(self, word_length: int = None, subject: str = "general", mode: str = "Fun", nickname: str = "", initial_score: int = 0, difficulty: str = "Medium"):
-        
-        # Persist WordSelector across all GameLogic instances
-        if not hasattr(GameLogic, 'word_selector'):
-            GameLogic.word_selector = WordSelector()
-        self.word_selector = GameLogic.word_selector
+    def __init__(self, word_length: int = None, subject: str = "general", mode: str = "Fun", nickname: str = "", initial_score: int = 0, difficulty: str = "Medium",
+                 username: Optional[str] = None, prefetched: Optional[Dict] = None, lazy_init: Optional[bool] = None,
+                 word_selector: Optional[WordSelector] = None):
+        """username overrides the Streamlit session user (background threads have no session);
+        prefetched is a bundle from backend.prefetch ({'word', 'hints', ...}) used instead of selecting;
+        lazy_init=False forces FlashCard selection even on pre-game screens (None = FLASHCARD_LAZY_INIT);
+        word_selector replaces the shared selector (background threads pass their own instance).
+        """
+
+        if word_selector is not None:
+            self.word_selector = word_selector
+        else:
+            # Persist WordSelector across all GameLogic instances
+            if not hasattr(GameLogic, 'word_selector'):
+                GameLogic.word_selector = WordSelector()
+            self.word_selector = GameLogic.word_selector
         self.stats_manager = GameStats(nickname=nickname)
         # Ignore word_length for word selection; keep for legacy only
         if subject == "any":
@@ -43,12 +54,13 @@ class GameLogic:
         self.mode = mode
         self.nickname = nickname
         # Derive account username from Streamlit session if available
-        self.account_username = None
-        try:
-            import streamlit as st  # type: ignore
-            self.account_username = (st.session_state.get('user') or {}).get('username') or None
-        except Exception:
-            self.account_username = None
+        self.account_username = username or None
+        if self.account_username is None:
+            try:
+                import streamlit as st  # type: ignore
+                self.account_username = (st.session_state.get('user') or {}).get('username') or None
+            except Exception:
+                self.account_username = None
 
         def _pool_username() -> str:
             return (self.account_username or self.nickname or "global")
@@ -79,10 +91,16 @@ class GameLogic:
         self.game_over = False
         self.guesses_made = 0
         self.show_word_penalty_applied = False
+        # Prefetched bundle: word and hints were already resolved off the critical path
+        if prefetched and prefetched.get('word'):
+            self.selected_word = prefetched['word']
+            self.available_hints = list(prefetched.get('hints') or [])[:self.current_settings["max_hints"]]
+            logger.info(f"[PREFETCH] Using prefetched word for subject '{self.subject}' with {len(self.available_hints)} hints")
+            return
         # Lightweight lazy-init for FlashCard on pre-game screens to avoid login delay
         try:
             subj_lower_lazy = str(self.subject).lower()
-            lazy_env = str(os.getenv('FLASHCARD_LAZY_INIT', 'true')).strip().lower() in ('1','true','yes','on')
+            lazy_env = str(os.getenv('FLASHCARD_LAZY_INIT', 'true')).strip().lower() in ('1','true','yes','on') if lazy_init is None else bool(lazy_init)
             pregame = False
             try:
                 import streamlit as _st  # type: ignore
@@ -116,28 +134,22 @@ class GameLogic:
                     else:
                         hints_file = getattr(self.word_selector, '_get_hints_file_for_user', lambda _: os.path.join('backend','data','hints.json'))(self._pool_username())
                     logger.info(f"[HINTS_FILE_GAMELOGIC] user='{self._pool_username()}' subject='{subject}' file='{hints_file}'")
-                    with open(hints_file, 'r', encoding='utf-8') as f:
-                        hints_data = json.load(f)
-                        # Try the original subject first (case-insensitive against hints.json keys)
-                        lookup_subject = subject
-                        templates = hints_data.get("templates", {})
-                        ci_key_map = {k.lower(): k for k in templates.keys()}
-                        subject_key = ci_key_map.get(str(lookup_subject).lower())
-                        general_key = ci_key_map.get("general") if "general" in ci_key_map else "general"
-                        if subject_key and self.selected_word in templates.get(subject_key, {}):
-                            logger.info(f"Found hints in hints.json for '{self.selected_word}' in category '{subject_key}'")
-                            all_hints = templates[subject_key][self.selected_word]
-                            logger.info(f"Using {len(all_hints)} hints from hints.json")
-                        elif general_key and self.selected_word in templates.get(general_key, {}):
-                            logger.info(f"Falling back to 'general' for hints for '{self.selected_word}'")
-                            all_hints = templates[general_key][self.selected_word]
-                            logger.info(f"Using {len(all_hints)} hints from hints.json (general)")
-                        else:
-                            try:
-                                cats = list((hints_data or {}).get('templates', {}).keys())
-                            except Exception:
-                                cats = []
-                            logger.warning(f"Word '{self.selected_word}' not found in hints file '{hints_file}' for category '{lookup_subject}'. Available categories={cats[:10]}")
+                    index = get_hint_index(hints_file)
+                    # Try the original subject first (case-insensitive against hints.json keys)
+                    lookup_subject = subject
+                    subject_key = index.subject_key(lookup_subject)
+                    general_key = index.subject_key("general") or "general"
+                    if subject_key and index.has_word(subject_key, self.selected_word):
+                        logger.info(f"Found hints in hints.json for '{self.selected_word}' in category '{subject_key}'")
+                        all_hints = index.hints(subject_key, self.selected_word)
+                        logger.info(f"Using {len(all_hints)} hints from hints.json")
+                    elif general_key and index.has_word(general_key, self.selected_word):
+                        logger.info(f"Falling back to 'general' for hints for '{self.selected_word}'")
+                        all_hints = index.hints(general_key, self.selected_word)
+                        logger.info(f"Using {len(all_hints)} hints from hints.json (general)")
+                    else:
+                        cats = index.categories()
+                        logger.warning(f"Word '{self.selected_word}' not found in hints file '{hints_file}' for category '{lookup_subject}'. Available categories={cats[:10]}")
                 except FileNotFoundError:
                     logger.warning(f"Hints file not found at {hints_file}")
                 except json.JSONDecodeError:
@@ -206,7 +218,7 @@ class GameLogic:
                             if hint_local:
                                 all_hints = [hint_local] * self.current_settings["max_hints"]
                     else:
-                        api_hints = self.word_selector.get_api_hints(self.selected_word, subject, n=self.current_settings["max_hints"])
+                        api_hints = self.word_selector.get_bank_or_api_hints(self.selected_word, subject, n=self.current_settings["max_hints"])
                 if api_hints:
                     all_hints = api_hints
                     logger.info(f"[HINT REQUEST] Using {len(all_hints)} API-generated hints for '{self.selected_word}'")
@@ -284,16 +296,14 @@ class GameLogic:
             return False, "Question cannot be empty!", 0
 
         # Normalize the question by removing punctuation and extra spaces
-        normalized_question = re.sub(r'[^\w\s]', '', question.lower()).strip()
-        normalized_question = ' '.join(normalized_question.split())
+        normalized_question = normalize_question(question)
 
         # Extract key terms from the question
         key_terms = set(normalized_question.split())
 
         # Check if this question was already asked
         for q in self.questions_asked:
-            normalized_prev = re.sub(r'[^\w\s]', '', q["question"].lower()).strip()
-            normalized_prev = ' '.join(normalized_prev.split())
+            normalized_prev = normalize_question(q["question"])
             prev_terms = set(normalized_prev.split())
 
             if normalized_question == normalized_prev:
@@ -423,12 +433,13 @@ class GameLogic:
             subj_lower = str(self.original_subject).lower()
             if subj_lower == 'flashcard':
                 try:
-                    from backend.bio_store import get_active_flash_set_name, get_flash_set_pool, get_flash_pool
+                    from backend.bio_store import get_active_flash_set_name, get_flash_set_pool, get_flash_pool, snapshot
                     _uname = self._pool_username()
-                    _active_name = get_active_flash_set_name(_uname) or 'flashcard'
-                    pool_fc = get_flash_set_pool(_uname, _active_name) or []
-                    if not isinstance(pool_fc, list) or not pool_fc:
-                        pool_fc = get_flash_pool(_uname) or []
+                    with snapshot():
+                        _active_name = get_active_flash_set_name(_uname) or 'flashcard'
+                        pool_fc = get_flash_set_pool(_uname, _active_name) or []
+                        if not isinstance(pool_fc, list) or not pool_fc:
+                            pool_fc = get_flash_pool(_uname) or []
                 except Exception:
                     pool_fc = []
                 if isinstance(pool_fc, list) and pool_fc:
@@ -0,0 +1,347 @@
+"""
+Append-only log of finished games with a per-user offset index.
+
+game_results.json was one JSON object of nickname -> [games]. Every game over
+loaded and rewrote all of it, and every leaderboard read parsed and flattened
+it again. Games are now single JSON lines appended to game_results.jsonl:
+
+- append() is one O_APPEND write of one line
+- the index maps each user to the byte offsets of their lines, so
+  user_games() seeks to and parses only that user's records
+- the index is kept in memory and caught up by reading only the bytes other
+  processes appended since the last read. A snapshot in <log>.idx (written by
+  compaction) saves the first full scan on startup.
+- all_games() keeps the parsed records and extends them from the same tail,
+  so repeated leaderboard reads no longer re-parse the file
+- delete_user() appends a tombstone line. compact() rewrites the log without
+  deleted users or torn lines, groups each user's records together, and
+  refreshes the snapshot. It runs on its own every GAME_RESULTS_COMPACT_EVERY
+  appends.
+
+On first use, an existing legacy game_results.json next to the log is imported
+once (import_legacy). Compaction holds an exclusive lock on <log>.lock and
+appends hold a shared one, so no append is lost across processes (POSIX only;
+elsewhere the lock is per process).
+
+CLI:
+    python -m backend.game_results_log import [--legacy game_results.json] [--log game_results.jsonl]
+    python -m backend.game_results_log compact [--log game_results.jsonl]
+    python -m backend.game_results_log stats [--log game_results.jsonl]
+
+Env:
+    GAME_RESULTS_PATH=game_results.json        (the log is the same name with .jsonl)
+    GAME_RESULTS_COMPACT_EVERY=5000            (0 disables automatic compaction)
+"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+import threading
+from array import array
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .env_utils import env_int
+
+try:
+    import fcntl
+except ImportError:  # Windows: per-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_TOMBSTONE = '_deleted_user'
+
+
+def log_path_for(legacy_path: str) -> str:
+    """game_results.json -> game_results.jsonl"""
+    return os.path.splitext(legacy_path)[0] + '.jsonl'
+
+
+def _user_of(game: Dict[str, Any]) -> str:
+    return str(game.get('nickname') or '').strip().lower()
+
+
+class GameResultsLog:
+    """JSONL game log with an in-memory per-user offset index."""
+
+    def __init__(self, path: str, legacy_path: Optional[str] = None, compact_every: int = 5000):
+        self.path = path
+        self.index_path = f"{path}.idx"
+        self.lock_path = f"{path}.lock"
+        self.compact_every = max(0, int(compact_every))
+        self._lock = threading.RLock()
+        self._offsets: Dict[str, array] = {}
+        self._deleted: Dict[str, int] = {}  # user -> offset of their latest tombstone
+        self._indexed_upto = 0
+        self._inode = None
+        self._lines = 0
+        self._games: Optional[List[Tuple[int, Dict[str, Any]]]] = None
+        self._games_upto = 0
+        self._appends = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if legacy_path and not os.path.exists(path) and os.path.exists(legacy_path):
+            self.import_legacy(legacy_path)
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+        finally:
+            os.close(fd)  # releases the lock
+
+    # --- index maintenance ---
+    def _reset(self) -> None:
+        self._offsets = {}
+        self._deleted = {}
+        self._indexed_upto = 0
+        self._lines = 0
+        self._games = None
+        self._games_upto = 0
+
+    def _load_snapshot(self, st: os.stat_result) -> None:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                snap = json.load(f)
+        except Exception:
+            return
+        if snap.get('inode') != st.st_ino or int(snap.get('size', -1)) > st.st_size:
+            return  # snapshot belongs to an older file
+        self._offsets = {u: array('q', offs) for u, offs in (snap.get('users') or {}).items()}
+        self._deleted = {u: int(o) for u, o in (snap.get('deleted') or {}).items()}
+        self._indexed_upto = int(snap['size'])
+        self._lines = int(snap.get('lines', 0))
+
+    def _scan(self, start: int) -> Iterator[Tuple[int, int, Optional[Dict[str, Any]]]]:
+        """Yield (offset, end, record or None) per complete line from `start`; stops before a torn tail."""
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            offset = start
+            for raw in f:
+                if not raw.endswith(b'\n'):
+                    break  # another process is mid-append; pick it up next time
+                try:
+                    rec = json.loads(raw)
+                except Exception:
+                    rec = None
+                end = offset + len(raw)
+                yield offset, end, rec if isinstance(rec, dict) else None
+                offset = end
+
+    def _catch_up(self) -> None:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            self._reset()
+            self._inode = None
+            return
+        if st.st_ino != self._inode or st.st_size < self._indexed_upto:
+            # First use, or the file was replaced by a compaction
+            self._reset()
+            self._inode = st.st_ino
+            self._load_snapshot(st)
+        if st.st_size == self._indexed_upto:
+            return
+        for offset, end, rec in self._scan(self._indexed_upto):
+            self._lines += 1
+            self._indexed_upto = end
+            if rec is None:
+                continue
+            deleted = rec.get(_TOMBSTONE)
+            if deleted is not None:
+                user = str(deleted).lower()
+                self._deleted[user] = offset
+                self._offsets.pop(user, None)
+                continue
+            self._offsets.setdefault(_user_of(rec), array('q')).append(offset)
+
+    # --- writes ---
+    def append(self, game: Dict[str, Any]) -> int:
+        """Append one game (must carry 'nickname'); returns its byte offset."""
+        user = _user_of(game)
+        if not user:
+            raise ValueError("game has no nickname")
+        data = (json.dumps(dict(game, nickname=user), ensure_ascii=False) + '\n').encode('utf-8')
+        offset = self._write(data)
+        with self._lock:
+            if offset == self._indexed_upto and self._inode is not None:
+                # Nobody else appended in between: index it without re-reading
+                self._offsets.setdefault(user, array('q')).append(offset)
+                self._indexed_upto = offset + len(data)
+                self._lines += 1
+            self._appends += 1
+            due = self.compact_every and self._appends >= self.compact_every
+        if due:
+            try:
+                self.compact()
+            except Exception as e:
+                logger.warning(f"[GAME_RESULTS] compaction failed: {e}")
+        return offset
+
+    def _write(self, data: bytes) -> int:
+        with self._file_lock(exclusive=False):
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+                return os.lseek(fd, 0, os.SEEK_CUR) - len(data)
+            finally:
+                os.close(fd)
+
+    def delete_user(self, user: str) -> None:
+        """Hide all of a user's games now; compaction drops them from disk."""
+        user = (user or '').strip().lower()
+        if user:
+            self._write((json.dumps({_TOMBSTONE: user}) + '\n').encode('utf-8'))
+
+    # --- reads ---
+    def user_games(self, user: str) -> List[Dict[str, Any]]:
+        """One user's games in the order they were saved; reads only their lines."""
+        user = (user or '').strip().lower()
+        with self._lock:
+            self._catch_up()
+            offsets = list(self._offsets.get(user, ()))
+        games = []
+        if not offsets:
+            return games
+        with open(self.path, 'rb') as f:
+            for offset in offsets:
+                f.seek(offset)
+                try:
+                    games.append(json.loads(f.readline()))
+                except Exception:
+                    continue
+        return games
+
+    def all_games(self) -> List[Dict[str, Any]]:
+        """Every live game (copies, with 'nickname' set), parsed once per process and extended by the tail."""
+        with self._lock:
+            self._catch_up()
+            if self._games is None or self._games_upto > self._indexed_upto:
+                self._games = []
+                self._games_upto = 0
+            if self._games_upto < self._indexed_upto:
+                for offset, end, rec in self._scan(self._games_upto):
+                    if end > self._indexed_upto:
+                        break
+                    if rec is not None and _TOMBSTONE not in rec:
+                        self._games.append((offset, rec))
+                self._games_upto = self._indexed_upto
+            deleted = self._deleted
+            return [dict(rec) for offset, rec in self._games
+                    if not (deleted and deleted.get(_user_of(rec), -1) > offset)]
+
+    def users(self) -> List[str]:
+        with self._lock:
+            self._catch_up()
+            return [u for u, offs in self._offsets.items() if offs]
+
+    def count(self) -> int:
+        with self._lock:
+            self._catch_up()
+            return sum(len(offs) for offs in self._offsets.values())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._catch_up()
+            live = sum(len(offs) for offs in self._offsets.values())
+            return {'games': live, 'users': sum(1 for offs in self._offsets.values() if offs),
+                    'lines': self._lines, 'dead_lines': self._lines - live,
+                    'bytes': self._indexed_upto, 'deleted_users': len(self._deleted)}
+
+    # --- maintenance ---
+    def compact(self) -> Dict[str, int]:
+        """Rewrite the log grouped by user without dead lines, and save the index snapshot."""
+        with self._file_lock(exclusive=True), self._lock:
+            self._catch_up()
+            tmp = f"{self.path}.tmp"
+            offsets: Dict[str, List[int]] = {}
+            written = 0
+            with open(self.path, 'rb') as src, open(tmp, 'wb') as dst:
+                for user, user_offsets in self._offsets.items():
+                    for offset in user_offsets:
+                        src.seek(offset)
+                        raw = src.readline()
+                        if not raw.endswith(b'\n'):
+                            continue
+                        offsets.setdefault(user, []).append(written)
+                        dst.write(raw)
+                        written += len(raw)
+                dst.flush()
+                os.fsync(dst.fileno())
+                inode = os.fstat(dst.fileno()).st_ino
+            before = self._lines
+            snap = {'inode': inode, 'size': written, 'lines': sum(len(o) for o in offsets.values()),
+                    'users': offsets, 'deleted': {}}
+            idx_tmp = f"{self.index_path}.tmp"
+            with open(idx_tmp, 'w', encoding='utf-8') as f:
+                json.dump(snap, f)
+            os.replace(idx_tmp, self.index_path)
+            os.replace(tmp, self.path)
+            self._reset()
+            self._inode = None
+            self._appends = 0
+            self._catch_up()
+        return {'lines_before': before, 'lines_after': snap['lines'], 'bytes': written}
+
+    def import_legacy(self, legacy_path: str) -> int:
+        """Append every game from a legacy nickname -> [games] JSON file; returns the number imported."""
+        with open(legacy_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        lines = []
+        if isinstance(data, dict):
+            for user, games in data.items():
+                for game in games if isinstance(games, list) else []:
+                    if isinstance(game, dict) and str(user or '').strip():
+                        lines.append(json.dumps(dict(game, nickname=str(user).strip().lower()), ensure_ascii=False) + '\n')
+        if lines:
+            self._write(''.join(lines).encode('utf-8'))
+        logger.info(f"[GAME_RESULTS] imported {len(lines)} games from {legacy_path}")
+        return len(lines)
+
+
+_logs: Dict[str, GameResultsLog] = {}
+_logs_lock = threading.Lock()
+
+
+def get_game_results_log(legacy_path: Optional[str] = None) -> GameResultsLog:
+    """Process-wide log for a legacy results path (default GAME_RESULTS_PATH); imports it on first use."""
+    legacy_path = legacy_path or os.getenv('GAME_RESULTS_PATH', 'game_results.json')
+    path = log_path_for(legacy_path)
+    log = _logs.get(path)
+    if log is None:
+        with _logs_lock:
+            log = _logs.get(path)
+            if log is None:
+                log = _logs[path] = GameResultsLog(path, legacy_path, env_int('GAME_RESULTS_COMPACT_EVERY', 5000))
+    return log
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Game results log maintenance")
+    default_legacy = os.getenv('GAME_RESULTS_PATH', 'game_results.json')
+    parser.add_argument('--log', default=log_path_for(default_legacy))
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_import = sub.add_parser('import', help='append games from a legacy game_results.json')
+    p_import.add_argument('--legacy', default=default_legacy)
+    sub.add_parser('compact', help='drop dead lines, group by user, save the index snapshot')
+    sub.add_parser('stats', help='game/user/line counts')
+    args = parser.parse_args()
+
+    log = GameResultsLog(args.log, compact_every=0)
+    if args.command == 'import':
+        print(f"Imported {log.import_legacy(args.legacy)} games into {args.log}")
+    elif args.command == 'compact':
+        print(json.dumps(log.compact(), indent=2))
+    else:
+        print(json.dumps(log.stats(), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Hedged OpenRouter requests across the primary and fallback models.
+
+Without hedging the fallback model is only tried after the primary's whole
+retry ladder fails, so tail latency is the sum of both ladders. With hedging
+on, the first primary attempt gets a head start equal to a percentile of its
+recent latency. If it has not answered by then, the same request is sent to
+the fallback model. The first valid response wins. The loser is cancelled if
+it has not started yet; otherwise its response is discarded when it arrives
+(a blocking HTTP call cannot be interrupted mid-flight).
+
+The primary leg runs on its own thread, so unhedged traffic is never capped
+by the hedge pool (OPENROUTER_HEDGE_WORKERS) or queued behind hedges; only
+the hedge leg is submitted to the pool.
+
+Cost guardrail: hedges are only fired while the share of hedged requests over
+the recent window stays below OPENROUTER_HEDGE_MAX_RATE.
+
+Env:
+    OPENROUTER_HEDGE_ENABLED=false
+    OPENROUTER_HEDGE_PERCENTILE=0.9
+    OPENROUTER_HEDGE_MIN_SAMPLES=20      below this, use OPENROUTER_HEDGE_DEFAULT_DELAY_S
+    OPENROUTER_HEDGE_DEFAULT_DELAY_S=3
+    OPENROUTER_HEDGE_MIN_DELAY_S=0.5
+    OPENROUTER_HEDGE_MAX_RATE=0.1
+    OPENROUTER_HEDGE_WORKERS=8
+"""
+
+import os
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Optional
+from .env_utils import env_float
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """Recent successful-call latencies per model."""
+
+    def __init__(self, window: int = 200):
+        self._window = window
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(model, deque(maxlen=self._window)).append(float(seconds))
+
+    def percentile(self, model: str, p: float, min_samples: int = 1) -> Optional[float]:
+        with self._lock:
+            values = sorted(self._samples.get(model, ()))
+        if len(values) < max(1, min_samples):
+            return None
+        idx = min(len(values) - 1, max(0, int(round(p * (len(values) - 1)))))
+        return values[idx]
+
+
+class HedgePolicy:
+    """When to hedge and how long to wait first; caps the hedge rate over recent requests."""
+
+    def __init__(self, tracker: LatencyTracker, window: int = 200):
+        self.tracker = tracker
+        self._decisions: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def enabled(self) -> bool:
+        return os.getenv('OPENROUTER_HEDGE_ENABLED', 'false').strip().lower() in ('1', 'true', 'yes', 'on')
+
+    def delay(self, model: str) -> float:
+        observed = self.tracker.percentile(model, env_float('OPENROUTER_HEDGE_PERCENTILE', 0.9),
+                                           int(env_float('OPENROUTER_HEDGE_MIN_SAMPLES', 20)))
+        if observed is None:
+            observed = env_float('OPENROUTER_HEDGE_DEFAULT_DELAY_S', 3.0)
+        return max(env_float('OPENROUTER_HEDGE_MIN_DELAY_S', 0.5), observed)
+
+    def note_request(self) -> list:
+        """Record an unhedged request; returns the handle to pass to try_acquire_hedge."""
+        entry = [False]
+        with self._lock:
+            self._decisions.append(entry)
+        return entry
+
+    def try_acquire_hedge(self, entry: list) -> bool:
+        """Mark this request as hedged if that keeps the hedge rate under the cap."""
+        max_rate = env_float('OPENROUTER_HEDGE_MAX_RATE', 0.1)
+        with self._lock:
+            if not self._decisions or entry[0]:
+                return False
+            hedged = sum(1 for d in self._decisions if d[0])
+            if (hedged + 1) / len(self._decisions) > max_rate:
+                return False
+            entry[0] = True
+            return True
+
+    def hedge_rate(self) -> float:
+        with self._lock:
+            return (sum(1 for d in self._decisions if d[0]) / len(self._decisions)) if self._decisions else 0.0
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=int(env_float('OPENROUTER_HEDGE_WORKERS', 8)),
+                                               thread_name_prefix='openrouter-hedge')
+    return _executor
+
+
+def _run_in_thread(fn: Callable[[], Dict]) -> Future:
+    """Run fn on a new daemon thread; the primary leg never waits for a pool slot."""
+    future: Future = Future()
+    future.set_running_or_notify_cancel()
+
+    def run() -> None:
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name='openrouter-primary', daemon=True).start()
+    return future
+
+
+def hedged_call(primary: Callable[[], Dict], secondary: Callable[[], Dict], delay: float,
+                policy: HedgePolicy, is_valid: Callable[[Dict], bool] = lambda r: True,
+                timeout: Optional[float] = None) -> Dict:
+    """Run `primary`; if it has not finished after `delay`, also run `secondary` in the hedge pool.
+
+    Returns the first valid result. Raises the primary's exception when neither succeeds.
+    """
+    entry = policy.note_request()
+    first = _run_in_thread(primary)
+    done, _ = wait([first], timeout=delay)
+    if done:
+        return first.result()
+    if not policy.try_acquire_hedge(entry):
+        return first.result(timeout=timeout)
+    logger.info(f"[HEDGE] primary slower than {delay:.2f}s; hedging to fallback (rate={policy.hedge_rate():.0%})")
+    second = _get_executor().submit(secondary)
+    pending = {first, second}
+    errors = {}
+    while pending:
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        if not done:
+            break
+        for fut in done:
+            try:
+                result = fut.result()
+            except Exception as e:
+                errors[fut] = e
+                continue
+            if is_valid(result):
+                for other in pending:
+                    other.cancel()
+                logger.info(f"[HEDGE] winner={'primary' if fut is first else 'fallback'}")
+                return result
+            errors[fut] = ValueError("invalid response")
+    raise errors.get(first) or errors.get(second) or TimeoutError("hedged request timed out")
+
+
+# Global instances
+latency_tracker = LatencyTracker()
+hedge_policy = HedgePolicy(latency_tracker)
@@ -0,0 +1,209 @@
+"""
+Durable bank of generated hints, keyed by (language, category, word).
+
+The hints corpus (backend/data/hints*.json) only covers curated words. Any
+other word used to go to the LLM once per process, and the result was lost on
+restart. Validated API hints are now stored here once. get_semantic_hint reads
+the bank before calling the API again, so a popular word costs one LLM call in
+total.
+
+Each row records its provenance: source ('api', 'batch', 'import', ...),
+model, and created_at / updated_at.
+
+CLI:
+    python -m backend.hint_bank stats
+    python -m backend.hint_bank export bank.jsonl [--language spanish]
+    python -m backend.hint_bank import bank.jsonl                  (JSONL from export)
+    python -m backend.hint_bank import backend/data/hints_fr.json --language french --source corpus
+
+Env:
+    HINT_BANK_ENABLED=true
+    HINT_BANK_PATH=game_data/hint_bank.sqlite3
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import logging
+import argparse
+import threading
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HINT_BANK_PATH = os.path.join('game_data', 'hint_bank.sqlite3')
+
+
+def _norm(value: str) -> str:
+    return str(value or '').strip().lower()
+
+
+class HintBank:
+    """SQLite-backed (language, category, word) -> hints store; a connection per thread."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS hint_bank ("
+            " language TEXT NOT NULL, category TEXT NOT NULL, word TEXT NOT NULL, hints TEXT NOT NULL,"
+            " source TEXT NOT NULL, model TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL,"
+            " PRIMARY KEY (language, category, word))"
+        )
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, language: str, category: str, word: str) -> List[str]:
+        entry = self.get_entry(language, category, word)
+        return entry['hints'] if entry else []
+
+    def get_entry(self, language: str, category: str, word: str) -> Optional[Dict]:
+        row = self._conn().execute(
+            "SELECT hints, source, model, created_at, updated_at FROM hint_bank"
+            " WHERE language = ? AND category = ? AND word = ?",
+            (_norm(language), _norm(category), _norm(word)),
+        ).fetchone()
+        if row is None:
+            return None
+        return {
+            'language': _norm(language), 'category': _norm(category), 'word': _norm(word),
+            'hints': json.loads(row[0]), 'source': row[1], 'model': row[2],
+            'created_at': row[3], 'updated_at': row[4],
+        }
+
+    def put(self, language: str, category: str, word: str, hints: List[str], source: str = 'api',
+            model: Optional[str] = None, created_at: Optional[float] = None) -> None:
+        """Insert or replace hints for a word (created_at of an existing row is kept)."""
+        hints = [str(h) for h in (hints or []) if str(h).strip()]
+        if not hints:
+            return
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT INTO hint_bank (language, category, word, hints, source, model, created_at, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT(language, category, word) DO UPDATE SET hints=excluded.hints, source=excluded.source,"
+            " model=excluded.model, updated_at=excluded.updated_at",
+            (_norm(language), _norm(category), _norm(word), json.dumps(hints, ensure_ascii=False),
+             source, model, created_at or now, now),
+        )
+        conn.commit()
+
+    def entries(self, language: Optional[str] = None) -> Iterator[Dict]:
+        sql = "SELECT language, category, word, hints, source, model, created_at, updated_at FROM hint_bank"
+        params = ()
+        if language:
+            sql += " WHERE language = ?"
+            params = (_norm(language),)
+        for row in self._conn().execute(sql + " ORDER BY language, category, word", params):
+            yield {
+                'language': row[0], 'category': row[1], 'word': row[2], 'hints': json.loads(row[3]),
+                'source': row[4], 'model': row[5], 'created_at': row[6], 'updated_at': row[7],
+            }
+
+    def stats(self) -> Dict:
+        rows = self._conn().execute(
+            "SELECT language, source, COUNT(*) FROM hint_bank GROUP BY language, source").fetchall()
+        out: Dict = {'total': 0, 'by_language': {}, 'by_source': {}}
+        for language, source, count in rows:
+            out['total'] += count
+            out['by_language'][language] = out['by_language'].get(language, 0) + count
+            out['by_source'][source] = out['by_source'].get(source, 0) + count
+        return out
+
+    def export_jsonl(self, path: str, language: Optional[str] = None) -> int:
+        count = 0
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for entry in self.entries(language):
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                count += 1
+        os.replace(tmp, path)
+        return count
+
+    def import_file(self, path: str, language: Optional[str] = None, source: str = 'import') -> int:
+        """Import an export JSONL file, or a hints-corpus JSON ({"templates": {cat: {word: [...]}}})."""
+        count = 0
+        if path.endswith('.jsonl'):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    e = json.loads(line)
+                    self.put(language or e['language'], e['category'], e['word'], e.get('hints') or [],
+                             source=e.get('source') or source, model=e.get('model'), created_at=e.get('created_at'))
+                    count += 1
+            return count
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        from .hint_corpus import language_for_hints_file
+        lang = language or language_for_hints_file(path) or 'english'
+        for category, words in ((data or {}).get('templates') or {}).items():
+            for word, hints in (words or {}).items():
+                if isinstance(hints, list) and hints:
+                    self.put(lang, category, word, hints, source=source)
+                    count += 1
+        return count
+
+
+_bank: Optional[HintBank] = None
+_bank_lock = threading.Lock()
+_bank_failed = False
+
+
+def get_hint_bank() -> Optional[HintBank]:
+    """Process-wide HintBank from env, or None when disabled/unavailable."""
+    global _bank, _bank_failed
+    if os.getenv('HINT_BANK_ENABLED', 'true').strip().lower() not in ('1', 'true', 'yes', 'on'):
+        return None
+    if _bank is None and not _bank_failed:
+        with _bank_lock:
+            if _bank is None and not _bank_failed:
+                path = os.getenv('HINT_BANK_PATH', DEFAULT_HINT_BANK_PATH)
+                try:
+                    _bank = HintBank(path)
+                except Exception as e:
+                    _bank_failed = True
+                    logger.warning(f"[HINT_BANK] unavailable at '{path}': {e}")
+    return _bank
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Inspect, import or export the hint bank")
+    parser.add_argument('--path', default=os.getenv('HINT_BANK_PATH', DEFAULT_HINT_BANK_PATH))
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('stats', help='row counts by language and source')
+    p_export = sub.add_parser('export', help='write all entries as JSONL')
+    p_export.add_argument('out')
+    p_export.add_argument('--language')
+    p_import = sub.add_parser('import', help='load a JSONL export or a hints*.json corpus file')
+    p_import.add_argument('src')
+    p_import.add_argument('--language')
+    p_import.add_argument('--source', default='import')
+    args = parser.parse_args()
+
+    bank = HintBank(args.path)
+    if args.command == 'stats':
+        print(json.dumps(bank.stats(), indent=2))
+    elif args.command == 'export':
+        print(f"Exported {bank.export_jsonl(args.out, args.language)} entries to {args.out}")
+    else:
+        print(f"Imported {bank.import_file(args.src, args.language, args.source)} entries from {args.src}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,294 @@
+"""
+Offline batch job that pre-generates hints for corpus words lacking them.
+
+Words reachable at runtime (every category in every hints*.json file, plus
+FALLBACK_WORDS) that have no hints, or fewer than --min-hints, in a given
+language file would otherwise trigger a live get_api_hints call mid-game.
+This job finds them, asks the LLM for hints in that language with bounded
+concurrency, validates the result, and writes it back into the language's
+hints file (atomic replace) and the hint bank (source='batch').
+
+Progress is checkpointed to a JSON file after every --flush-every results,
+so an interrupted run resumes where it stopped. Point --base-url at a local
+OpenRouter stand-in to run it without the real API.
+
+    python -m backend.hint_batch plan
+    python -m backend.hint_batch run --languages spanish,french --concurrency 4
+    python -m backend.hint_batch run --base-url http://127.0.0.1:8099/api/v1 --limit 20
+"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .hint_corpus import HINTS_FILES_BY_LANGUAGE, get_hint_index
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_PATH = os.path.join('game_data', 'hint_batch_checkpoint.json')
+
+LANGUAGE_NAMES = {
+    'english': 'English',
+    'spanish': 'Spanish',
+    'french': 'French',
+    'arabic': 'Arabic',
+    'chinese': 'Chinese',
+}
+
+# (language, category, word)
+Task = Tuple[str, str, str]
+Generator = Callable[[str, str, str, int], List[str]]
+
+
+def validate_hints(word: str, hints: Iterable, n: int) -> List[str]:
+    """Keep distinct string hints of sensible length that do not reveal the word."""
+    out: List[str] = []
+    for h in hints or []:
+        if not isinstance(h, str):
+            continue
+        h = h.strip()
+        if len(h) < 10 or len(h) > 160 or word.lower() in h.lower() or h in out:
+            continue
+        out.append(h)
+    return out[:n]
+
+
+def hints_file_for_language(language: str, data_dir: str) -> str:
+    return os.path.join(data_dir, HINTS_FILES_BY_LANGUAGE.get(language, 'hints.json'))
+
+
+def find_missing(languages: Iterable[str], data_dir: str, min_hints: int,
+                 categories: Optional[Iterable[str]] = None) -> List[Task]:
+    """(language, category, word) for every reachable word with fewer than `min_hints` hints."""
+    from .fallback_words import FALLBACK_WORDS
+    wanted = {c.lower() for c in categories} if categories else None
+    # Reachable words per category: union across all language files and the fallback dictionary
+    reachable: Dict[str, List[str]] = {}
+    for lang in HINTS_FILES_BY_LANGUAGE:
+        path = hints_file_for_language(lang, data_dir)
+        if not os.path.exists(path):
+            continue
+        index = get_hint_index(path)
+        for category in index.categories():
+            bucket = reachable.setdefault(category.lower(), [])
+            bucket.extend(w for w in index.words(category) if w not in bucket)
+    for category, by_length in FALLBACK_WORDS.items():
+        bucket = reachable.setdefault(category.lower(), [])
+        for words in by_length.values():
+            bucket.extend(w for w in words if w not in bucket)
+
+    tasks: List[Task] = []
+    for lang in languages:
+        path = hints_file_for_language(lang, data_dir)
+        index = get_hint_index(path) if os.path.exists(path) else None
+        for category in sorted(reachable):
+            if wanted is not None and category not in wanted:
+                continue
+            for word in reachable[category]:
+                have = index.hints(category, word) if index is not None else []
+                if len(have) < min_hints:
+                    tasks.append((lang, category, word))
+    return tasks
+
+
+class OpenRouterHintGenerator:
+    """Asks an OpenRouter-compatible chat endpoint for n hints in a given language."""
+
+    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None, model: Optional[str] = None):
+        from .http_client import HttpClient, chat_completions_url
+        if base_url:
+            self.url = f"{base_url.rstrip('/')}/chat/completions"
+        else:
+            self.url = chat_completions_url()
+        self.model = model or os.getenv('OPENROUTER_MODEL', 'openai/gpt-4o-mini')
+        self.headers = {
+            'Authorization': f"Bearer {api_key or os.getenv('OPENROUTER_API_KEY', '')}",
+            'Content-Type': 'application/json',
+        }
+        self.http = HttpClient()
+
+    def __call__(self, word: str, category: str, language: str, n: int) -> List[str]:
+        lang_name = LANGUAGE_NAMES.get(language, 'English')
+        messages = [
+            {"role": "system", "content": (
+                f"You write clues for a word guessing game. Write exactly {n} short, factual, diverse hints in "
+                f"{lang_name} about the given word in the given category. Never include the word itself, its "
+                f"letters, spelling or length. Return only a JSON array of strings.")},
+            {"role": "user", "content": f"Category: {category}\nWord: {word}"},
+        ]
+        response = self.http.post(self.url, json={"model": self.model, "messages": messages},
+                                  headers=self.headers, timeout=self.http.timeout())
+        response.raise_for_status()
+        content = response.json()["choices"][0]["message"]["content"].strip()
+        if content.startswith('```'):
+            content = content.strip('`').strip()
+            if content.startswith('json'):
+                content = content[4:].strip()
+        start, end = content.find('['), content.rfind(']')
+        return json.loads(content[start:end + 1]) if start >= 0 and end > start else []
+
+
+class HintBatchJob:
+    """Generates hints for `tasks`, checkpointing and writing back as results arrive."""
+
+    def __init__(self, generate: Generator, data_dir: str, checkpoint_path: str, n: int = 10,
+                 min_valid: int = 5, concurrency: int = 4, flush_every: int = 20, bank=None, model: str = ''):
+        self.generate = generate
+        self.data_dir = data_dir
+        self.checkpoint_path = checkpoint_path
+        self.n = n
+        self.min_valid = min_valid
+        self.concurrency = max(1, int(concurrency))
+        self.flush_every = max(1, int(flush_every))
+        self.bank = bank
+        self.model = model
+        self._lock = threading.Lock()
+        # language -> category -> word -> hints, waiting to be written back
+        self._pending: Dict[str, Dict[str, Dict[str, List[str]]]] = {}
+        self._pending_count = 0
+        self.checkpoint = self._load_checkpoint()
+
+    @staticmethod
+    def task_key(task: Task) -> str:
+        return ':'.join(task)
+
+    def _load_checkpoint(self) -> Dict:
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                data.setdefault('done', {})
+                return data
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"[HINT_BATCH] ignoring unreadable checkpoint '{self.checkpoint_path}': {e}")
+        return {'done': {}}
+
+    def _write_json_atomic(self, path: str, data: Dict) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+
+    def _flush(self) -> None:
+        """Write pending hints into their hints files, then the checkpoint (caller holds the lock)."""
+        for language, categories in self._pending.items():
+            path = hints_file_for_language(language, self.data_dir)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except FileNotFoundError:
+                data = {'templates': {}}
+            templates = data.setdefault('templates', {})
+            for category, words in categories.items():
+                key = next((k for k in templates if k.lower() == category), category)
+                templates.setdefault(key, {}).update(words)
+            self._write_json_atomic(path, data)
+        self._pending = {}
+        self._pending_count = 0
+        self._write_json_atomic(self.checkpoint_path, self.checkpoint)
+
+    def _record(self, task: Task, hints: List[str], error: Optional[str]) -> None:
+        language, category, word = task
+        with self._lock:
+            if hints:
+                self._pending.setdefault(language, {}).setdefault(category, {})[word] = hints
+                self.checkpoint['done'][self.task_key(task)] = 'ok'
+            else:
+                self.checkpoint['done'][self.task_key(task)] = f"failed: {error or 'too few valid hints'}"
+            self._pending_count += 1
+            if self._pending_count >= self.flush_every:
+                self._flush()
+        if hints and self.bank is not None:
+            try:
+                self.bank.put(language, category, word, hints, source='batch', model=self.model or None)
+            except Exception as e:
+                logger.warning(f"[HINT_BATCH] hint bank store failed for {self.task_key(task)}: {e}")
+
+    def _run_one(self, task: Task) -> Tuple[Task, List[str], Optional[str]]:
+        language, category, word = task
+        try:
+            hints = validate_hints(word, self.generate(word, category, language, self.n), self.n)
+        except Exception as e:
+            return task, [], str(e)
+        if len(hints) < self.min_valid:
+            return task, [], f"only {len(hints)} valid hints"
+        return task, hints, None
+
+    def run(self, tasks: List[Task], retry_failed: bool = False) -> Dict:
+        done = self.checkpoint['done']
+        todo = [t for t in tasks if self.task_key(t) not in done
+                or (retry_failed and done[self.task_key(t)] != 'ok')]
+        stats = {'total': len(tasks), 'skipped': len(tasks) - len(todo), 'ok': 0, 'failed': 0}
+        logger.info(f"[HINT_BATCH] {len(todo)} to generate ({stats['skipped']} already done)")
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='hint-batch') as pool:
+            futures = [pool.submit(self._run_one, t) for t in todo]
+            for fut in as_completed(futures):
+                task, hints, error = fut.result()
+                self._record(task, hints, error)
+                if hints:
+                    stats['ok'] += 1
+                else:
+                    stats['failed'] += 1
+                    logger.warning(f"[HINT_BATCH] {self.task_key(task)}: {error}")
+        with self._lock:
+            self._flush()
+        return stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Pre-generate hints for corpus words that lack them")
+    sub = parser.add_subparsers(dest='command', required=True)
+    for name, help_text in (('plan', 'list how many words need hints'), ('run', 'generate and write back hints')):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument('--data-dir', default=os.path.join('backend', 'data'))
+        p.add_argument('--languages', default=','.join(HINTS_FILES_BY_LANGUAGE))
+        p.add_argument('--categories', help='comma-separated subset of categories')
+        p.add_argument('--min-hints', type=int, default=3, help='words with fewer hints are regenerated')
+        p.add_argument('--limit', type=int, default=0)
+    p_run = sub.choices['run']
+    p_run.add_argument('--n', type=int, default=10, help='hints to request per word')
+    p_run.add_argument('--min-valid', type=int, default=5, help='minimum valid hints to accept a result')
+    p_run.add_argument('--concurrency', type=int, default=4)
+    p_run.add_argument('--flush-every', type=int, default=20)
+    p_run.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT_PATH)
+    p_run.add_argument('--retry-failed', action='store_true')
+    p_run.add_argument('--base-url', help='OpenRouter-compatible base URL (e.g. a local stand-in)')
+    p_run.add_argument('--model')
+    p_run.add_argument('--no-bank', action='store_true', help='do not also store results in the hint bank')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    languages = [l.strip().lower() for l in args.languages.split(',') if l.strip()]
+    categories = [c.strip() for c in args.categories.split(',')] if args.categories else None
+    tasks = find_missing(languages, args.data_dir, args.min_hints, categories)
+    if args.limit:
+        tasks = tasks[:args.limit]
+    if args.command == 'plan':
+        by_language: Dict[str, int] = {}
+        for language, _, _ in tasks:
+            by_language[language] = by_language.get(language, 0) + 1
+        print(json.dumps({'missing': len(tasks), 'by_language': by_language}, indent=2))
+        return 0
+
+    generator = OpenRouterHintGenerator(base_url=args.base_url, model=args.model)
+    bank = None
+    if not args.no_bank:
+        from .hint_bank import get_hint_bank
+        bank = get_hint_bank()
+    job = HintBatchJob(generator, args.data_dir, args.checkpoint, n=args.n, min_valid=args.min_valid,
+                       concurrency=args.concurrency, flush_every=args.flush_every, bank=bank, model=generator.model)
+    stats = job.run(tasks, retry_failed=args.retry_failed)
+    print(json.dumps(stats, indent=2))
+    return 0 if stats['failed'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+Process-wide, indexed view of the hints corpus (backend/data/hints*.json).
+
+Each hints file is parsed once per process and re-parsed only when its mtime
+changes. Lookups are O(1): case-insensitive subject -> words,
+(subject, word) -> hints, and per-category word-length buckets.
+
+When a compiled corpus (see backend/compiled_hints.py) exists at
+HINTS_COMPILED_PATH and was built from the current version of a hints file
+(same language file name and mtime), lookups for that file are served from the
+memory-mapped binary instead of parsing the JSON. Files that are not one of the
+known language files are always read from JSON.
+"""
+
+import os
+import json
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HINTS_FILE = os.path.join('backend', 'data', 'hints.json')
+HINTS_COMPILED_PATH = os.getenv('HINTS_COMPILED_PATH', os.path.join('backend', 'data', 'hints.bin'))
+
+# Hints file name per hints_language (same mapping as WordSelector._get_hints_file_for_user)
+HINTS_FILES_BY_LANGUAGE = {
+    'english': 'hints.json',
+    'spanish': 'hints_es.json',
+    'french': 'hints_fr.json',
+    'arabic': 'hints_ar.json',
+    'chinese': 'hints_ch.json',
+}
+
+
+def language_for_hints_file(path: str) -> Optional[str]:
+    """Map a hints file path back to its hints_language; None for files that are not a known language file."""
+    name = os.path.basename(str(path or '')).replace('_json', '.json')
+    for lang, fname in HINTS_FILES_BY_LANGUAGE.items():
+        if name == fname:
+            return lang
+    return None
+
+
+class HintIndex:
+    """Immutable lookup tables built from one parsed hints file."""
+
+    def __init__(self, path: str, data: Dict, mtime_ns: int = 0):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        templates = (data or {}).get('templates', {}) if isinstance(data, dict) else {}
+        self.templates: Dict[str, Dict[str, List[str]]] = templates if isinstance(templates, dict) else {}
+        self._subject_keys: Dict[str, str] = {}
+        self._words: Dict[str, Tuple[str, ...]] = {}
+        self._by_length: Dict[str, Dict[int, Tuple[str, ...]]] = {}
+        for key, words in self.templates.items():
+            if not isinstance(words, dict):
+                continue
+            self._subject_keys.setdefault(str(key).lower(), key)
+            ordered = tuple(w for w in words.keys() if isinstance(w, str))
+            self._words[key] = ordered
+            buckets: Dict[int, List[str]] = {}
+            for w in ordered:
+                buckets.setdefault(len(w), []).append(w)
+            self._by_length[key] = {n: tuple(ws) for n, ws in buckets.items()}
+
+    def categories(self) -> List[str]:
+        """Category keys in file order (original casing)."""
+        return list(self._words.keys())
+
+    def subject_key(self, subject: str) -> Optional[str]:
+        """Resolve a subject case-insensitively to the key used in the file."""
+        if subject is None:
+            return None
+        return self._subject_keys.get(str(subject).strip().lower())
+
+    def words(self, subject: str) -> Tuple[str, ...]:
+        """All words for a subject (empty when the subject is unknown)."""
+        key = self.subject_key(subject)
+        return self._words.get(key, ()) if key else ()
+
+    def words_of_length(self, subject: str, length: int) -> Tuple[str, ...]:
+        """Words of exactly `length` characters for a subject."""
+        key = self.subject_key(subject)
+        if not key:
+            return ()
+        try:
+            return self._by_length.get(key, {}).get(int(length), ())
+        except (TypeError, ValueError):
+            return ()
+
+    def has_word(self, subject: str, word: str) -> bool:
+        key = self.subject_key(subject)
+        return bool(key) and word in self.templates.get(key, {})
+
+    def hints(self, subject: str, word: str) -> List[str]:
+        """Hints for (subject, word); a fresh list so callers may mutate it."""
+        key = self.subject_key(subject)
+        if not key:
+            return []
+        found = self.templates.get(key, {}).get(word)
+        return list(found) if isinstance(found, list) else []
+
+
+class HintCorpus:
+    """Cache of HintIndex objects keyed by absolute file path, invalidated on mtime change."""
+
+    def __init__(self):
+        self._entries: Dict[str, HintIndex] = {}
+        self._lock = threading.Lock()
+        self._compiled = None
+        self._compiled_mtime_ns = None
+
+    def _compiled_view(self, abs_path: str, mtime_ns: int):
+        """Compiled view for a hints file when hints.bin is present and up to date, else None."""
+        language = language_for_hints_file(abs_path)
+        if language is None:
+            return None
+        try:
+            st = os.stat(HINTS_COMPILED_PATH)
+        except OSError:
+            return None
+        try:
+            if self._compiled is None or self._compiled_mtime_ns != st.st_mtime_ns:
+                from .compiled_hints import CompiledHints
+                self._compiled = CompiledHints(HINTS_COMPILED_PATH)
+                self._compiled_mtime_ns = st.st_mtime_ns
+            view = self._compiled.language(language)
+        except Exception as e:
+            logger.warning(f"[HINT_CORPUS] compiled corpus unusable, falling back to JSON: {e}")
+            self._compiled = None
+            return None
+        if view is None or view.source_name != os.path.basename(abs_path) or view.mtime_ns != mtime_ns:
+            return None
+        view.path = abs_path
+        return view
+
+    def get(self, path: Optional[str] = None) -> HintIndex:
+        """Return the index for `path`, loading or reloading it if needed.
+
+        Raises FileNotFoundError / json.JSONDecodeError like a direct json.load would.
+        """
+        abs_path = os.path.abspath(path or DEFAULT_HINTS_FILE)
+        mtime_ns = os.stat(abs_path).st_mtime_ns
+        entry = self._entries.get(abs_path)
+        if entry is not None and entry.mtime_ns == mtime_ns:
+            return entry
+        with self._lock:
+            entry = self._entries.get(abs_path)
+            if entry is not None and entry.mtime_ns == mtime_ns:
+                return entry
+            entry = self._compiled_view(abs_path, mtime_ns)
+            if entry is not None:
+                self._entries[abs_path] = entry
+                logger.info(f"[HINT_CORPUS] mapped '{abs_path}' from compiled corpus")
+                return entry
+            with open(abs_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            entry = HintIndex(abs_path, data, mtime_ns)
+            self._entries[abs_path] = entry
+            logger.info(f"[HINT_CORPUS] loaded '{abs_path}' categories={len(entry.categories())}")
+            return entry
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Drop one cached file (or all of them when path is None)."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+
+
+# Global instance
+hint_corpus = HintCorpus()
+
+
+def get_hint_index(path: Optional[str] = None) -> HintIndex:
+    """Return the shared HintIndex for a hints file (defaults to hints.json)."""
+    return hint_corpus.get(path)
@@ -0,0 +1,172 @@
+"""
+Shared, pooled HTTP client for OpenRouter calls.
+
+One HTTPAdapter (urllib3 connection pool) is shared by every thread, each
+thread gets its own requests.Session mounted on it, so connections are kept
+alive and reused across hint, answer and word requests instead of paying a
+TLS handshake per call.
+
+Each request records:
+    connect_ms  time spent opening a new connection (0 when a pooled one was reused)
+    ttfb_ms     time from sending the request until response headers arrived
+    total_ms    wall time including reading the body
+
+Env:
+    OPENROUTER_BASE_URL=https://openrouter.ai/api/v1
+    OPENROUTER_HTTP_POOL_SIZE=16
+    OPENROUTER_CONNECT_TIMEOUT_S=5
+    OPENROUTER_READ_TIMEOUT_S=15
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from .env_utils import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+
+# Connect time of the most recent new connection on this thread (None when reused)
+_timing = threading.local()
+
+
+def openrouter_base_url() -> str:
+    return (os.getenv('OPENROUTER_BASE_URL') or DEFAULT_OPENROUTER_BASE_URL).rstrip('/')
+
+
+def chat_completions_url() -> str:
+    return f"{openrouter_base_url()}/chat/completions"
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            _timing.connect_s = time.perf_counter() - start
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            _timing.connect_s = time.perf_counter() - start
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class _TimedAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools use connection classes that time connect()."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+
+class HttpClient:
+    """Thread-safe keep-alive client: one connection pool, one Session per thread."""
+
+    def __init__(self, pool_size: Optional[int] = None, connect_timeout: Optional[float] = None,
+                 read_timeout: Optional[float] = None, max_samples: int = 500):
+        self.pool_size = pool_size or env_int('OPENROUTER_HTTP_POOL_SIZE', 16)
+        self.connect_timeout = connect_timeout or env_float('OPENROUTER_CONNECT_TIMEOUT_S', 5.0)
+        self.read_timeout = read_timeout or env_float('OPENROUTER_READ_TIMEOUT_S', 15.0)
+        # No adapter-level retries: WordSelector owns retry/backoff policy
+        self._adapter = _TimedAdapter(pool_connections=4, pool_maxsize=self.pool_size, max_retries=0)
+        self._local = threading.local()
+        self._samples: deque = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._new_connections = 0
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('https://', self._adapter)
+            session.mount('http://', self._adapter)
+            self._local.session = session
+        return session
+
+    def timeout(self, read_timeout: Optional[float] = None) -> Tuple[float, float]:
+        """(connect, read) timeout tuple; read_timeout caps the configured read timeout."""
+        read = self.read_timeout if read_timeout is None else max(0.1, min(self.read_timeout, read_timeout))
+        return (min(self.connect_timeout, read), read)
+
+    def post(self, url: str, *, json=None, headers=None, timeout=None) -> requests.Response:
+        """POST through the pooled session and record connect/TTFB timings on response.timings."""
+        _timing.connect_s = None
+        start = time.perf_counter()
+        response = self._session().post(url, json=json, headers=headers, timeout=timeout or self.timeout())
+        total_s = time.perf_counter() - start
+        connect_s = getattr(_timing, 'connect_s', None)
+        try:
+            ttfb_ms = round(float(response.elapsed.total_seconds()) * 1000, 1)
+        except Exception:
+            ttfb_ms = round(total_s * 1000, 1)
+        timings = {
+            'connect_ms': round((connect_s or 0.0) * 1000, 1),
+            'ttfb_ms': ttfb_ms,
+            'total_ms': round(total_s * 1000, 1),
+            'reused': connect_s is None,
+            'status': response.status_code,
+        }
+        try:
+            response.timings = timings
+        except Exception:
+            pass
+        with self._lock:
+            self._requests += 1
+            if connect_s is not None:
+                self._new_connections += 1
+            self._samples.append(timings)
+        logger.debug(f"[HTTP] POST {url} status={timings['status']} connect_ms={timings['connect_ms']} "
+                     f"ttfb_ms={timings['ttfb_ms']} total_ms={timings['total_ms']} reused={timings['reused']}")
+        return response
+
+    def stats(self) -> Dict:
+        """Request counts and p50/p95 of connect/TTFB/total over recent requests."""
+        with self._lock:
+            samples = list(self._samples)
+            out = {'requests': self._requests, 'new_connections': self._new_connections}
+        for field in ('connect_ms', 'ttfb_ms', 'total_ms'):
+            values = sorted(s[field] for s in samples if not (field == 'connect_ms' and s['reused']))
+            if values:
+                out[f'{field}_p50'] = values[len(values) // 2]
+                out[f'{field}_p95'] = values[min(len(values) - 1, int(len(values) * 0.95))]
+        return out
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Process-wide HttpClient (created on first use from env)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
@@ -0,0 +1,300 @@
+"""
+Materialized leaderboard views, kept up to date as games are saved.
+
+get_global_leaderboard, the "Global Top 3 by SEI" blocks on the welcome
+screen and the top-SEI check on game over each used to compute over every game
+ever played, on every rerun. Views are now keyed by (category, mode, window):
+
+    category   lower-case subject, or '*' for all categories
+    mode       Fun / Wiz / Beat, or '*' for all modes
+    window     'all', 'month:YYYY-MM', 'day:YYYY-MM-DD'
+
+Each view holds two bounded min-heaps of size K:
+    score  the K highest-scoring games (get_global_leaderboard)
+    sei    the K users with the highest best SEI (top-3 tables, trophy check)
+
+add_game() pushes one game into its 12 views (category or '*' x mode or '*' x
+three windows). A read sorts at most K entries. Month and day windows older
+than LEADERBOARD_VIEW_MONTHS / LEADERBOARD_VIEW_DAYS are dropped. Views are
+stored in <results log>.views.json. They are rebuilt from the results log when
+that file is missing or its game count does not match the log at startup, and
+by the CLI.
+
+CLI:
+    python -m backend.leaderboard_views rebuild [--results game_results.json]
+    python -m backend.leaderboard_views show [--category animals] [--mode Beat] [--window all|month|day]
+
+Env:
+    LEADERBOARD_VIEW_K=20
+    LEADERBOARD_VIEW_DAYS=7
+    LEADERBOARD_VIEW_MONTHS=12
+"""
+
+import os
+import sys
+import json
+import heapq
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, UTC
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .env_utils import env_int
+
+try:
+    import fcntl
+except ImportError:  # Windows: per-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+ALL = '*'
+
+
+def game_sei(game: Dict[str, Any]) -> Optional[float]:
+    """Score per second, per word for Beat games; None when the game has no time."""
+    try:
+        score = float(game.get('score', 0) or 0)
+        time_taken = float(game.get('time_taken', game.get('duration', 0)) or 0)
+        words = game.get('words_solved', 1) if game.get('mode') == 'Beat' else 1
+    except (TypeError, ValueError):
+        return None
+    denom = max(int(words or 0), 1)
+    avg_time = time_taken / denom
+    return (score / denom) / avg_time if avg_time > 0 else None
+
+
+def _dim(value: Optional[str], lower: bool = False) -> str:
+    value = str(value or '').strip()
+    if not value or value.lower() in ('all', 'any', ALL):
+        return ALL
+    return value.lower() if lower else value
+
+
+def _window_key(window: str, now: Optional[datetime] = None) -> str:
+    now = now or datetime.now(UTC)
+    if window == 'month':
+        return f"month:{now:%Y-%m}"
+    if window == 'day':
+        return f"day:{now:%Y-%m-%d}"
+    return window or 'all'
+
+
+def view_key(category: Optional[str] = None, mode: Optional[str] = None, window: str = 'all') -> str:
+    """Key of one view; window is 'all', 'month'/'day' (current UTC period) or an explicit 'month:'/'day:' key."""
+    return f"{_dim(category, lower=True)}|{_dim(mode)}|{_window_key(window)}"
+
+
+class LeaderboardViews:
+    """Top-K views persisted as one JSON file, reloaded when another process rewrites it."""
+
+    def __init__(self, path: str, k: int = 20, keep_days: int = 7, keep_months: int = 12):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self.k = max(1, int(k))
+        self.keep_days = max(1, int(keep_days))
+        self.keep_months = max(1, int(keep_months))
+        self._lock = threading.RLock()
+        self._data: Dict[str, Any] = {'views': {}, 'games': 0, 'seq': 0}
+        self._sig: Optional[Tuple[int, int]] = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def _refresh(self) -> None:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return
+        sig = (st.st_mtime_ns, st.st_size)
+        if sig == self._sig:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"[LEADERBOARD] could not read {self.path}: {e}")
+            return
+        if isinstance(data, dict) and isinstance(data.get('views'), dict):
+            self._data = data
+            self._sig = sig
+
+    def _save(self) -> None:
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        st = os.stat(self.path)
+        self._sig = (st.st_mtime_ns, st.st_size)
+
+    # --- maintenance ---
+    def _cutoffs(self, now: datetime) -> Tuple[str, str]:
+        day = f"day:{now - timedelta(days=self.keep_days - 1):%Y-%m-%d}"
+        month_index = now.year * 12 + now.month - 1 - (self.keep_months - 1)
+        return day, f"month:{month_index // 12:04d}-{month_index % 12 + 1:02d}"
+
+    def _windows(self, game: Dict[str, Any], now: datetime) -> List[str]:
+        windows = ['all']
+        ts = str(game.get('timestamp') or game.get('end_time') or '')
+        if len(ts) >= 10:
+            day_cutoff, month_cutoff = self._cutoffs(now)
+            if f"month:{ts[:7]}" >= month_cutoff:
+                windows.append(f"month:{ts[:7]}")
+            if f"day:{ts[:10]}" >= day_cutoff:
+                windows.append(f"day:{ts[:10]}")
+        return windows
+
+    def _apply(self, game: Dict[str, Any], now: datetime) -> None:
+        self._data['seq'] = seq = int(self._data.get('seq', 0)) + 1
+        self._data['games'] = int(self._data.get('games', 0)) + 1
+        try:
+            score = float(game.get('score', 0) or 0)
+        except (TypeError, ValueError):
+            score = 0.0
+        sei = game_sei(game)
+        user = str(game.get('nickname') or '').strip().lower()
+        ts = str(game.get('timestamp') or '')
+        date = ts.split('T')[0]
+        views = self._data['views']
+        for category in {ALL, _dim(game.get('subject'), lower=True)}:
+            for mode in {ALL, _dim(game.get('mode'))}:
+                for window in self._windows(game, now):
+                    view = views.setdefault(f"{category}|{mode}|{window}", {'score': [], 'sei': []})
+                    # Ties keep the earlier game: -seq makes the later one the heap minimum
+                    self._push(view['score'], [score, -seq, dict(game)])
+                    if sei is not None and user:
+                        self._push_user(view['sei'], [sei, user, date, ts])
+
+    def _push(self, heap: List, entry: List) -> None:
+        if len(heap) < self.k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    def _push_user(self, heap: List, entry: List) -> None:
+        """Keep each user's best SEI; a user outside the top K re-enters only by beating the minimum."""
+        for i, current in enumerate(heap):
+            if current[1] == entry[1]:
+                if entry[0] > current[0]:
+                    heap[i] = entry
+                    heapq.heapify(heap)
+                return
+        self._push(heap, entry)
+
+    def _prune(self, now: datetime) -> None:
+        day_cutoff, month_cutoff = self._cutoffs(now)
+        views = self._data['views']
+        for key in list(views):
+            window = key.rsplit('|', 1)[-1]
+            if (window.startswith('day:') and window < day_cutoff) or \
+                    (window.startswith('month:') and window < month_cutoff):
+                del views[key]
+
+    def add_game(self, game: Dict[str, Any], now: Optional[datetime] = None) -> None:
+        now = now or datetime.now(UTC)
+        with self._file_lock(), self._lock:
+            self._refresh()
+            self._apply(game, now)
+            self._prune(now)
+            self._save()
+
+    def rebuild(self, games: Iterable[Dict[str, Any]], now: Optional[datetime] = None) -> int:
+        """Regenerate every view from scratch (e.g. from the results log); returns games applied."""
+        now = now or datetime.now(UTC)
+        with self._file_lock(), self._lock:
+            self._data = {'views': {}, 'games': 0, 'seq': 0, 'k': self.k}
+            for game in games:
+                self._apply(game, now)
+            self._prune(now)
+            self._save()
+            return self._data['games']
+
+    # --- reads ---
+    def games_applied(self) -> int:
+        with self._lock:
+            self._refresh()
+            return int(self._data.get('games', 0))
+
+    def _view(self, category, mode, window) -> Dict[str, List]:
+        with self._lock:
+            self._refresh()
+            return self._data['views'].get(view_key(category, mode, window)) or {'score': [], 'sei': []}
+
+    def top_scores(self, category: Optional[str] = None, mode: Optional[str] = None,
+                   window: str = 'all', n: int = 10) -> List[Dict[str, Any]]:
+        """Highest-scoring games, best first (copies)."""
+        heap = self._view(category, mode, window)['score']
+        return [dict(game) for score, neg_seq, game in sorted(heap, key=lambda e: (e[0], e[1]), reverse=True)[:n]]
+
+    def top_sei(self, category: Optional[str] = None, mode: Optional[str] = None,
+                window: str = 'all', n: int = 3) -> List[Dict[str, Any]]:
+        """Users by their best SEI, best first: [{'user', 'sei', 'date', 'timestamp'}]."""
+        heap = self._view(category, mode, window)['sei']
+        return [{'user': user, 'sei': sei, 'date': date, 'timestamp': ts}
+                for sei, user, date, ts in sorted(heap, key=lambda e: e[0], reverse=True)[:n]]
+
+
+_views: Dict[str, LeaderboardViews] = {}
+_views_lock = threading.Lock()
+
+
+def get_leaderboard_views(results_path: Optional[str] = None) -> LeaderboardViews:
+    """Process-wide views for a results path (default GAME_RESULTS_PATH), rebuilt from its log if missing or stale."""
+    from backend.game_results_log import get_game_results_log
+    log = get_game_results_log(results_path)
+    path = f"{log.path}.views.json"
+    views = _views.get(path)
+    if views is None:
+        with _views_lock:
+            views = _views.get(path)
+            if views is None:
+                views = LeaderboardViews(path, env_int('LEADERBOARD_VIEW_K', 20),
+                                         env_int('LEADERBOARD_VIEW_DAYS', 7), env_int('LEADERBOARD_VIEW_MONTHS', 12))
+                if not views.exists() or views.games_applied() != log.count():
+                    count = views.rebuild(log.all_games())
+                    logger.info(f"[LEADERBOARD] rebuilt views from {count} games")
+                _views[path] = views
+    return views
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Materialized leaderboard views")
+    parser.add_argument('--results', default=os.getenv('GAME_RESULTS_PATH', 'game_results.json'))
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('rebuild', help='regenerate all views from the results log')
+    p_show = sub.add_parser('show', help='print one view')
+    p_show.add_argument('--category', default=ALL)
+    p_show.add_argument('--mode', default=ALL)
+    p_show.add_argument('--window', default='all')
+    p_show.add_argument('-n', type=int, default=10)
+    args = parser.parse_args()
+
+    views = get_leaderboard_views(args.results)
+    if args.command == 'rebuild':
+        from backend.game_results_log import get_game_results_log
+        count = views.rebuild(get_game_results_log(args.results).all_games())
+        print(f"Rebuilt leaderboard views from {count} games into {views.path}")
+    else:
+        print(json.dumps({'key': view_key(args.category, args.mode, args.window),
+                          'top_sei': views.top_sei(args.category, args.mode, args.window, args.n),
+                          'top_scores': views.top_scores(args.category, args.mode, args.window, args.n)},
+                         indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""
+Shared, content-addressed cache of OpenRouter chat-completion responses.
+
+The same prompts are sent again and again across users and processes. Examples
+are yes/no answers for a given word and question, hint lists for popular
+words, and flash-card pools for the same text. Responses are stored in a
+WAL-mode SQLite file that every process on the host (or a mounted volume)
+shares. The key is sha256 of the requested models, the messages and the
+request parameters.
+
+Each call type has its own TTL, and a TTL of 0 disables caching for that
+call. Word selection is off by default because it relies on getting varied
+answers. When the row count goes over LLM_CACHE_MAX_ENTRIES, the least
+recently used rows are evicted. Per-process hit and miss counters are
+available from stats().
+
+Env:
+    LLM_CACHE_ENABLED=true
+    LLM_CACHE_PATH=game_data/llm_cache.sqlite3
+    LLM_CACHE_MAX_ENTRIES=20000
+    LLM_CACHE_TTL_ANSWER_QUESTION_S=604800
+    LLM_CACHE_TTL_GET_API_HINTS_S=2592000
+    LLM_CACHE_TTL_FLASH_POOL_S=86400
+    LLM_CACHE_TTL_PERSONAL_POOL_S=0
+    LLM_CACHE_TTL_SELECT_WORD_S=0
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional
+from .env_utils import env_float
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_TTLS = {
+    'answer_question': 7 * 86400,
+    'get_api_hints': 30 * 86400,
+    'flash_pool': 86400,
+    'personal_pool': 0,
+    'select_word': 0,
+}
+
+# Evict at most this often (seconds); between sweeps the table may briefly exceed the cap
+_EVICT_INTERVAL_S = 30.0
+
+
+def ttl_for(call_type: str) -> float:
+    """TTL in seconds for `call_type` (0 = not cached)."""
+    default = _DEFAULT_TTLS.get(call_type, 0)
+    return max(0.0, env_float(f"LLM_CACHE_TTL_{call_type.upper()}_S", default))
+
+
+def cache_key(models, messages, params: Optional[Dict] = None) -> str:
+    """Stable hash of the request; message dicts are serialized with sorted keys."""
+    blob = json.dumps({'models': list(models), 'messages': messages, 'params': params or {}},
+                      sort_keys=True, ensure_ascii=True, separators=(',', ':'))
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed TTL + LRU response cache; a connection per thread."""
+
+    def __init__(self, path: str, max_entries: int = 20000):
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._last_evict = 0.0
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY, call_type TEXT NOT NULL, response TEXT NOT NULL,"
+            " created_at REAL NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_access ON llm_cache(last_access)")
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, counters: Dict[str, int], call_type: str) -> None:
+        with self._lock:
+            counters[call_type] = counters.get(call_type, 0) + 1
+
+    def get(self, key: str, call_type: str) -> Optional[Dict]:
+        now = time.time()
+        conn = self._conn()
+        row = conn.execute("SELECT response, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] <= now:
+            self._count(self._misses, call_type)
+            return None
+        conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+        conn.commit()
+        self._count(self._hits, call_type)
+        return json.loads(row[0])
+
+    def put(self, key: str, call_type: str, response: Dict, ttl_s: float) -> None:
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, call_type, response, created_at, expires_at, last_access)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (key, call_type, json.dumps(response), now, now + ttl_s, now),
+        )
+        conn.commit()
+        if now - self._last_evict >= _EVICT_INTERVAL_S:
+            self._last_evict = now
+            self.evict(now)
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """Drop expired rows, then the least recently used beyond max_entries."""
+        now = time.time() if now is None else now
+        conn = self._conn()
+        removed = conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,)).rowcount or 0
+        (total,) = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        if total > self.max_entries:
+            removed += conn.execute(
+                "DELETE FROM llm_cache WHERE key IN"
+                " (SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                (total - self.max_entries,),
+            ).rowcount or 0
+        conn.commit()
+        return removed
+
+    def stats(self) -> Dict:
+        with self._lock:
+            hits, misses = dict(self._hits), dict(self._misses)
+        (entries,) = self._conn().execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+        total_hits, total_misses = sum(hits.values()), sum(misses.values())
+        lookups = total_hits + total_misses
+        return {
+            'entries': entries,
+            'hits': total_hits,
+            'misses': total_misses,
+            'hit_rate': (total_hits / lookups) if lookups else 0.0,
+            'by_call': {c: {'hits': hits.get(c, 0), 'misses': misses.get(c, 0)} for c in sorted(set(hits) | set(misses))},
+        }
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+_cache_failed = False
+
+
+def get_llm_cache() -> Optional[LLMCache]:
+    """Process-wide LLMCache from env, or None when disabled/unavailable."""
+    global _cache, _cache_failed
+    if os.getenv('LLM_CACHE_ENABLED', 'true').strip().lower() not in ('1', 'true', 'yes', 'on'):
+        return None
+    if _cache is None and not _cache_failed:
+        with _cache_lock:
+            if _cache is None and not _cache_failed:
+                path = os.getenv('LLM_CACHE_PATH', os.path.join('game_data', 'llm_cache.sqlite3'))
+                try:
+                    _cache = LLMCache(path, int(env_float('LLM_CACHE_MAX_ENTRIES', 20000)))
+                except Exception as e:
+                    _cache_failed = True
+                    logger.warning(f"[LLM_CACHE] unavailable at '{path}': {e}")
+    return _cache
@@ -0,0 +1,337 @@
+"""
+Local OpenRouter stand-in for tests, load tests and benchmarks without network.
+
+Serves POST /api/v1/chat/completions with deterministic, templated responses
+shaped like the prompts this app sends. Supported prompt kinds:
+
+    word selection ({"selected_word": ...})    yes/no answers
+    hint lists (JSON array of n sentences)     personal pools ([{"word", "hint"}])
+    flash pools ({"items": [...]})             document hints (doc_llm: {"Term": [...]})
+
+Anything else gets "OK". Canned responses can be added with
+{"match": "<substring of the last message>", "content": "..."}.
+
+A profile scripts latency and failures. Fault selection is seeded and counts
+requests, so the N-th request always gets the same outcome:
+
+    {
+      "latency": {"dist": "fixed", "ms": 50},              # or uniform (min_ms, max_ms)
+                                                           # or lognormal (median_ms, sigma)
+      "rate_429": 0.0, "rate_5xx": 0.0, "rate_malformed": 0.0,
+      "ratelimit_limit": 1000, "ratelimit_remaining": 1000, "retry_after_s": 1,
+      "seed": 0,
+      "responses": []
+    }
+
+Every response carries x-ratelimit-limit / -remaining / -reset headers. The
+remaining count drops by one per request, so openrouter_monitor's quota
+warnings can be exercised too.
+
+    python -m backend.openrouter_stub --port 8099 --latency-ms 300 --rate-429 0.05
+    OPENROUTER_BASE_URL=http://127.0.0.1:8099/api/v1 streamlit run streamlit_app.py
+"""
+
+import re
+import sys
+import json
+import math
+import time
+import random
+import hashlib
+import logging
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE: Dict = {
+    'latency': {'dist': 'fixed', 'ms': 0},
+    'rate_429': 0.0,
+    'rate_5xx': 0.0,
+    'rate_malformed': 0.0,
+    'ratelimit_limit': 1000,
+    'ratelimit_remaining': 1000,
+    'retry_after_s': 1,
+    'seed': 0,
+    'responses': [],
+}
+
+_FALLBACK_WORDS = ['cat', 'lamp', 'river', 'garden', 'harmony', 'mountain', 'adventure', 'friendship']
+
+_HINT_SENTENCES = [
+    "Often comes up when people talk about {subject}.",
+    "Many people meet it in everyday {subject} conversations.",
+    "It appears in plenty of stories about {subject}.",
+    "Teachers bring it up in {subject} lessons.",
+    "You could read about it in a {subject} magazine.",
+    "Experts in {subject} know it well.",
+    "It has a familiar place in the world of {subject}.",
+    "Children learn about it early when studying {subject}.",
+    "It is easy to picture once you think of {subject}.",
+    "Museums and books on {subject} often feature it.",
+]
+
+
+def _merge_profile(profile: Optional[Dict]) -> Dict:
+    merged = json.loads(json.dumps(DEFAULT_PROFILE))
+    for key, value in (profile or {}).items():
+        if key == 'latency' and isinstance(value, dict):
+            merged['latency'] = dict(value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _stable_rng(*parts) -> random.Random:
+    digest = hashlib.sha256('\x1f'.join(str(p) for p in parts).encode('utf-8')).hexdigest()
+    return random.Random(int(digest[:16], 16))
+
+
+def _int_after(pattern: str, text: str, default: int) -> int:
+    match = re.search(pattern, text, re.IGNORECASE)
+    try:
+        return int(match.group(1)) if match else default
+    except Exception:
+        return default
+
+
+def _hint_sentences(subject: str, n: int) -> List[str]:
+    out = []
+    for i in range(max(0, n)):
+        base = _HINT_SENTENCES[i % len(_HINT_SENTENCES)].format(subject=subject or 'everyday life')
+        out.append(base if i < len(_HINT_SENTENCES) else f"{base[:-1]}, in yet another way number {i + 1}.")
+    return out
+
+
+def _text_terms(text: str, limit: int) -> List[str]:
+    """Distinct alphabetic terms (3-13 letters) from a document, longest first."""
+    seen: Dict[str, None] = {}
+    for token in re.findall(r'[A-Za-z]{3,13}', text or ''):
+        seen.setdefault(token.lower(), None)
+    return sorted(seen, key=lambda t: (-len(t), t))[:max(0, limit)]
+
+
+class _Responder:
+    """Builds the assistant message content for a request."""
+
+    def __init__(self, profile: Dict):
+        self.canned = [r for r in profile.get('responses') or [] if isinstance(r, dict)]
+        self.seed = profile.get('seed', 0)
+        self._words_by_length: Optional[Dict[int, List[str]]] = None
+
+    def _words(self, length: int) -> List[str]:
+        if self._words_by_length is None:
+            buckets: Dict[int, List[str]] = {}
+            try:
+                from .hint_corpus import get_hint_index
+                index = get_hint_index()
+                for category in index.categories():
+                    for w in index.words(category):
+                        if w.isalpha():
+                            buckets.setdefault(len(w), []).append(w.lower())
+            except Exception:
+                pass
+            for w in _FALLBACK_WORDS:
+                buckets.setdefault(len(w), []).append(w)
+            self._words_by_length = buckets
+        return self._words_by_length.get(length) or _FALLBACK_WORDS
+
+    def content(self, body: Dict) -> str:
+        messages = body.get('messages') or []
+        system = ' '.join(str(m.get('content', '')) for m in messages if m.get('role') == 'system')
+        last = str(messages[-1].get('content', '')) if messages else ''
+        everything = f"{system}\n{last}"
+        rng = _stable_rng(self.seed, json.dumps(messages, sort_keys=True))
+        for canned in self.canned:
+            if str(canned.get('match', '')) in last:
+                return str(canned.get('content', ''))
+
+        if 'selected_word' in system:
+            length = _int_after(r'(\d+)-letter', last, 5)
+            return json.dumps({'selected_word': rng.choice(self._words(length))})
+        if "Player's question" in last:
+            return rng.choice(["Yes, that is correct.", "No, that is not right."])
+        if 'personal word pool' in last:
+            n = _int_after(r'array of (\d+) items', last, 10)
+            words = self._words(rng.choice([4, 5, 6, 7]))
+            picked = rng.sample(words, min(n, len(words)))
+            return json.dumps([{'word': w, 'hint': _hint_sentences('your profile', 1)[0]} for w in picked])
+        if '"items"' in system:
+            n = _int_after(r'Limit to (\d+)', system, 10)
+            return json.dumps({'items': [{'word': t, 'pos': 'noun', 'hints': _hint_sentences('this text', 3)}
+                                         for t in _text_terms(last, n)]})
+        if 'Select exactly' in last:
+            n = _int_after(r'Select exactly (\d+)', last, 10)
+            per = _int_after(r'EXACTLY (\d+) short hints', last, 3)
+            doc = last.split('---', 2)[1] if last.count('---') >= 2 else last
+            return json.dumps({t: _hint_sentences('this document', per) for t in _text_terms(doc, n)})
+        if re.search(r'exactly \d+ .*hints', everything, re.IGNORECASE | re.DOTALL):
+            n = _int_after(r'exactly (\d+)', everything, 10)
+            subject = re.search(r"category '([^']+)'|Category: (\S+)", everything)
+            name = (subject.group(1) or subject.group(2)) if subject else 'everyday life'
+            return json.dumps(_hint_sentences(name, n))
+        return 'OK'
+
+
+class OpenRouterStub:
+    """ThreadingHTTPServer running on a daemon thread; use as a context manager or start()/stop()."""
+
+    def __init__(self, profile: Optional[Dict] = None, host: str = '127.0.0.1', port: int = 0):
+        self.profile = _merge_profile(profile)
+        self.responder = _Responder(self.profile)
+        self._lock = threading.Lock()
+        self._counter = 0
+        self._remaining = int(self.profile.get('ratelimit_remaining', 1000))
+        self.stats: Dict[str, int] = {'requests': 0, 'ok': 0, '429': 0, '5xx': 0, 'malformed': 0}
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                stub._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api/v1"
+
+    def start(self) -> 'OpenRouterStub':
+        self._thread = threading.Thread(target=self.server.serve_forever, name='openrouter-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> 'OpenRouterStub':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _latency_s(self, rng: random.Random) -> float:
+        spec = self.profile.get('latency') or {}
+        dist = spec.get('dist', 'fixed')
+        if dist == 'uniform':
+            ms = rng.uniform(float(spec.get('min_ms', 0)), float(spec.get('max_ms', 0)))
+        elif dist == 'lognormal':
+            ms = float(spec.get('median_ms', 100)) * math.exp(rng.gauss(0.0, float(spec.get('sigma', 0.5))))
+        else:
+            ms = float(spec.get('ms', 0))
+        return max(0.0, ms) / 1000.0
+
+    def _outcome(self):
+        """(outcome, latency_s, remaining) for the next request, deterministic in request order."""
+        with self._lock:
+            self._counter += 1
+            rng = _stable_rng(self.profile.get('seed', 0), self._counter)
+            self._remaining = max(0, self._remaining - 1)
+            remaining = self._remaining
+            self.stats['requests'] += 1
+        roll = rng.random()
+        outcome = 'ok'
+        for name, key in (('429', 'rate_429'), ('5xx', 'rate_5xx'), ('malformed', 'rate_malformed')):
+            rate = float(self.profile.get(key, 0.0) or 0.0)
+            if roll < rate:
+                outcome = name
+                break
+            roll -= rate
+        with self._lock:
+            self.stats[outcome] += 1
+        return outcome, self._latency_s(rng), remaining
+
+    def _send(self, handler: BaseHTTPRequestHandler, status: int, body: bytes, headers: Dict[str, str]) -> None:
+        handler.send_response(status)
+        for k, v in headers.items():
+            handler.send_header(k, v)
+        handler.send_header('Content-Length', str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        length = int(handler.headers.get('Content-Length') or 0)
+        raw = handler.rfile.read(length) if length else b''
+        if handler.path.rstrip('/') not in ('/api/v1/chat/completions', '/chat/completions'):
+            self._send(handler, 404, b'{"error": {"message": "not found"}}', {'Content-Type': 'application/json'})
+            return
+        outcome, latency, remaining = self._outcome()
+        if latency:
+            time.sleep(latency)
+        headers = {
+            'Content-Type': 'application/json',
+            'x-ratelimit-limit': str(self.profile.get('ratelimit_limit', 1000)),
+            'x-ratelimit-remaining': str(0 if outcome == '429' else remaining),
+            'x-ratelimit-reset': str(int(time.time()) + 60),
+        }
+        if outcome == '429':
+            headers['Retry-After'] = str(self.profile.get('retry_after_s', 1))
+            self._send(handler, 429, b'{"error": {"code": 429, "message": "Rate limit exceeded"}}', headers)
+            return
+        if outcome == '5xx':
+            self._send(handler, 502, b'{"error": {"code": 502, "message": "Upstream error"}}', headers)
+            return
+        if outcome == 'malformed':
+            self._send(handler, 200, b'{"choices": [{"message": {"content": ', headers)
+            return
+        try:
+            body = json.loads(raw or b'{}')
+        except Exception:
+            self._send(handler, 400, b'{"error": {"message": "invalid JSON body"}}', headers)
+            return
+        content = self.responder.content(body)
+        payload = {
+            'id': f"stub-{self._counter}",
+            'object': 'chat.completion',
+            'model': body.get('model', 'stub'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': len(raw) // 4, 'completion_tokens': len(content) // 4},
+        }
+        self._send(handler, 200, json.dumps(payload).encode('utf-8'), headers)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Local OpenRouter stand-in server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--profile', help='JSON profile file (see module docstring)')
+    parser.add_argument('--latency-ms', type=float, help='fixed latency (overrides the profile)')
+    parser.add_argument('--rate-429', type=float)
+    parser.add_argument('--rate-5xx', type=float)
+    parser.add_argument('--rate-malformed', type=float)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    profile: Dict = {}
+    if args.profile:
+        with open(args.profile, 'r', encoding='utf-8') as f:
+            profile = json.load(f)
+    if args.latency_ms is not None:
+        profile['latency'] = {'dist': 'fixed', 'ms': args.latency_ms}
+    for key in ('rate_429', 'rate_5xx', 'rate_malformed', 'seed'):
+        if getattr(args, key) is not None:
+            profile[key] = getattr(args, key)
+    stub = OpenRouterStub(profile, host=args.host, port=args.port)
+    print(f"OpenRouter stand-in on {stub.base_url} (set OPENROUTER_BASE_URL to this)")
+    try:
+        stub.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stub.server.server_close()
+        print(json.dumps(stub.stats))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
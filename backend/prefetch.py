@@ -0,0 +1,164 @@
+"""
+Beat-mode next-word prefetch.
+
+While the player works on the current word, a background thread prepares the
+next few (word, hints) bundles for the same user, category and hints language,
+so that the "Correct!" -> next word transition is a queue pop instead of a
+select_word + hint round-trip on the critical path.
+
+Bundles are built with GameLogic itself (lazy init disabled, username passed
+explicitly) so word selection, hint lookup and masking stay identical to the
+synchronous path. GameLogic(prefetched=bundle) consumes a bundle. Each
+prefetcher builds with its own WordSelector, so the background thread never
+touches the mutable state (recent words, fallback flags, hint caches) of the
+selector the foreground game is using. Recent words still reach the shared
+recents store.
+
+Env:
+    BEAT_PREFETCH_ENABLED=true
+    BEAT_PREFETCH_DEPTH=2        bundles kept ready per session
+    BEAT_PREFETCH_IDLE_SECS=900  worker exits after this long without a pop (abandoned sessions)
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def prefetch_enabled() -> bool:
+    return os.getenv('BEAT_PREFETCH_ENABLED', 'true').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _idle_secs() -> float:
+    try:
+        return float(os.getenv('BEAT_PREFETCH_IDLE_SECS', '900'))
+    except Exception:
+        return 900.0
+
+
+def _prefetch_depth() -> int:
+    try:
+        return max(1, int(os.getenv('BEAT_PREFETCH_DEPTH', '2')))
+    except Exception:
+        return 2
+
+
+class BeatPrefetcher:
+    """Keeps up to `depth` ready bundles for one (username, subject, hints_language)."""
+
+    def __init__(self, username: str, subject: str, hints_language: str = 'english',
+                 difficulty: str = 'Medium', depth: Optional[int] = None):
+        self.username = str(username or 'global')
+        self.subject = str(subject or 'general')
+        self.hints_language = str(hints_language or 'english').strip().lower()
+        self.difficulty = difficulty
+        self.depth = depth or _prefetch_depth()
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=self.depth)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        # Words that are queued or currently on screen; never prefetch them again
+        self._reserved: List[str] = []
+        self._reserved_lock = threading.Lock()
+        self._last_used = time.time()
+        self._idle_secs = _idle_secs()
+        self._selector = None  # created on the worker thread, used only there
+        self._thread = threading.Thread(target=self._run, name=f"beat-prefetch-{self.username}", daemon=True)
+        self._thread.start()
+        self._wake.set()
+
+    def key(self) -> tuple:
+        return (self.username.lower(), self.subject.lower(), self.hints_language)
+
+    def matches(self, username: str, subject: str, hints_language: str) -> bool:
+        return self.key() == (str(username or 'global').lower(), str(subject or 'general').lower(),
+                              str(hints_language or 'english').strip().lower())
+
+    def set_current_word(self, word: Optional[str]) -> None:
+        """Reserve the word now on screen so it is not prefetched as the next one."""
+        if not word:
+            return
+        with self._reserved_lock:
+            wl = str(word).lower()
+            if wl not in self._reserved:
+                self._reserved.append(wl)
+            del self._reserved[:-(self.depth + 2)]
+
+    def pop(self) -> Optional[Dict]:
+        """Next ready bundle, or None when nothing is ready yet (caller builds synchronously)."""
+        self._last_used = time.time()
+        try:
+            bundle = self._queue.get_nowait()
+        except queue.Empty:
+            bundle = None
+        self._wake.set()
+        if bundle is not None:
+            logger.info(f"[PREFETCH] hit user='{self.username}' subject='{self.subject}' "
+                        f"age_ms={int((time.time() - bundle.get('created_at', time.time())) * 1000)}")
+        else:
+            logger.info(f"[PREFETCH] miss user='{self.username}' subject='{self.subject}'")
+        return bundle
+
+    def ready(self) -> int:
+        return self._queue.qsize()
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive() and not self._stop.is_set()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def _build_bundle(self) -> Optional[Dict]:
+        from .game_logic import GameLogic
+        from .word_selector import WordSelector, use_hints_language
+        if self._selector is None:
+            self._selector = WordSelector()
+        with use_hints_language(self.hints_language):
+            game = GameLogic(word_length=5, subject=self.subject, mode='Beat', nickname=self.username,
+                             difficulty=self.difficulty, username=self.username, lazy_init=False,
+                             word_selector=self._selector)
+        word = getattr(game, 'selected_word', None)
+        if not word:
+            return None
+        return {
+            'word': word,
+            'hints': list(getattr(game, 'available_hints', []) or []),
+            'subject': self.subject,
+            'hints_language': self.hints_language,
+            'created_at': time.time(),
+        }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(timeout=30.0)
+            self._wake.clear()
+            if time.time() - self._last_used > self._idle_secs:
+                logger.info(f"[PREFETCH] idle, stopping user='{self.username}' subject='{self.subject}'")
+                self._stop.set()
+                break
+            duplicates = 0
+            while not self._stop.is_set() and not self._queue.full() and duplicates <= self.depth:
+                try:
+                    bundle = self._build_bundle()
+                except Exception as e:
+                    logger.warning(f"[PREFETCH] build failed user='{self.username}' subject='{self.subject}': {e}")
+                    bundle = None
+                if bundle is None:
+                    break
+                with self._reserved_lock:
+                    duplicate = bundle['word'].lower() in self._reserved
+                    if not duplicate:
+                        self._reserved.append(bundle['word'].lower())
+                        del self._reserved[:-(self.depth + 2)]
+                if duplicate:
+                    duplicates += 1
+                    continue
+                try:
+                    self._queue.put_nowait(bundle)
+                except queue.Full:
+                    break
@@ -0,0 +1,383 @@
+"""
+Local question-intent classifier that routes questions before the LLM.
+
+The rule matchers (backend/word_features.py, backend/attribute_table.py)
+only catch the phrasings they were written for; everything else went to the
+network. This module adds a small linear model over hashed features:
+    - word unigrams, bigrams and a few shape markers
+    - crc32 into 2**12 buckets
+    - softmax over INTENTS, trained with SGD in NumPy
+It predicts one of letter / length / category / attribute / open with a
+confidence in a few microseconds. answer_question answers letter, length and
+category predictions locally when the confidence is at least
+QUESTION_CLASSIFIER_MIN_CONFIDENCE. Everything else still goes to the API.
+
+Training data comes from the question log. answer_question appends each
+question and the route that answered it to QUESTION_LOG_PATH. Labels come
+from the rule matchers (weak supervision), plus SEED_QUESTIONS so a fresh
+install can train:
+    python -m backend.question_classifier train [--log game_data/question_log.jsonl]
+    python -m backend.question_classifier predict "does the word have a z somewhere"
+    python -m backend.question_classifier stats
+
+routing_stats counts the route taken for every question. Its hit_rate is the
+share answered locally without the API.
+
+NumPy is imported lazily. Without it, or without a trained model file, the
+classifier is simply off.
+
+Env:
+    QUESTION_CLASSIFIER_ENABLED=true
+    QUESTION_CLASSIFIER_PATH=game_data/question_classifier.npz
+    QUESTION_CLASSIFIER_MIN_CONFIDENCE=0.85
+    QUESTION_LOG_ENABLED=true
+    QUESTION_LOG_PATH=game_data/question_log.jsonl
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import zlib
+import random
+import logging
+import argparse
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .word_features import normalize_question, parse_question
+from .attribute_table import match_attribute
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = os.path.join('game_data', 'question_classifier.npz')
+DEFAULT_LOG_PATH = os.path.join('game_data', 'question_log.jsonl')
+
+INTENTS = ('letter', 'length', 'category', 'attribute', 'open')
+LOCAL_INTENTS = frozenset(('letter', 'length', 'category'))
+FEATURE_BITS = 12
+DIM = 1 << FEATURE_BITS
+
+# word_features intent -> classifier intent
+_RULE_INTENTS = {
+    'category': 'category', 'length': 'length', 'length_is': 'length',
+    'vowels': 'letter', 'letter_count': 'letter', 'double_letter': 'letter', 'repeated_letter': 'letter',
+    'position_is': 'letter', 'position_kind': 'letter', 'position': 'letter', 'letter': 'letter',
+}
+
+SEED_QUESTIONS = [
+    ("Does it contain the letter e?", 'letter'), ("Is there a z anywhere in the word?", 'letter'),
+    ("Does the word use the letter q at all?", 'letter'), ("Is r one of the letters?", 'letter'),
+    ("Does it start with b?", 'letter'), ("Is the last letter a t?", 'letter'),
+    ("Does the word have two o's?", 'letter'), ("Is x somewhere in the spelling?", 'letter'),
+    ("How many letters does it have?", 'length'), ("Is the word long?", 'length'),
+    ("Is it a short word?", 'length'), ("Does it have more than six letters?", 'length'),
+    ("Is the word longer than five letters?", 'length'), ("How long is the word?", 'length'),
+    ("What category is it?", 'category'), ("Which topic does it belong to?", 'category'),
+    ("What subject is this word from?", 'category'), ("Which group is the word in?", 'category'),
+    ("Is it alive?", 'attribute'), ("Can you eat it?", 'attribute'), ("Is it bigger than a car?", 'attribute'),
+    ("Is it man made?", 'attribute'), ("Can it fly?", 'attribute'), ("Is it an animal?", 'attribute'),
+    ("Would I find it in a kitchen?", 'attribute'), ("Is it heavy?", 'attribute'),
+    ("Is it related to science?", 'open'), ("Was it invented before 1900?", 'open'),
+    ("Is it famous?", 'open'), ("Is it used in sports?", 'open'), ("Is it a mammal?", 'open'),
+    ("Does it have fur?", 'open'), ("Is it associated with Christmas?", 'open'),
+    ("Is it something you wear?", 'open'), ("Would a child know this?", 'open'),
+    ("Is it found in Africa?", 'open'), ("Is it a verb?", 'open'), ("Is it expensive?", 'open'),
+    ("How long does it live?", 'open'), ("How long does it last?", 'open'),
+]
+
+_QUOTED_LETTER = re.compile(r"""['"‘“]([a-zA-Z])['"’”]""")
+
+
+def _np():
+    import numpy as np  # optional dependency, only needed when the classifier is on
+    return np
+
+
+def feature_names(question: str) -> List[str]:
+    words = normalize_question(question).split()
+    out = [f"w:{w}" for w in words]
+    out += [f"b:{a}_{b}" for a, b in zip(words, words[1:])]
+    if words:
+        out.append(f"first:{words[0]}")
+    for w in words:
+        if len(w) == 1:
+            out.append('shape:single_char')
+        elif w.isdigit():
+            out.append('shape:number')
+    return out
+
+
+def hash_features(question: str) -> List[int]:
+    """Sorted distinct bucket ids; crc32 keeps them stable across processes (unlike hash())."""
+    return sorted({zlib.crc32(name.encode('utf-8')) & (DIM - 1) for name in feature_names(question)})
+
+
+def weak_label(question: str) -> str:
+    """Label a question with the rule matchers; unmatched questions are 'open'."""
+    parsed = parse_question(question)
+    if parsed is not None:
+        return _RULE_INTENTS.get(parsed[0], 'letter')
+    if match_attribute(question) is not None:
+        return 'attribute'
+    return 'open'
+
+
+def extract_letter(question: str) -> Optional[str]:
+    """The letter a loosely phrased letter question asks about, if it is unambiguous."""
+    m = _QUOTED_LETTER.search(question or '')
+    if m:
+        return m.group(1).lower()
+    singles = [w for w in normalize_question(question).split() if len(w) == 1 and w.isalpha()]
+    candidates = [w for w in singles if w not in ('a', 'i')] or singles
+    return candidates[0] if len(set(candidates)) == 1 else None
+
+
+_PRESENCE = re.compile(r'\b(?:contain|contains|have|has|include|includes|use|uses|got|is there|are there|any|'
+                       r'anywhere|somewhere|one of the letters|in it|in the word|in the spelling)\b')
+# Position, order and count words: has(letter) alone would answer these wrongly
+_NOT_PRESENCE = re.compile(
+    r'\b(?:first|second|third|fourth|fifth|sixth|seventh|eighth|ninth|tenth|eleventh|twelfth|last|final|'
+    r'penultimate|middle|\d+(?:st|nd|rd|th)|start|starts|begin|begins|beginning|end|ends|ending|finish|finishes|'
+    r'before|after|next|follow|follows|followed|position|place|times|twice|once|two|three|four|how many|'
+    r'double|doubled|repeated|only|more|less|than|vowel|vowels|consonant|consonants|capital|silent)\b')
+
+
+def is_presence_question(question: str) -> bool:
+    """True for a plain "is this letter in the word" question, with no position, order or count."""
+    text = normalize_question(question)
+    return bool(_PRESENCE.search(text)) and not _NOT_PRESENCE.search(text)
+
+
+# Explicit letter-count phrasing; "longer than the word elephant" or syllable counts are not
+_LENGTH = re.compile(r'\b(?:how many (?:letters|characters)|how long is (?:the word|this word|the answer|it)|'
+                     r'number of (?:letters|characters)|word length|length of the word|'
+                     r'\d+ (?:letters|characters)|(?:letters|characters) long)\b')
+# "What category is it", not "is it in the fruit category"
+_CATEGORY = re.compile(r'\b(?:what|which) (?:is the |s the )?category\b')
+
+
+def is_length_question(question: str) -> bool:
+    """True for a question that asks for the word's letter count."""
+    text = normalize_question(question)
+    return bool(_LENGTH.search(text)) and 'syllable' not in text
+
+
+def is_category_question(question: str) -> bool:
+    """True for a question that asks which category the word is in."""
+    return bool(_CATEGORY.search(normalize_question(question)))
+
+
+class QuestionClassifier:
+    """Softmax regression over hashed features; weights (DIM, len(intents)) and bias (len(intents),)."""
+
+    def __init__(self, weights, bias, intents: Tuple[str, ...] = INTENTS):
+        self.weights = weights
+        self.bias = bias
+        self.intents = tuple(intents)
+
+    @classmethod
+    def train(cls, questions: List[str], labels: List[str], epochs: int = 15, lr: float = 0.3,
+              seed: int = 0) -> 'QuestionClassifier':
+        np = _np()
+        k = len(INTENTS)
+        rows = [np.asarray(hash_features(q), dtype=np.int64) for q in questions]
+        targets = [INTENTS.index(label) for label in labels]
+        weights = np.zeros((DIM, k), dtype=np.float32)
+        bias = np.zeros(k, dtype=np.float32)
+        order = list(range(len(rows)))
+        rng = random.Random(seed)
+        for _ in range(epochs):
+            rng.shuffle(order)
+            for i in order:
+                idx = rows[i]
+                z = weights[idx].sum(axis=0) + bias
+                p = np.exp(z - z.max())
+                p /= p.sum()
+                p[targets[i]] -= 1.0
+                weights[idx] -= lr * p
+                bias -= lr * p
+        return cls(weights, bias)
+
+    @classmethod
+    def load(cls, path: str) -> 'QuestionClassifier':
+        np = _np()
+        with np.load(path) as data:
+            return cls(data['weights'], data['bias'], tuple(str(i) for i in data['intents']))
+
+    def save(self, path: str) -> None:
+        np = _np()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.tmp.npz"
+        np.savez_compressed(tmp, weights=self.weights, bias=self.bias, intents=np.array(self.intents))
+        os.replace(tmp, path)
+
+    def predict(self, question: str) -> Tuple[str, float]:
+        """(intent, confidence) for one question."""
+        np = _np()
+        idx = hash_features(question)
+        z = self.weights[idx].sum(axis=0) + self.bias if idx else self.bias
+        p = np.exp(z - z.max())
+        p /= p.sum()
+        k = int(p.argmax())
+        return self.intents[k], float(p[k])
+
+    def accuracy(self, questions: List[str], labels: List[str]) -> float:
+        if not questions:
+            return 0.0
+        hits = sum(1 for q, label in zip(questions, labels) if self.predict(q)[0] == label)
+        return hits / len(questions)
+
+
+class RoutingStats:
+    """Counts of how each question was answered; hit_rate is the share answered without the API."""
+
+    LOCAL_ROUTES = frozenset(('features', 'attribute_table', 'attribute_default', 'classifier', 'answer_cache'))
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.routes: Dict[str, int] = {}
+        self.intents: Dict[str, int] = {}
+
+    def record(self, route: str, intent: Optional[str] = None) -> None:
+        with self._lock:
+            self.routes[route] = self.routes.get(route, 0) + 1
+            if intent:
+                self.intents[intent] = self.intents.get(intent, 0) + 1
+
+    def hit_rate(self) -> float:
+        with self._lock:
+            total = sum(self.routes.values())
+            local = sum(n for route, n in self.routes.items() if route in self.LOCAL_ROUTES)
+        return local / total if total else 0.0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            out = {'total': sum(self.routes.values()), 'routes': dict(self.routes), 'intents': dict(self.intents)}
+        out['hit_rate'] = round(self.hit_rate(), 4)
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self.routes.clear()
+            self.intents.clear()
+
+
+routing_stats = RoutingStats()
+
+_log_lock = threading.Lock()
+
+
+def _enabled(name: str) -> bool:
+    return os.getenv(name, 'true').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def log_question(question: str, route: str, intent: Optional[str] = None) -> None:
+    """Record the question and how it was answered (training data for the classifier)."""
+    routing_stats.record(route, intent)
+    if not _enabled('QUESTION_LOG_ENABLED'):
+        return
+    path = os.getenv('QUESTION_LOG_PATH', DEFAULT_LOG_PATH)
+    line = json.dumps({'ts': round(time.time(), 3), 'question': question, 'route': route, 'intent': intent},
+                      ensure_ascii=False)
+    try:
+        with _log_lock:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+    except Exception as e:
+        logger.warning(f"[QUESTION_LOG] write failed: {e}")
+
+
+def read_question_log(path: str) -> Iterable[str]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    question = json.loads(line).get('question')
+                except ValueError:
+                    continue
+                if question:
+                    yield question
+    except FileNotFoundError:
+        return
+
+
+_classifier: Optional[QuestionClassifier] = None
+_classifier_lock = threading.Lock()
+_classifier_failed = False
+
+
+def get_question_classifier() -> Optional[QuestionClassifier]:
+    """Process-wide classifier from QUESTION_CLASSIFIER_PATH, or None when disabled, untrained or NumPy is missing."""
+    global _classifier, _classifier_failed
+    if not _enabled('QUESTION_CLASSIFIER_ENABLED'):
+        return None
+    if _classifier is None and not _classifier_failed:
+        with _classifier_lock:
+            if _classifier is None and not _classifier_failed:
+                path = os.getenv('QUESTION_CLASSIFIER_PATH', DEFAULT_MODEL_PATH)
+                try:
+                    _classifier = QuestionClassifier.load(path)
+                except Exception as e:
+                    _classifier_failed = True
+                    logger.info(f"[QCLASS] classifier off ({path}): {e}")
+    return _classifier
+
+
+def min_confidence() -> float:
+    try:
+        return float(os.getenv('QUESTION_CLASSIFIER_MIN_CONFIDENCE', '0.85'))
+    except (TypeError, ValueError):
+        return 0.85
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Train and inspect the question-intent classifier")
+    parser.add_argument('--model', default=os.getenv('QUESTION_CLASSIFIER_PATH', DEFAULT_MODEL_PATH))
+    sub = parser.add_subparsers(dest='command', required=True)
+    p_train = sub.add_parser('train', help='train from the question log (weak labels) plus seed questions')
+    p_train.add_argument('--log', default=os.getenv('QUESTION_LOG_PATH', DEFAULT_LOG_PATH))
+    p_train.add_argument('--epochs', type=int, default=15)
+    p_train.add_argument('--holdout', type=float, default=0.2, help='share of logged questions held out for accuracy')
+    p_predict = sub.add_parser('predict', help='classify questions')
+    p_predict.add_argument('questions', nargs='+')
+    p_stats = sub.add_parser('stats', help='label distribution of the question log')
+    p_stats.add_argument('--log', default=os.getenv('QUESTION_LOG_PATH', DEFAULT_LOG_PATH))
+    args = parser.parse_args()
+
+    if args.command == 'stats':
+        counts: Dict[str, int] = {}
+        for question in read_question_log(args.log):
+            label = weak_label(question)
+            counts[label] = counts.get(label, 0) + 1
+        print(json.dumps({'questions': sum(counts.values()), 'labels': counts}, indent=2))
+        return 0
+    if args.command == 'predict':
+        model = QuestionClassifier.load(args.model)
+        for question in args.questions:
+            start = time.perf_counter()
+            intent, confidence = model.predict(question)
+            print(f"{intent:9s} {confidence:.3f}  {(time.perf_counter() - start) * 1e6:.0f}us  {question}")
+        return 0
+
+    logged = list(dict.fromkeys(read_question_log(args.log)))
+    random.Random(0).shuffle(logged)
+    cut = int(len(logged) * (1 - args.holdout))
+    train_q = [q for q, _ in SEED_QUESTIONS] + logged[:cut]
+    train_y = [label for _, label in SEED_QUESTIONS] + [weak_label(q) for q in logged[:cut]]
+    test_q = logged[cut:]
+    model = QuestionClassifier.train(train_q, train_y, epochs=args.epochs)
+    model.save(args.model)
+    report = {'trained_on': len(train_q), 'train_accuracy': round(model.accuracy(train_q, train_y), 4)}
+    if test_q:
+        report['holdout'] = len(test_q)
+        report['holdout_accuracy'] = round(model.accuracy(test_q, [weak_label(q) for q in test_q]), 4)
+    print(json.dumps(report, indent=2))
+    print(f"Saved model to {args.model}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,241 @@
+"""
+Recent-word state shared by every WordSelector in every process.
+
+WordSelector keeps, per "user:category" key, a short list of recently played
+words, the last word played, and the shuffled deck state (see word_deck.py).
+This module persists that state behind a bounded in-memory LRU:
+
+- memory back end: the LRU only (state is lost on restart)
+- sqlite back end (default): write-through to a WAL-mode SQLite file shared by
+  all processes/replicas on the host (or a mounted volume)
+
+Cached entries are re-read from the back end after RECENTS_CACHE_FRESH_SECS so
+other processes' writes become visible, and keys idle for longer than
+RECENTS_IDLE_TTL_SECS are evicted from both the LRU and the database.
+
+Env:
+    RECENTS_STORE=sqlite|memory
+    RECENTS_DB_PATH=game_data/recents.sqlite3
+    RECENTS_CACHE_SIZE=2000
+    RECENTS_CACHE_FRESH_SECS=2
+    RECENTS_IDLE_TTL_SECS=2592000   (30 days)
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+from .env_utils import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+# Sweep idle keys at most this often (seconds)
+_SWEEP_INTERVAL_S = 300.0
+
+# Entry field -> sqlite column
+_COLUMNS = {'recent': 'recent', 'last': 'last_word', 'deck': 'deck'}
+
+
+class _SqliteBackend:
+    """One row per key; a connection per thread (sqlite3 objects are not thread-safe)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS recents ("
+            " key TEXT PRIMARY KEY, recent TEXT, last_word TEXT, deck TEXT, updated_at REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS recents_updated_at ON recents(updated_at)")
+        conn.commit()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def load(self, key: str) -> Optional[Dict]:
+        row = self._conn().execute("SELECT recent, last_word, deck FROM recents WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return {
+            'recent': json.loads(row[0]) if row[0] else [],
+            'last': row[1],
+            'deck': json.loads(row[2]) if row[2] else None,
+        }
+
+    def save(self, key: str, field: str, value) -> None:
+        """Upsert one field so concurrent writers of other fields are not overwritten."""
+        column = _COLUMNS[field]
+        encoded = value if field == 'last' else (json.dumps(value) if value is not None else None)
+        conn = self._conn()
+        conn.execute(
+            f"INSERT INTO recents (key, {column}, updated_at) VALUES (?, ?, ?)"
+            f" ON CONFLICT(key) DO UPDATE SET {column}=excluded.{column}, updated_at=excluded.updated_at",
+            (key, encoded, time.time()),
+        )
+        conn.commit()
+
+    def purge_idle(self, older_than: float) -> int:
+        conn = self._conn()
+        cur = conn.execute("DELETE FROM recents WHERE updated_at < ?", (older_than,))
+        conn.commit()
+        return cur.rowcount or 0
+
+
+class RecentsStore:
+    """Bounded LRU of per-key recent-word state over an optional durable back end."""
+
+    def __init__(self, backend: Optional[_SqliteBackend] = None, cache_size: int = 2000,
+                 fresh_secs: float = 2.0, idle_ttl_secs: float = 30 * 86400):
+        self._backend = backend
+        self._cache_size = max(1, int(cache_size))
+        self._fresh_secs = float(fresh_secs)
+        self._idle_ttl = float(idle_ttl_secs)
+        # key -> {'recent': [...], 'last': str|None, 'deck': dict|None, 'loaded': ts, 'touched': ts}
+        self._cache: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._last_sweep = time.time()
+        # Dict-like views used by WordSelector in place of its old in-memory dicts
+        self.recent_words = _FieldView(self, 'recent')
+        self.last_words = _FieldView(self, 'last')
+
+    @classmethod
+    def from_env(cls) -> 'RecentsStore':
+        kind = os.getenv('RECENTS_STORE', 'sqlite').strip().lower()
+        backend = None
+        if kind == 'sqlite':
+            path = os.getenv('RECENTS_DB_PATH', os.path.join('game_data', 'recents.sqlite3'))
+            try:
+                backend = _SqliteBackend(path)
+            except Exception as e:
+                logger.warning(f"[RECENTS] sqlite store unavailable at '{path}', using memory only: {e}")
+        return cls(
+            backend=backend,
+            cache_size=env_int('RECENTS_CACHE_SIZE', 2000),
+            fresh_secs=env_float('RECENTS_CACHE_FRESH_SECS', 2.0),
+            idle_ttl_secs=env_float('RECENTS_IDLE_TTL_SECS', 30 * 86400),
+        )
+
+    def _entry(self, key: str) -> Dict:
+        now = time.time()
+        self._maybe_sweep(now)
+        entry = self._cache.get(key)
+        if entry is None or (self._backend is not None and now - entry['loaded'] > self._fresh_secs):
+            stored = None
+            if self._backend is not None:
+                try:
+                    stored = self._backend.load(key)
+                except Exception as e:
+                    logger.warning(f"[RECENTS] load failed for '{key}': {e}")
+            if stored is not None or entry is None:
+                entry = dict(stored or {'recent': [], 'last': None, 'deck': None})
+            entry['loaded'] = now
+            self._cache[key] = entry
+        entry['touched'] = now
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return entry
+
+    def _store(self, key: str, field: str, value) -> None:
+        if self._backend is not None:
+            try:
+                self._backend.save(key, field, value)
+            except Exception as e:
+                logger.warning(f"[RECENTS] save failed for '{key}': {e}")
+
+    def _maybe_sweep(self, now: float) -> None:
+        if self._idle_ttl <= 0 or now - self._last_sweep < _SWEEP_INTERVAL_S:
+            return
+        self._last_sweep = now
+        cutoff = now - self._idle_ttl
+        for key in [k for k, e in self._cache.items() if e.get('touched', 0) < cutoff]:
+            self._cache.pop(key, None)
+        if self._backend is not None:
+            try:
+                purged = self._backend.purge_idle(cutoff)
+                if purged:
+                    logger.info(f"[RECENTS] purged {purged} idle keys")
+            except Exception as e:
+                logger.warning(f"[RECENTS] purge failed: {e}")
+
+    def get_field(self, key: str, field: str):
+        with self._lock:
+            value = self._entry(key).get(field)
+            return list(value) if isinstance(value, list) else value
+
+    def set_field(self, key: str, field: str, value) -> None:
+        with self._lock:
+            entry = self._entry(key)
+            entry[field] = list(value) if isinstance(value, list) else value
+            self._store(key, field, entry[field])
+
+    # Deck persistence hooks for WordDeckStore
+    def load_deck(self, key: str) -> Optional[Dict]:
+        return self.get_field(key, 'deck')
+
+    def save_deck(self, key: str, state: Dict) -> None:
+        self.set_field(key, 'deck', state)
+
+    def cached_keys(self) -> int:
+        with self._lock:
+            return len(self._cache)
+
+
+class _FieldView:
+    """Minimal dict-like view over one field of RecentsStore (get / [] / []= / in / setdefault)."""
+
+    def __init__(self, store: RecentsStore, field: str):
+        self._store = store
+        self._field = field
+
+    def get(self, key: str, default=None):
+        value = self._store.get_field(key, self._field)
+        # An empty recent list counts as missing, like a key absent from the old dicts
+        if value is None or value == []:
+            return default
+        return value
+
+    def __getitem__(self, key: str):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value) -> None:
+        self._store.set_field(key, self._field, value)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def setdefault(self, key: str, default=None):
+        value = self.get(key)
+        if value is None:
+            self[key] = default
+            return default
+        return value
+
+
+_store: Optional[RecentsStore] = None
+_store_lock = threading.Lock()
+
+
+def get_recents_store() -> RecentsStore:
+    """Process-wide RecentsStore configured from the environment (created on first use)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = RecentsStore.from_env()
+    return _store
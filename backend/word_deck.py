@@ -0,0 +1,156 @@
+"""
+Per-user shuffled word decks.
+
+A deck shuffles a category's word list once (seeded) and hands words out
+through a cursor, so every draw is O(1) and no word repeats until the whole
+category has been played. When the deck runs out it reshuffles into a new
+epoch whose first word is never the word that was just played.
+
+Deck state is five small ints/strings ({seed, cursor, epoch, last, size}); the
+permutation itself is recomputed from (seed, epoch) and never stored.
+"""
+
+import random
+import logging
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Reshuffle attempts when a new epoch would start with the previous word
+_MAX_RESHUFFLE_TRIES = 8
+
+DeckKey = Tuple[str, str, str, str]
+
+
+def deck_key(username: str, language: str, category: str, flash_token: str = '') -> DeckKey:
+    """(user, language, category, flash-set token), normalised to lower-case."""
+    return (
+        str(username or 'global').strip().lower(),
+        str(language or 'english').strip().lower(),
+        str(category or 'general').strip().lower(),
+        str(flash_token or ''),
+    )
+
+
+class WordDeck:
+    """Seeded shuffle of `size` words served through a cursor."""
+
+    def __init__(self, size: int, seed: Optional[int] = None, cursor: int = 0, epoch: int = 0, last: Optional[str] = None):
+        self.size = int(size)
+        self.seed = int(seed) if seed is not None else random.getrandbits(32)
+        self.cursor = int(cursor)
+        self.epoch = int(epoch)
+        self.last = last
+        self._order: Optional[List[int]] = None
+
+    def _permutation(self, epoch: int) -> List[int]:
+        order = list(range(self.size))
+        random.Random(f"{self.seed}:{epoch}").shuffle(order)
+        return order
+
+    def _ensure_order(self) -> List[int]:
+        if self._order is None:
+            self._order = self._permutation(self.epoch)
+        return self._order
+
+    def _reshuffle(self, words: Sequence[str]) -> None:
+        self.cursor = 0
+        for _ in range(_MAX_RESHUFFLE_TRIES):
+            self.epoch += 1
+            self._order = self._permutation(self.epoch)
+            if self.size < 2 or self.last is None or words[self._order[0]] != self.last:
+                return
+
+    def draw(self, words: Sequence[str]) -> Optional[str]:
+        """Next word from `words` (the same sequence the deck was built for)."""
+        if not words:
+            return None
+        if len(words) != self.size:
+            # Category changed underneath us: start a fresh deck for the new list
+            self.size = len(words)
+            self.seed = random.getrandbits(32)
+            self.cursor = 0
+            self.epoch = 0
+            self._order = None
+        if self.cursor >= self.size:
+            self._reshuffle(words)
+        word = words[self._ensure_order()[self.cursor]]
+        self.cursor += 1
+        self.last = word
+        return word
+
+    def remaining(self) -> int:
+        return max(0, self.size - self.cursor)
+
+    def to_state(self) -> Dict:
+        return {'seed': self.seed, 'cursor': self.cursor, 'epoch': self.epoch, 'last': self.last, 'size': self.size}
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'WordDeck':
+        return cls(int(state.get('size', 0)), seed=state.get('seed'), cursor=state.get('cursor', 0),
+                   epoch=state.get('epoch', 0), last=state.get('last'))
+
+
+class WordDeckStore:
+    """Thread-safe map of deck key -> WordDeck.
+
+    With `persistence` (an object with load_deck(key) / save_deck(key, state),
+    e.g. recents_store.RecentsStore) deck state is reloaded before and saved
+    after every draw, so decks survive restarts and are shared across processes.
+    """
+
+    def __init__(self, persistence=None):
+        self._decks: Dict[DeckKey, WordDeck] = {}
+        self._lock = threading.Lock()
+        self._persistence = persistence
+
+    def _load(self, key: DeckKey) -> Optional[WordDeck]:
+        deck = self._decks.get(key)
+        if self._persistence is None:
+            return deck
+        try:
+            state = self._persistence.load_deck('|'.join(key))
+        except Exception as e:
+            logger.warning(f"[WORD_DECK] load failed for {key}: {e}")
+            return deck
+        if state and (deck is None or deck.to_state() != state):
+            deck = WordDeck.from_state(state)
+            self._decks[key] = deck
+        return deck
+
+    def draw(self, key: DeckKey, words: Sequence[str], avoid: Optional[str] = None) -> Optional[str]:
+        """Draw the next word for `key`; skips one card if it equals `avoid` (e.g. the last played word)."""
+        if not words:
+            return None
+        with self._lock:
+            deck = self._load(key)
+            if deck is None:
+                deck = WordDeck(len(words))
+                self._decks[key] = deck
+            word = deck.draw(words)
+            if avoid is not None and len(words) > 1 and str(word).lower() == str(avoid).lower():
+                word = deck.draw(words)
+            if self._persistence is not None:
+                try:
+                    self._persistence.save_deck('|'.join(key), deck.to_state())
+                except Exception as e:
+                    logger.warning(f"[WORD_DECK] save failed for {key}: {e}")
+            logger.debug(f"[WORD_DECK] key={key} drew='{word}' remaining={deck.remaining()}")
+            return word
+
+    def get_state(self, key: DeckKey) -> Optional[Dict]:
+        with self._lock:
+            deck = self._decks.get(key)
+            return deck.to_state() if deck else None
+
+    def set_state(self, key: DeckKey, state: Dict) -> None:
+        with self._lock:
+            self._decks[key] = WordDeck.from_state(state)
+
+    def reset(self, key: Optional[DeckKey] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._decks.clear()
+            else:
+                self._decks.pop(key, None)
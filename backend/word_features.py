@@ -0,0 +1,223 @@
+"""
+Per-word letter features and a single compiled matcher for letter questions.
+
+answer_question used to try about 40 regexes against every question and then
+run most of them again in _answer_question_fallback. Questions are now parsed
+once by parse_question, which builds one anchored regex from RULES and returns
+an (intent, args) pair. The answer comes from a WordFeatures record, built once
+per word (features_for is memoised): letter bitmask, letter counts, positions,
+first and last letter, length, and vowel/consonant pattern.
+
+Covered shapes (case and punctuation are ignored):
+    category         "What category is it?"
+    length           "How many letters?" / "How long is the word?"
+    length_is        "Does it have 5 letters?" / "Is it five letters long?"
+    vowels           "How many vowels?" / "How many consonants?"
+    letter_count     "How many e's?" / "How many times does the letter e appear?"
+    double_letter    "Does it have double letters?"
+    repeated_letter  "Are any letters repeated?"
+    position_is      "Does it start with b?" / "Is the third letter r?" / "Does it end in e?"
+    position         "What is the first letter?" / "Tell me the 2nd letter"
+    letter           "Does it contain the letter e?" / "Is there an a in it?"
+
+Anything else returns None from parse_question and goes to the LLM.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+VOWELS = frozenset('aeiou')
+
+_ORDINALS = {
+    'first': 1, '1st': 1, 'second': 2, '2nd': 2, 'third': 3, '3rd': 3, 'fourth': 4, '4th': 4,
+    'fifth': 5, '5th': 5, 'sixth': 6, '6th': 6, 'seventh': 7, '7th': 7, 'eighth': 8, '8th': 8,
+    'ninth': 9, '9th': 9, 'tenth': 10, '10th': 10, 'eleventh': 11, '11th': 11, 'twelfth': 12, '12th': 12,
+    'last': -1, 'final': -1,
+}
+_ORDINAL_NAMES = {1: 'first', 2: 'second', 3: 'third', 4: 'fourth', 5: 'fifth', 6: 'sixth', 7: 'seventh',
+                  8: 'eighth', 9: 'ninth', 10: 'tenth', 11: 'eleventh', 12: 'twelfth', -1: 'last'}
+_NUMBERS = {'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7, 'eight': 8,
+            'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12}
+
+
+class WordFeatures:
+    """Letter features of one word, computed once."""
+
+    __slots__ = ('word', 'length', 'mask', 'counts', 'positions', 'first', 'last',
+                 'pattern', 'vowels', 'consonants', 'has_double', 'has_repeat')
+
+    def __init__(self, word: str):
+        word = (word or '').strip().lower()
+        self.word = word
+        self.length = len(word)
+        self.mask = 0
+        self.counts: Dict[str, int] = {}
+        self.positions: Dict[str, Tuple[int, ...]] = {}
+        for i, ch in enumerate(word):
+            if 'a' <= ch <= 'z':
+                self.mask |= 1 << (ord(ch) - 97)
+            self.counts[ch] = self.counts.get(ch, 0) + 1
+            self.positions[ch] = self.positions.get(ch, ()) + (i + 1,)
+        self.first = word[:1]
+        self.last = word[-1:]
+        letters = [ch for ch in word if ch.isalpha()]
+        self.pattern = ''.join('V' if ch in VOWELS else 'C' for ch in letters)
+        self.vowels = self.pattern.count('V')
+        self.consonants = self.pattern.count('C')
+        self.has_double = any(a == b for a, b in zip(word, word[1:]))
+        self.has_repeat = any(n > 1 for ch, n in self.counts.items() if ch.isalpha())
+
+    def has(self, letter: str) -> bool:
+        if len(letter) == 1 and 'a' <= letter <= 'z':
+            return bool(self.mask >> (ord(letter) - 97) & 1)
+        return letter in self.counts
+
+    def count(self, letter: str) -> int:
+        return self.counts.get(letter, 0)
+
+    def letter_at(self, position: int) -> str:
+        """1-based position; -1 is the last letter. Empty string when out of range."""
+        if position == -1:
+            return self.last
+        return self.word[position - 1] if 1 <= position <= self.length else ''
+
+
+@lru_cache(maxsize=2048)
+def features_for(word: str) -> WordFeatures:
+    return WordFeatures(word)
+
+
+_ORD = r'(?P<pos>' + '|'.join(sorted(_ORDINALS, key=len, reverse=True)) + r')'
+_NUM = r'(?P<n>\d+|' + '|'.join(_NUMBERS) + r')'
+_LET = r'(?:an? |the )?(?:letter )?(?P<letter>[a-z])'
+_IT = r'(?:it|the word|this word|this|your word)'
+_IN_IT = r'(?: (?:in|inside|within) ' + _IT + r')?'
+
+# (intent, pattern) in priority order; each pattern must match the whole normalised question.
+RULES = [
+    ('category', r'.*\b(?:category|categories)\b.*'),
+    ('category', r'(?:is|does) ' + _IT + r' (?:an? )?\w+ word'),
+    ('length', r'.*\bhow many (?:letters|characters)\b.*'),
+    ('length', r'.*\b(?:how long|what length|length of) (?:is )?(?:the word|this word|your word)\b.*'),
+    ('length', r'(?:what is |what s )?(?:the )?(?:word )?length(?: of (?:the word|this word|your word))?'),
+    ('length_is', r'(?:is|does|has) ' + _IT + r' (?:have |contain |got )?' + _NUM + r' (?:letters|characters)(?: long)?(?: in (?:it|total))?'),
+    ('vowels', r'.*\bhow many (?P<kind>vowels|consonants)\b.*'),
+    ('letter_count', r'.*\bhow many times (?:does|do|is|will) ' + _LET + r' (?:appear|occur|show up|come up|used).*'),
+    ('letter_count', r'.*\bhow many (?:letter )?(?P<letter>[a-z])s?(?: (?:are|does|do|in|letters).*)?'),
+    ('double_letter', r'.*\b(?:double|doubled) (?:letter|letters|consonant|consonants|vowel|vowels)\b.*'),
+    ('double_letter', r'.*\bsame letter twice in a row\b.*'),
+    ('repeated_letter', r'.*\b(?:repeated|repeating|repeat|duplicate|duplicated) letters?\b.*'),
+    ('repeated_letter', r'.*\bletters? (?:repeated|repeat|repeats|appear twice|used twice)\b.*'),
+    ('position_kind', r'(?:is|does) (?:the |its )?' + _ORD + r' (?:letter|character)(?: of ' + _IT + r'| in ' + _IT + r')? (?:an? )?(?P<kind>vowel|consonant)'),
+    ('position_kind', r'.*\b(?P<pos>start|starts|begin|begins|starting|beginning|end|ends|ending|finish|finishes) (?:with|in|on|using) (?:an? )?(?P<kind>vowel|consonant)'),
+    ('position_is', r'.*\b(?P<pos>start|starts|begin|begins|starting|beginning) (?:with|using) ' + _LET),
+    ('position_is', r'.*\b(?P<pos>end|ends|ending|finish|finishes) (?:with|in|on) ' + _LET),
+    ('position_is', r'(?:is|does) (?:the |its )?' + _ORD + r' (?:letter|character)(?: of ' + _IT + r'| in ' + _IT + r')?(?: an?| the letter| letter)? (?P<letter>[a-z])'),
+    ('position_is', r'(?:is|does) ' + _LET + r' (?:the |its )?' + _ORD + r'(?: letter| character)?'),
+    ('position_is', r'(?:the )?' + _ORD + r' (?:letter|character) (?:is )?(?P<letter>[a-z])'),
+    ('position', r'.*\b(?:what|which|tell me|give me|say)\b.*\b' + _ORD + r' (?:letter|character)\b.*'),
+    ('position', r'what (?:does|do) ' + _IT + r' (?P<pos>start|begin|end) with'),
+    ('position', r'(?:the )?' + _ORD + r' (?:letter|character)'),
+    ('letter', r'(?:does|do|is|has|can|will) (?:.* )?(?:contain|contains|have|has|include|includes|got|use|uses) ' + _LET + _IN_IT),
+    ('letter', r'.*\bis there ' + _LET + _IN_IT),
+    ('letter', r'.*\bany ' + _LET + r' in ' + _IT),
+    ('letter', r'(?:is )?' + _LET + r' (?:in|inside|within|present in) ' + _IT),
+    # Not the article in "letter a vowel" / "letter a consonant"
+    ('letter', r'.*\bletter (?!a [a-z])(?P<letter>[a-z])\b.*'),
+]
+
+
+def _compile_rules():
+    parts = []
+    for i, (_, pattern) in enumerate(RULES):
+        pattern = re.sub(r'\(\?P<(\w+)>', lambda m: f'(?P<{m.group(1)}_{i}>', pattern)
+        parts.append(f'(?P<r{i}>{pattern})')
+    return re.compile('^(?:' + '|'.join(parts) + ')$')
+
+
+_MATCHER = _compile_rules()
+_APOS_S = re.compile(r"\b([a-z])['’]s\b")
+_PUNCT = re.compile(r"[^\w\s]")
+
+
+def normalize_question(question: str) -> str:
+    """Lower-case, strip punctuation and quotes ("e's" -> "e"), collapse whitespace."""
+    text = _APOS_S.sub(r'\1', (question or '').lower())
+    return ' '.join(_PUNCT.sub(' ', text).split())
+
+
+def parse_question(question: str) -> Optional[Tuple[str, Dict[str, str]]]:
+    """Return (intent, args) for a letter/length/category question, or None."""
+    m = _MATCHER.match(normalize_question(question))
+    if m is None:
+        return None
+    for i, (intent, _) in enumerate(RULES):
+        if m.group(f'r{i}') is not None:
+            suffix = f'_{i}'
+            args = {k[:-len(suffix)]: v for k, v in m.groupdict().items()
+                    if k.endswith(suffix) and v is not None}
+            return intent, args
+    return None
+
+
+def _position(name: str) -> int:
+    if name.startswith(('start', 'begin')):
+        return 1
+    if name.startswith(('end', 'finish')):
+        return -1
+    return _ORDINALS[name]
+
+
+def answer_from_features(features: WordFeatures, intent: str, args: Dict[str, str], subject: str = 'general') -> str:
+    """Answer a parsed question from the word's features (same wording as the offline answers)."""
+    if intent == 'category':
+        return f"This word belongs to the {subject} category."
+    if intent == 'length':
+        return f"The word has {features.length} letters"
+    if intent == 'length_is':
+        n = args['n']
+        n = int(n) if n.isdigit() else _NUMBERS[n]
+        return "Yes" if features.length == n else f"No, it does not have {n} letters"
+    if intent == 'vowels':
+        kind = args['kind']
+        return f"The word has {features.vowels if kind == 'vowels' else features.consonants} {kind}"
+    if intent == 'letter_count':
+        letter = args['letter']
+        n = features.count(letter)
+        return f"The letter '{letter}' appears {n} time{'' if n == 1 else 's'}"
+    if intent == 'double_letter':
+        return "Yes" if features.has_double else "No"
+    if intent == 'repeated_letter':
+        return "Yes" if features.has_repeat else "No"
+    if intent in ('position_is', 'position'):
+        pos = _position(args['pos'])
+        name = _ORDINAL_NAMES.get(pos, f"#{pos}")
+        actual = features.letter_at(pos)
+        if not actual:
+            return f"The word only has {features.length} letters"
+        if intent == 'position':
+            return f"The {name} letter is '{actual}'"
+        letter = args['letter']
+        return f"Yes, the {name} letter is '{actual}'" if actual == letter else f"No, the {name} letter is not '{letter}'"
+    if intent == 'position_kind':
+        pos = _position(args['pos'])
+        name = _ORDINAL_NAMES.get(pos, f"#{pos}")
+        actual = features.letter_at(pos)
+        if not actual:
+            return f"The word only has {features.length} letters"
+        kind = args['kind']
+        return f"Yes, the {name} letter is a {kind}" if (actual in VOWELS) == (kind == 'vowel') \
+            else f"No, the {name} letter is not a {kind}"
+    if intent == 'letter':
+        return "Yes" if features.has(args['letter']) else "No"
+    raise ValueError(f"unknown intent: {intent}")
+
+
+def answer_question(word: str, question: str, subject: str = 'general') -> Optional[str]:
+    """Offline answer for a covered question shape, else None."""
+    parsed = parse_question(question)
+    if parsed is None:
+        return None
+    intent, args = parsed
+    return answer_from_features(features_for(word), intent, args, subject)
@@ -5,11 +5,36 @@ import random
 import requests
 import logging
 import smtplib
+import threading
+from contextlib import contextmanager
 from email.mime.text import MIMEText
 from typing import Tuple, Optional, Dict, List
 from pathlib import Path
 from dotenv import load_dotenv
 from .fallback_words import get_fallback_word
+from .hint_corpus import get_hint_index, language_for_hints_file
+from .word_deck import WordDeckStore, deck_key
+from .recents_store import get_recents_store
+from .http_client import get_http_client, chat_completions_url
+from .deadline import Deadline, DeadlineExceeded, current_deadline, deadline_scope
+from .circuit_breaker import openrouter_breakers, CircuitOpenError
+from .env_utils import env_float
+from .hedging import hedge_policy, hedged_call, latency_tracker
+from .llm_cache import get_llm_cache, ttl_for, cache_key as llm_cache_key
+from .hint_bank import get_hint_bank
+from .answer_cache import get_answer_cache
+from .word_features import answer_question as answer_from_word_features, features_for as word_features_for
+from .attribute_table import get_attribute_table, match_attribute
+from .question_classifier import (
+    LOCAL_INTENTS,
+    extract_letter as extract_question_letter,
+    get_question_classifier,
+    is_category_question,
+    is_length_question,
+    is_presence_question,
+    log_question,
+    min_confidence as question_min_confidence,
+)
 from .openrouter_monitor import (
     update_quota_from_response,
     check_rate_limits,
@@ -26,6 +51,20 @@ env_path = Path(__file__).parent.parent / '.env'
 logger.info(f"Looking for .env file at: {env_path.absolute()}")
 load_dotenv(env_path)
 
+# Per-thread hints language override (background threads have no Streamlit session)
+_thread_hints_language = threading.local()
+
+
+@contextmanager
+def use_hints_language(language: Optional[str]):
+    """Within this block, _get_hints_file_for_user on the current thread uses `language`."""
+    previous = getattr(_thread_hints_language, 'lang', None)
+    _thread_hints_language.lang = (language or '').strip().lower() or None
+    try:
+        yield
+    finally:
+        _thread_hints_language.lang = previous
+
 # Add this before the WordSelector class
 category_templates = {
     "general": {
@@ -1978,47 +2017,31 @@ class WordSelector:
         logger.debug(f"Entered _select_word_from_dictionary with subject='{subject}', word_length='{word_length}', username='{username}' (length will be ignored)")
         # Get all possible words from the appropriate hints file for the subject
         hints_file = self._get_hints_file_for_user(username)
+        subject_key = subject
         try:
             logger.info(f"[HINTS_FILE_SELECT_WORD] file='{hints_file}' subject='{subject}' user='{username}'")
-            with open(hints_file, 'r', encoding='utf-8') as f:
-                hints_data = json.load(f)
-            templates = hints_data.get('templates', {})
+            index = get_hint_index(hints_file)
             # Case-insensitive subject resolution
-            ci_key_map = {k.lower(): k for k in templates.keys()}
-            subject_key = ci_key_map.get(str(subject).lower()) or ci_key_map.get('general', 'general')
-            all_words = list(templates.get(subject_key, {}).keys())
-            # Normalize keys to their original displayed form but compare in lowercase
-            all_words = [w for w in all_words if isinstance(w, str)]
+            subject_key = index.subject_key(subject) or index.subject_key('general') or 'general'
+            all_words = index.words(subject_key)
             logger.info(f"[HINTS_FILE_SELECT_WORD] subject_key='{subject_key}' words_in_cat={len(all_words)}")
         except Exception as e:
             logger.error(f"Error loading hints.json: {e}")
             all_words = []
 
-        # Track recent words per user+subject
-        recent_key = f"{username}:{(subject_key if 'subject_key' in locals() else subject)}"
-        if not hasattr(self, "_recently_used_words_by_combo"):
-            self._recently_used_words_by_combo = {}
-        recent = set(self._recently_used_words_by_combo.get(recent_key, []))
-        logger.debug(f"Recent word list for {recent_key}: {list(recent)}")
-        # logger.info(f"[DEBUG] All recent word lists: {self._recently_used_words_by_combo}")
-
-        # Block immediate repeat of last word
+        # Draw from the user's shuffled deck for this language+category (no repeats until exhausted)
+        recent_key = f"{username}:{subject_key}"
         if not hasattr(self, "_last_word_by_combo"):
             self._last_word_by_combo = {}
         last_word = self._last_word_by_combo.get(recent_key)
-
-        # Exclude recently used words and last word for this combo
-        candidates = [w for w in all_words if w not in recent and w != last_word]
-        logger.debug(f"Candidate word list for {recent_key} (after filtering): {candidates}")
-        if not candidates:
-            # If all words used, allow repeats but still block immediate repeat
-            candidates = [w for w in all_words if w != last_word]
-            logger.debug(f"Candidate word list for {recent_key} (allowing repeats, still blocking last word): {candidates}")
-        if not candidates:
-            logger.error(f"No candidate words available for subject '{subject}' (length ignored, all would be immediate repeats)")
+        if not hasattr(self, "_word_decks"):
+            self._word_decks = WordDeckStore()
+        key = deck_key(username, language_for_hints_file(hints_file) or os.path.basename(str(hints_file)), subject_key)
+        word = self._word_decks.draw(key, all_words, avoid=last_word)
+        if not word:
+            logger.error(f"No words available for subject '{subject}' in '{hints_file}'")
             return None
 
-        word = random.choice(candidates)
         logger.info(f"[HINTS_FILE_SELECT_WORD] selected_word='{word}' from file='{hints_file}' for subject_key='{subject_key}'")
         logger.debug(f"Selected fallback word: {word}")
         # Do NOT update last word here
@@ -2219,19 +2242,19 @@ class WordSelector:
                 from backend.bio_store import get_active_flash_set_name, get_flash_set_token
                 _active_name = get_active_flash_set_name(username) or 'flashcard'
                 _active_tok = get_flash_set_token(username, _active_name) or ''
-                recent_key = f"{username}:flashcard:{_active_tok or _active_name}"
+                _flash_scope = _active_tok or _active_name
+                recent_key = f"{username}:flashcard:{_flash_scope}"
             except Exception:
+                _flash_scope = ''
                 recent_key = f"{username}:flashcard"
-            if not hasattr(self, "_recently_used_words_by_combo"):
-                self._recently_used_words_by_combo = {}
-            recent = set(self._recently_used_words_by_combo.get(recent_key, []))
-            candidates = [it for it in (pool or []) if str(it.get('word','')).lower() not in recent]
-            if not candidates:
-                candidates = pool or []
-            if not candidates:
+            pool_words = tuple(str(it.get('word') or '') for it in (pool or []) if str(it.get('word') or '').strip())
+            if not pool_words:
                 return None
-            import random as _rnd
-            choice = _rnd.choice(candidates)
+            if not hasattr(self, "_word_decks"):
+                self._word_decks = WordDeckStore()
+            drawn = self._word_decks.draw(deck_key(username, '', 'flashcard', _flash_scope), pool_words,
+                                          avoid=getattr(self, "_last_word_by_combo", {}).get(recent_key))
+            choice = {'word': drawn}
             # Soft-mark selection into the recents for FlashCard using token-scoped key
             try:
                 if str(self.current_category).strip().lower() == 'flashcard':
@@ -2341,7 +2364,7 @@ class WordSelector:
             if not text or not getattr(self, 'api_key_valid', False) or not getattr(self, 'api_key', None):
                 return []
             messages = self._build_flash_pool_prompt(text, max_items)
-            response = self._make_api_request_with_retry(messages)
+            response = self._make_api_request_with_retry(messages, cache_call='flash_pool')
             content = response["choices"][0]["message"]["content"].strip()
             # Strip code fences if any
             if content.startswith('```'):
@@ -2598,6 +2621,14 @@ class WordSelector:
         # Track recently used words per user
         self._recently_used_words_by_user = {}
         self._max_recent_words = int(os.getenv("RECENT_WORDS_LIMIT", "50"))  # Set by .env or default to 50
+        # Pooled keep-alive HTTP client shared by all selectors (OPENROUTER_HTTP_* env)
+        self.http = get_http_client()
+        # Per "user:category" recent/last words, persisted and shared across processes (RECENTS_STORE)
+        _recents = get_recents_store()
+        self._recently_used_words_by_combo = _recents.recent_words
+        self._last_word_by_combo = _recents.last_words
+        # Shuffled per-(user, language, category, flash token) decks for JSON/FlashCard picks
+        self._word_decks = WordDeckStore(persistence=_recents)
 
         # Personal pool env knobs
         try:
@@ -2673,16 +2704,19 @@ class WordSelector:
         Then map: spanish→hints_es(.json), else→hints.json
         """
         lang = 'english'
+        _thread_lang = getattr(_thread_hints_language, 'lang', None)
+        if _thread_lang in ('english', 'spanish', 'french', 'arabic', 'chinese'):
+            lang = _thread_lang
         # Session override from Streamlit, if available
         try:
             import streamlit as _st  # type: ignore
             _sess_lang = str(_st.session_state.get('hints_language', '')).strip().lower()
-            if _sess_lang in ('english', 'spanish', 'french', 'arabic', 'chinese'):
+            if _thread_lang is None and _sess_lang in ('english', 'spanish', 'french', 'arabic', 'chinese'):
                 lang = _sess_lang
         except Exception:
             pass
         # Fallback to user profile pref if session not set
-        if lang == 'english':
+        if lang == 'english' and _thread_lang is None:
             try:
                 uname = (username or 'global').strip().lower()
                 users = self._load_users_db()
@@ -2964,12 +2998,17 @@ class WordSelector:
         except Exception:
             pass
 
-    def generate_personal_pool(self, username: str, n: int = 10, avoid: list = None) -> list:
+    def generate_personal_pool(self, username: str, n: int = 10, avoid: list = None, deadline=None) -> list:
         """Generate a list of personal words with a single hint each for a user.
         Optionally avoid words already present in the user's pool. When API returns fewer than
         requested, keep partial results and request only the remainder up to 3 short attempts,
         then top-up with the offline generator. Filters remove low-value tokens (e.g., 'since', 'have').
+        deadline: Deadline or budget in seconds (default LLM_DEADLINE_PERSONAL_POOL_S); tops up offline once it is spent.
         """
+        with deadline_scope(deadline, 'generate_personal_pool'):
+            return self._generate_personal_pool(username, n, avoid)
+
+    def _generate_personal_pool(self, username: str, n: int = 10, avoid: list = None) -> list:
         # Normalize avoidance set (lowercased words)
         avoid_set = {str(w).strip().lower() for w in (avoid or []) if str(w).strip()}
         # Early capacity guard: if pool already at or above 60, do not call API
@@ -3111,14 +3150,15 @@ class WordSelector:
                 if len(letters) < 2 or not any(c in 'aeiou' for c in letters):
                     return False
                 return True
-            while remaining > 0 and attempt < max_attempts:
+            while remaining > 0 and attempt < max_attempts and not current_deadline().expired():
                 req = remaining
                 msg = prompt.replace("{n}", str(req))
                 messages = {"messages": [
                     {"role": "system", "content": "You are a helpful assistant."},
                     {"role": "user", "content": msg}
                 ]}
-                response = self._make_api_request_with_retry(messages, max_retries=1, base_delay=0.5, max_delay=1.0)
+                response = self._make_api_request_with_retry(messages, max_retries=1, base_delay=0.5, max_delay=1.0,
+                                                             cache_call='personal_pool')
                 content = response["choices"][0]["message"]["content"].strip()
                 data = _parse_json_array_safely(content)
                 added = 0
@@ -3303,32 +3343,26 @@ class WordSelector:
             uname = getattr(self, 'current_username', None) or 'global'
             hints_file = self._get_hints_file_for_user(uname)
             logger.info(f"[HINT SOURCE] Looking for hints in: {hints_file}")
-            with open(hints_file, 'r', encoding='utf-8') as f:
-                hints_data = json.load(f)
-                
-                
-                # Try specific category first
-                if "templates" in hints_data and subject in hints_data["templates"] and word in hints_data["templates"][subject]:
-                    logger.info(f"[HINT SOURCE] Found hints in hints.json for '{word}' in category '{subject}'")
-                    hints = hints_data["templates"][subject][word][:10]  # Take up to 10 hints
-                    logger.info(f"[HINT SOURCE] Using {len(hints)} hints from hints.json")
-                    for i, hint in enumerate(hints, 1):
-                        logger.info(f"[HINT SOURCE] Hint {i}: {hint} (Source: hints.json)")
-                    return hints
-                # Fall back to 'general' if not found in specific category
-                elif "templates" in hints_data and "general" in hints_data["templates"] and word in hints_data["templates"]["general"]:
-                    logger.info(f"[HINT SOURCE] Found hints in hints.json for '{word}' in fallback category 'general'")
-                    hints = hints_data["templates"]["general"][word][:10]
-                    logger.info(f"[HINT SOURCE] Using {len(hints)} hints from hints.json (general fallback)")
-                    for i, hint in enumerate(hints, 1):
-                        logger.info(f"[HINT SOURCE] Hint {i}: {hint} (Source: hints.json/general fallback)")
-                    return hints
-                else:
-                    try:
-                        cats = list((hints_data or {}).get('templates', {}).keys())
-                    except Exception:
-                        cats = []
-                    logger.warning(f"[HINT SOURCE] Word '{word}' not found in hints file '{hints_file}' for category '{subject}'. Available categories={cats[:10]}")
+            index = get_hint_index(hints_file)
+            # Try specific category first
+            if index.has_word(subject, word):
+                logger.info(f"[HINT SOURCE] Found hints in hints.json for '{word}' in category '{subject}'")
+                hints = index.hints(subject, word)[:10]  # Take up to 10 hints
+                logger.info(f"[HINT SOURCE] Using {len(hints)} hints from hints.json")
+                for i, hint in enumerate(hints, 1):
+                    logger.info(f"[HINT SOURCE] Hint {i}: {hint} (Source: hints.json)")
+                return hints
+            # Fall back to 'general' if not found in specific category
+            elif index.has_word("general", word):
+                logger.info(f"[HINT SOURCE] Found hints in hints.json for '{word}' in fallback category 'general'")
+                hints = index.hints("general", word)[:10]
+                logger.info(f"[HINT SOURCE] Using {len(hints)} hints from hints.json (general fallback)")
+                for i, hint in enumerate(hints, 1):
+                    logger.info(f"[HINT SOURCE] Hint {i}: {hint} (Source: hints.json/general fallback)")
+                return hints
+            else:
+                cats = index.categories()
+                logger.warning(f"[HINT SOURCE] Word '{word}' not found in hints file '{hints_file}' for category '{subject}'. Available categories={cats[:10]}")
         except FileNotFoundError:
             logger.warning(f"[HINT SOURCE] hints file not found at {hints_file}")
         except json.JSONDecodeError:
@@ -3400,21 +3434,23 @@ class WordSelector:
             pass
         if not hasattr(self, "_recently_used_words_by_combo"):
             self._recently_used_words_by_combo = {}
-        if recent_key not in self._recently_used_words_by_combo:
-            self._recently_used_words_by_combo[recent_key] = []
-        recent = self._recently_used_words_by_combo[recent_key]
+        # Entries are stored lower-cased on insert, so no re-normalisation pass is needed
+        recent = self._recently_used_words_by_combo.get(recent_key, [])
         wl = (word or '').strip().lower()
-        # Normalize existing list to lower once
-        self._recently_used_words_by_combo[recent_key] = [str(w).strip().lower() for w in recent]
-        recent = self._recently_used_words_by_combo[recent_key]
         if wl in recent:
             recent.remove(wl)
         recent.insert(0, wl)
         max_recent = getattr(self, "_max_recent_words", 50)
         self._recently_used_words_by_combo[recent_key] = recent[:max_recent]
 
-    def select_word(self, word_length: int = 5, subject: str = "general", username: str = "global") -> str:
-        """Select a word based on subject, using per-user recent word tracking. Ignores word length for repeat logic. Blocks immediate repeats."""
+    def select_word(self, word_length: int = 5, subject: str = "general", username: str = "global", deadline=None) -> str:
+        """Select a word based on subject, using per-user recent word tracking. Ignores word length for repeat logic. Blocks immediate repeats.
+        deadline: Deadline or budget in seconds (default LLM_DEADLINE_SELECT_WORD_S); API work stops once it is spent.
+        """
+        with deadline_scope(deadline, 'select_word'):
+            return self._select_word(word_length, subject, username)
+
+    def _select_word(self, word_length: int = 5, subject: str = "general", username: str = "global") -> str:
         self.current_category = subject.lower()
         try:
             self.current_username = (username or 'global').strip().lower()
@@ -3427,7 +3463,10 @@ class WordSelector:
 
         # FlashCard category: pull from user's flash text pool
         if self.current_category == "flashcard":
-            word = self._select_word_from_flashcard(username or 'global')
+            from backend.bio_store import snapshot as bio_snapshot
+            # One parse of the bio/flash files for all pool lookups in this selection
+            with bio_snapshot():
+                word = self._select_word_from_flashcard(username or 'global')
             if word:
                 return word
 
@@ -3603,9 +3642,12 @@ class WordSelector:
             return True
 
         # Try API first if not in fallback mode, or if category is personal/flashcard (always allow)
-        if (not self.use_fallback) or (self.current_category in ("personal", "flashcard")):
+        if ((not self.use_fallback) or (self.current_category in ("personal", "flashcard"))) and self._api_available():
             max_api_retries = 3
             for attempt in range(max_api_retries):
+                if current_deadline().expired():
+                    logger.warning("[DEADLINE] select_word budget spent; using offline selection")
+                    break
                 try:
                     messages = self._build_prompt(word_length, subject)
                     # Add recent words to the user message for context
@@ -3616,7 +3658,7 @@ class WordSelector:
                             "role": "user",
                             "content": f"Avoid these words: {', '.join(recent_words)}"
                         })
-                    response = self._make_api_request_with_retry(messages)
+                    response = self._make_api_request_with_retry(messages, cache_call='select_word')
                     content = response["choices"][0]["message"]["content"].strip()
                     
                     # Handle code block formatting (triple backticks)
@@ -3665,12 +3707,9 @@ class WordSelector:
                         # If user's language points to a specific hints file, ensure the word exists there for the subject
                         try:
                             hints_path = self._get_hints_file_for_user(username)
-                            with open(hints_path, 'r', encoding='utf-8') as _hf:
-                                _data = json.load(_hf)
-                            _templates = (_data or {}).get('templates', {})
-                            _ci = {k.lower(): k for k in _templates.keys()}
-                            _subj_key = _ci.get(str(self.current_category).lower()) or _ci.get('general')
-                            _ok_in_lang = bool(_subj_key and isinstance(_templates.get(_subj_key), dict) and word in _templates.get(_subj_key, {}))
+                            _index = get_hint_index(hints_path)
+                            _subj_key = _index.subject_key(self.current_category) or _index.subject_key('general')
+                            _ok_in_lang = bool(_subj_key and _index.has_word(_subj_key, word))
                             if not _ok_in_lang:
                                 logger.info(f"[API_WORD_FILTER] '{word}' not in '{hints_path}' under '{self.current_category}'. Retrying API/dictionary…")
                                 # Try next API attempt instead of returning an unknown word for this language file
@@ -3686,7 +3725,9 @@ class WordSelector:
                     import traceback
                     logger.error(f"Error getting word from API: {e}")
                     logger.debug(traceback.format_exc())
-                    self.use_fallback = True
+                    # Availability is tracked by the circuit breakers; stop retrying once they open
+                    if isinstance(e, (CircuitOpenError, DeadlineExceeded)):
+                        break
             logger.warning(f"API failed to provide a valid word after {max_api_retries} attempts.")
 
         # Always try dictionary if present, even in fallback mode
@@ -3698,13 +3739,10 @@ class WordSelector:
         # If dictionary yielded nothing but the language-specific hints file has this subject, pick from that subject explicitly
         try:
             hints_file = self._get_hints_file_for_user(username)
-            with open(hints_file, 'r', encoding='utf-8') as f:
-                hints_data = json.load(f)
-            templates = hints_data.get('templates', {})
-            ci_key_map = {k.lower(): k for k in templates.keys()}
-            subject_key = ci_key_map.get(str(self.current_category).lower())
-            if subject_key and isinstance(templates.get(subject_key), dict) and templates[subject_key]:
-                subject_words = list(templates[subject_key].keys())
+            index = get_hint_index(hints_file)
+            subject_key = index.subject_key(self.current_category)
+            if subject_key:
+                subject_words = index.words(subject_key)
                 if subject_words:
                     import random as _random
                     picked = _random.choice(subject_words)
@@ -3727,84 +3765,9 @@ class WordSelector:
 
     def _answer_question_fallback(self, word: str, question: str, subject: str = "general") -> str:
         """Generate a fallback answer when API is not available."""
-        import re
-        question = question.lower()
-
-        # Handle category questions
-        category_patterns = [
-            r"what (?:category|type|kind|group) (?:is|of word is) (?:it|this|the word)",
-            r"(?:is|does) (?:it|the word) (?:belong|related) to (?:the )?(\w+) category",
-            r"(?:is|does) (?:it|this|the word) (?:a|an) (\w+) word",
-            r"(?:is|does) (?:it|this|the word) from (?:the )?(\w+) category",
-            r"(?:is|does) (?:it|this|the word) in (?:the )?(\w+) category",
-            r"what (?:is|about) (?:the )?category",
-            r"which category",
-            r"tell me (?:the )?category"
-        ]
-        for pattern in category_patterns:
-            if re.search(pattern, question):
-                return f"This word belongs to the {subject} category."
-
-        # Check for letter presence (improved, allow whitespace)
-        letter_presence_patterns = [
-            r"(?:contain|have|include|has|with).*letter\s*['\"]?([a-z])['\"]?",
-            r"letter\s*['\"]?([a-z])['\"]? (?:in|inside|within) (?:it|the word)",
-            r"is there a\s*['\"]?([a-z])['\"]? (?:in|inside|within) (?:it|the word)",
-            r"does (?:it|the word) have\s*['\"]?([a-z])['\"]?",
-            r"does (?:it|the word) contain\s*['\"]?([a-z])['\"]?",
-            r"any\s*['\"]?([a-z])['\"]? in (?:it|the word)"
-        ]
-        for pattern in letter_presence_patterns:
-            match = re.search(pattern, question)
-            if match:
-                letter = match.group(1).lower()
-                # Always strip and lowercase the word for robust checking
-                return "Yes" if letter in word.strip().lower() else "No"
-
-        # Check for word length
-        if "how many letters" in question:
-            return f"The word has {len(word)} letters"
-
-        # Robust first letter patterns
-        first_letter_patterns = [
-            r"(?:is|does|has|contains?).*(?:first|1st|start|begin).*(?:letter|character).*['\"]?(\w)['\"]?",
-            r"(?:is|does) (?:it|the word) start (?:with|using) ['\"]?(\w)['\"]?",
-            r"(?:does|is) ['\"]?(\w)['\"]? (?:the|its) first letter",
-            r"(?:is|does) the first letter ['\"]?(\w)['\"]?",
-            r"first letter ['\"]?(\w)['\"]?",
-            r"(?:is|does) ['\"]?(\w)['\"]? (?:the )?first",
-            r"start with ['\"]?(\w)['\"]?",
-            r"begins? with ['\"]?(\w)['\"]?",
-            r"^first ['\"]?(\w)['\"]?$"
-        ]
-        for pattern in first_letter_patterns:
-            match = re.search(pattern, question)
-            if match:
-                letter = match.group(1).lower()
-                return f"Yes, the first letter is '{word[0]}'" if word[0] == letter else f"No, the first letter is not '{letter}'"
-        if "first letter" in question:
-            return f"The first letter is '{word[0]}'"
-
-        # Robust last letter patterns
-        last_letter_patterns = [
-            r"(?:is|does|has|contains?).*(?:last|final|end).*(?:letter|character).*['\"]?(\w)['\"]?",
-            r"(?:is|does) (?:it|the word) end (?:with|in) ['\"]?(\w)['\"]?",
-            r"(?:does|is) ['\"]?(\w)['\"]? (?:the|its) last letter",
-            r"(?:is|does) the last letter ['\"]?(\w)['\"]?",
-            r"last letter ['\"]?(\w)['\"]?",
-            r"(?:is|does) ['\"]?(\w)['\"]? (?:the )?last",
-            r"end with ['\"]?(\w)['\"]?",
-            r"ends? with ['\"]?(\w)['\"]?",
-            r"^last ['\"]?(\w)['\"]?$"
-        ]
-        for pattern in last_letter_patterns:
-            match = re.search(pattern, question)
-            if match:
-                letter = match.group(1).lower()
-                return f"Yes, the last letter is '{word[-1]}'" if word[-1] == letter else f"No, the last letter is not '{letter}'"
-        if "last letter" in question:
-            return f"The last letter is '{word[-1]}'"
-
+        answer = answer_from_word_features(word, question, subject)
+        if answer is not None:
+            return answer
         # Default response
         return "I can only answer questions about letters and word length in fallback mode"
 
@@ -3816,152 +3779,128 @@ class WordSelector:
         word = word.lower().strip()
         subject = subject.lower().strip()
         hints = []
-        # Debug logging for subject and keys
         logger.info(f"[HINT DEBUG] Requested subject: '{subject}' for word: '{word}'")
-        if hasattr(self, 'hints_data'):
-            logger.info(f"[HINT DEBUG] Top-level keys in hints_data: {list(self.hints_data.keys())}")
-            if 'categories' in self.hints_data:
-                logger.info(f"[HINT DEBUG] Category keys in hints_data['categories']: {list(self.hints_data['categories'].keys())}")
-        # 1. Check top-level subject section FIRST (e.g., 4th_grade)
-        if (
-            hasattr(self, 'hints_data') and
-            subject in self.hints_data and
-            word in self.hints_data[subject]
-        ):
-            hints = self.hints_data[subject][word]
-            logger.info(f"[HINT DEBUG] Found hints for word '{word}' in top-level '{subject}': {hints}")
-            print(f"[HINT DEBUG] Found hints for word '{word}' in top-level '{subject}': {hints}")
-        # 2. If not found, check categories section
-        elif (
-            hasattr(self, 'hints_data') and
-            'categories' in self.hints_data and
-            subject in self.hints_data['categories'] and
-            word in self.hints_data['categories'][subject]
-        ):
-            hints = self.hints_data['categories'][subject][word]
-            logger.info(f"[HINT DEBUG] Found hints for word '{word}' in categories['{subject}']: {hints}")
-            print(f"[HINT DEBUG] Found hints for word '{word}' in categories['{subject}']: {hints}")
+        # 1. Curated hints corpus for the user's hints language
+        language = 'english'
+        try:
+            hints_file = self._get_hints_file_for_user(getattr(self, 'current_username', None) or 'global')
+            language = language_for_hints_file(hints_file) or 'english'
+            index = get_hint_index(hints_file)
+            subject_key = index.subject_key(subject)
+            if subject_key:
+                hints = list(index.hints(subject_key, word) or [])
+        except Exception as e:
+            logger.warning(f"[HINT DEBUG] hints corpus lookup failed: {e}")
+        if hints:
+            logger.info(f"[HINT DEBUG] Found {len(hints)} corpus hints for word '{word}' in '{subject}'")
         else:
-            logger.info(f"[HINT DEBUG] No pre-generated hints found for word '{word}' in subject '{subject}'")
-            print(f"[HINT DEBUG] No pre-generated hints found for word '{word}' in subject '{subject}'")
-            # Use cached API hints if available, otherwise call API
-            cache_key = (word, subject)
-            if cache_key in self._api_hint_cache:
-                api_hints = self._api_hint_cache[cache_key]
-            else:
-                api_hints = self.get_api_hints(word, subject, n=max_hints)
-                if api_hints:
-                    self._api_hint_cache[cache_key] = api_hints
-            if api_hints:
-                hints = api_hints
-        # 3. Fallback to dynamic hints if still not found
+            # 2-3. Hint bank, then API
+            hints = self.get_bank_or_api_hints(word, subject, n=max_hints, language=language)
+        # 4. Fallback to dynamic hints if still not found
         if hints:
             for hint in hints:
                 if hint not in previous_hints:
                     return hint
         return self._generate_dynamic_hint(word, subject, previous_hints)
 
+    def get_bank_or_api_hints(self, word: str, subject: str, n: int = 10, language: Optional[str] = None) -> list:
+        """Hints for a word outside the curated corpus: session cache, hint bank, then the API (banked once validated)."""
+        word = word.lower().strip()
+        subject = subject.lower().strip()
+        if language is None:
+            try:
+                language = language_for_hints_file(
+                    self._get_hints_file_for_user(getattr(self, 'current_username', None) or 'global')) or 'english'
+            except Exception:
+                language = 'english'
+        hints = []
+        # Hint bank (validated API hints stored once, shared across processes)
+        bank = get_hint_bank()
+        cache_key = (language, word, subject)
+        if cache_key in self._api_hint_cache:
+            hints = self._api_hint_cache[cache_key]
+        elif bank is not None:
+            try:
+                hints = bank.get(language, subject, word)
+            except Exception as e:
+                logger.warning(f"[HINT_BANK] lookup failed: {e}")
+            if hints:
+                logger.info(f"[HINT DEBUG] Found {len(hints)} banked hints for word '{word}' in '{subject}'")
+        # API, then bank the validated result
+        if not hints:
+            logger.info(f"[HINT DEBUG] No stored hints for word '{word}' in subject '{subject}'; asking API")
+            hints = self.get_api_hints(word, subject, n=n)
+            if hints and bank is not None:
+                try:
+                    bank.put(language, subject, word, hints, source='api', model=self.primary_model)
+                except Exception as e:
+                    logger.warning(f"[HINT_BANK] store failed: {e}")
+        if hints:
+            self._api_hint_cache[cache_key] = hints
+        return hints
+
     def verify_guess(self, word: str, guess: str) -> bool:
         """Verify if the guessed word matches the actual word."""
         return word.lower() == guess.lower()
 
-    def answer_question(self, word: str, question: str, subject: str = "general") -> str:
-        """Answer a question about the word."""
-        import re
-        # Patterns for simple fallback questions
-        letter_presence_patterns = [
-            r"(?:contain|have|include|has|with)[^a-zA-Z]*['\"]?([a-z])['\"]?",
-            r"letter[^a-zA-Z]*['\"]?([a-z])['\"]?",
-            r"is there[^a-zA-Z]*['\"]?([a-z])['\"]?",
-            r"any[^a-zA-Z]*['\"]?([a-z])['\"]?",
-            r"does (?:it|the word)[^a-zA-Z]*['\"]?([a-z])['\"]?",
-            r"is ['\"]?([a-z])['\"]? present",
-            r"['\"]?([a-z])['\"]? in (?:it|the word)",
-            r"does it have ['\"]?([a-z])['\"]?",
-            r"does the word have ['\"]?([a-z])['\"]?",
-            r"has ['\"]?([a-z])['\"]?",
-            r"include ['\"]?([a-z])['\"]?",
-            r"with ['\"]?([a-z])['\"]?",
-        ]
-        first_letter_patterns = [
-            r"(?:is|does|has|contains?).*(?:first|1st|start|begin).*(?:letter|character).*['\"]?(\w)['\"]?",
-            r"(?:is|does) (?:it|the word) start (?:with|using) ['\"]?(\w)['\"]?",
-            r"(?:does|is) ['\"]?(\w)['\"]? (?:the|its) first letter",
-            r"(?:is|does) the first letter ['\"]?(\w)['\"]?",
-            r"first letter ['\"]?(\w)['\"]?",
-            r"(?:is|does) ['\"]?(\w)['\"]? (?:the )?first",
-            r"start with ['\"]?(\w)['\"]?",
-            r"begins? with ['\"]?(\w)['\"]?",
-            r"^first ['\"]?(\w)['\"]?$"
-        ]
-        last_letter_patterns = [
-            r"(?:is|does|has|contains?).*(?:last|final|end).*(?:letter|character).*['\"]?(\w)['\"]?",
-            r"(?:is|does) (?:it|the word) end (?:with|in) ['\"]?(\w)['\"]?",
-            r"(?:does|is) ['\"]?(\w)['\"]? (?:the|its) last letter",
-            r"(?:is|does) the last letter ['\"]?(\w)['\"]?",
-            r"last letter ['\"]?(\w)['\"]?",
-            r"(?:is|does) ['\"]?(\w)['\"]? (?:the )?last",
-            r"end with ['\"]?(\w)['\"]?",
-            r"ends? with ['\"]?(\w)['\"]?",
-            r"^last ['\"]?(\w)['\"]?$"
-        ]
-        category_patterns = [
-            r"what (?:category|type|kind|group) (?:is|of word is) (?:it|this|the word)",
-            r"(?:is|does) (?:it|the word) (?:belong|related) to (?:the )?(\w+) category",
-            r"(?:is|does) (?:it|this|the word) (?:a|an) (\w+) word",
-            r"(?:is|does) (?:it|this|the word) from (?:the )?(\w+) category",
-            r"(?:is|does) (?:it|this|the word) in (?:the )?(\w+) category",
-            r"what (?:is|about) (?:the )?category",
-            r"which category",
-            r"tell me (?:the )?category"
-        ]
-        # Simple fallback: letter presence
-        for pattern in letter_presence_patterns:
-            if re.search(pattern, question.lower()):
-                return self._answer_question_fallback(word, question, subject)
-        # Simple fallback: word length
-        if "how many letters" in question.lower():
-            return self._answer_question_fallback(word, question, subject)
-        # Simple fallback: first letter
-        for pattern in first_letter_patterns:
-            if re.search(pattern, question.lower()):
-                return self._answer_question_fallback(word, question, subject)
-        if "first letter" in question.lower():
-            return self._answer_question_fallback(word, question, subject)
-        # Simple fallback: last letter
-        for pattern in last_letter_patterns:
-            if re.search(pattern, question.lower()):
-                return self._answer_question_fallback(word, question, subject)
-        if "last letter" in question.lower():
-            return self._answer_question_fallback(word, question, subject)
-        # Simple fallback: category
-        for pattern in category_patterns:
-            if re.search(pattern, question.lower()):
-                return self._answer_question_fallback(word, question, subject)
-        # If fallback mode but API is available, try API for complex questions
-        if self.use_fallback and self.api_key and self.api_key_valid:
+    def answer_question(self, word: str, question: str, subject: str = "general", deadline=None) -> str:
+        """Answer a question about the word.
+        deadline: Deadline or budget in seconds (default LLM_DEADLINE_ANSWER_S); offline answer once it is spent.
+        """
+        with deadline_scope(deadline, 'answer_question'):
+            return self._answer_question(word, question, subject)
+
+    def _answer_question(self, word: str, question: str, subject: str = "general") -> str:
+        answer, route, intent = self._route_question(word, question, subject)
+        log_question(question, route, intent)
+        return answer
+
+    def _route_question(self, word: str, question: str, subject: str = "general") -> Tuple[str, str, Optional[str]]:
+        """Answer locally when possible; returns (answer, route, predicted intent) for routing stats."""
+        # Letter/length/category questions: one compiled matcher, answered from the word's features
+        answer = answer_from_word_features(word, question, subject)
+        if answer is not None:
+            return answer, 'features', None
+        # Common yes/no forms ("is it alive?", "can you eat it?"): precomputed attribute table
+        attribute = match_attribute(question)
+        attribute_table = get_attribute_table() if attribute else None
+        if attribute_table is not None:
             try:
-                messages = [
-                    {
-                        "role": "system",
-                        "content": "You are a word guessing game assistant. Answer any yes/no question about the word as helpfully as possible. Do not reveal, confirm, or mention the word itself in your response. Only provide a yes/no answer and a brief explanation if relevant. Never include the word or any part of it in your answer."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"The word is: {word}\nPlayer's question: {question}\n"
-                    }
-                ]
-                response = self._make_api_request_with_retry(messages)
-                logger.debug(f"API response type: {type(response)}, content: {response}")
-                answer = response["choices"][0]["message"]["content"].strip()
-                return answer
+                known = attribute_table.lookup(subject, word, *attribute)
+            except Exception as e:
+                logger.warning(f"[ATTR_TABLE] lookup failed: {e}")
+                known = None
+            if known is not None:
+                return ("Yes" if known else "No"), 'attribute_table', 'attribute'
+        # Loosely phrased letter/length/category questions: intent classifier
+        intent = None
+        classifier = get_question_classifier()
+        if classifier is not None:
+            try:
+                intent, confidence = classifier.predict(question)
             except Exception as e:
-                logger.error(f"[Fallback-API] Failed to get answer from API: {str(e)}")
-                return self._answer_question_fallback(word, question, subject)
-        # Fallback mode, no API or API failed: fallback logic
-        if self.use_fallback:
-            return self._answer_question_fallback(word, question, subject)
-        # API mode: allow any question style
+                logger.warning(f"[QCLASS] predict failed: {e}")
+                confidence = 0.0
+            if intent in LOCAL_INTENTS and confidence >= question_min_confidence():
+                answer = self._answer_predicted_intent(word, question, subject, intent)
+                if answer is not None:
+                    return answer, 'classifier', intent
+        # Same word and question already answered by the API (any session or process), even while offline
+        answer_cache = get_answer_cache()
+        if answer_cache is not None:
+            try:
+                cached = answer_cache.get(word, question)
+            except Exception as e:
+                logger.warning(f"[ANSWER_CACHE] lookup failed: {e}")
+                cached = None
+            if cached is not None:
+                return cached, 'answer_cache', intent
+        # Breakers open (API down/slow or quota critical): answer offline right away
+        if not self._api_available():
+            return self._offline_answer(word, question, subject, attribute_table, attribute) + (intent,)
+        if self.use_fallback and not (self.api_key and self.api_key_valid):
+            return self._offline_answer(word, question, subject, attribute_table, attribute) + (intent,)
+        # Any question style goes to the API
         try:
             messages = [
                 {
@@ -3973,13 +3912,54 @@ class WordSelector:
                     "content": f"The word is: {word}\nPlayer's question: {question}\n"
                 }
             ]
-            response = self._make_api_request_with_retry(messages)
+            response = self._make_api_request_with_retry(messages, cache_call='answer_question')
             logger.debug(f"API response type: {type(response)}, content: {response}")
             answer = response["choices"][0]["message"]["content"].strip()
-            return answer
+            self._learn_attribute(attribute_table, attribute, subject, word, answer)
+            if answer_cache is not None:
+                try:
+                    answer_cache.put(word, question, answer)
+                except Exception as e:
+                    logger.warning(f"[ANSWER_CACHE] store failed: {e}")
+            return answer, 'api', intent
         except Exception as e:
             logger.error(f"Failed to get answer from API: {str(e)}")
-            return self._answer_question_fallback(word, question, subject)
+            return self._offline_answer(word, question, subject, attribute_table, attribute) + (intent,)
+
+    def _offline_answer(self, word: str, question: str, subject: str, attribute_table,
+                        attribute) -> Tuple[str, str]:
+        """(answer, route) without the API: a category-wide attribute guess if one applies, else the generic fallback."""
+        if attribute_table is not None and attribute:
+            try:
+                guess = attribute_table.default(subject, *attribute)
+            except Exception as e:
+                logger.warning(f"[ATTR_TABLE] default lookup failed: {e}")
+                guess = None
+            if guess is not None:
+                return ("Yes" if guess else "No"), 'attribute_default'
+        return self._answer_question_fallback(word, question, subject), 'offline'
+
+    def _answer_predicted_intent(self, word: str, question: str, subject: str, intent: str) -> Optional[str]:
+        """Answer a question the classifier put in a local intent, or None if it cannot be done reliably."""
+        features = word_features_for(word)
+        if intent == 'category' and is_category_question(question):
+            return f"This word belongs to the {subject} category."
+        if intent == 'length' and is_length_question(question):
+            return f"The word has {features.length} letters"
+        if intent == 'letter' and is_presence_question(question):
+            letter = extract_question_letter(question)
+            if letter:
+                return "Yes" if features.has(letter) else "No"
+        return None
+
+    def _learn_attribute(self, table, attribute, subject: str, word: str, answer: str) -> None:
+        """Write a plain yes/no API answer to a matched attribute question back to the table."""
+        if table is None or not attribute:
+            return
+        try:
+            table.learn_answer(subject, word, *attribute, answer, model=self.primary_model)
+        except Exception as e:
+            logger.warning(f"[ATTR_TABLE] write-back failed: {e}")
 
     def _generate_dynamic_hint(self, word: str, subject: str, previous_hints: list = None, max_hints: int = 10) -> str:
         """Generate a dynamic fallback hint for the word and subject."""
@@ -4034,12 +4014,53 @@ class WordSelector:
             ]
         }
 
-    def _make_api_request_with_retry(self, messages, max_retries=3, base_delay=1.0, max_delay=10.0):
+    def _api_available(self) -> bool:
+        """True when an API key is configured and at least one model's circuit breaker admits calls."""
+        if not (getattr(self, 'api_key', None) and getattr(self, 'api_key_valid', False)):
+            return False
+        return openrouter_breakers.any_available([self.primary_model, self.fallback_model])
+
+    def _make_api_request_with_retry(self, messages, max_retries=3, base_delay=1.0, max_delay=10.0, deadline=None,
+                                     cache_call=None, cache_refresh=False):
+        """
+        Cached front of _make_api_request_uncached.
+        cache_call names the call type for the shared LLM response cache (see llm_cache.py);
+        None or a TTL of 0 bypasses the cache. cache_refresh skips the lookup but stores the
+        fresh response (used when a cached response was rejected by the caller).
+        """
+        cache = get_llm_cache() if cache_call else None
+        ttl = ttl_for(cache_call) if cache is not None else 0
+        key = None
+        if ttl > 0:
+            try:
+                body = messages["messages"] if isinstance(messages, dict) and "messages" in messages else messages
+                key = llm_cache_key([self.primary_model, self.fallback_model], body)
+                if not cache_refresh:
+                    cached = cache.get(key, cache_call)
+                    if cached is not None:
+                        logger.debug(f"[LLM_CACHE] hit call={cache_call}")
+                        return cached
+            except Exception as e:
+                logger.warning(f"[LLM_CACHE] lookup failed: {e}")
+                key = None
+        data = self._make_api_request_uncached(messages, max_retries, base_delay, max_delay, deadline)
+        if key and isinstance(data, dict) and data.get('choices'):
+            try:
+                cache.put(key, cache_call, data, ttl)
+            except Exception as e:
+                logger.warning(f"[LLM_CACHE] store failed: {e}")
+        return data
+
+    def _make_api_request_uncached(self, messages, max_retries=3, base_delay=1.0, max_delay=10.0, deadline=None):
         """
         Make an API request with retries, exponential backoff, and jitter.
         Also update quota info and trigger fallback if quota is exhausted.
+        All attempts, sleeps and the primary -> fallback switch are scheduled within
+        `deadline` (default: the caller's deadline scope); raises DeadlineExceeded once it is spent.
         """
-        url = "https://openrouter.ai/api/v1/chat/completions"
+        url = chat_completions_url()
+        http = getattr(self, 'http', None) or get_http_client()
+        deadline = current_deadline().earliest(deadline)
         if isinstance(messages, dict) and "messages" in messages:
             payload = {"model": self.primary_model, "messages": messages["messages"]}
         else:
@@ -4053,88 +4074,203 @@ class WordSelector:
             max_delay = float(os.getenv('OPENROUTER_RETRY_MAX_DELAY_S', str(max_delay)))
             max_retries = int(os.getenv('OPENROUTER_RETRY_MAX_ATTEMPTS', str(max_retries)))
             cooldown_429 = float(os.getenv('OPENROUTER_429_COOLDOWN_S', '8'))
+            primary_share = float(os.getenv('OPENROUTER_PRIMARY_BUDGET_SHARE', '0.6'))
         except Exception:
             cooldown_429 = 8.0
-        # Try primary model up to max_retries times
-        for attempt in range(max_retries):
+            primary_share = 0.6
+        ladders = [("primary", self.primary_model)]
+        if self.fallback_model and self.fallback_model != self.primary_model:
+            ladders.append(("fallback", self.fallback_model))
+        # Skip models whose circuit breaker is open; give the whole budget to the rest
+        ladders = [(label, model) for label, model in ladders if openrouter_breakers.get(model).available()]
+        if not ladders:
+            raise CircuitOpenError("OpenRouter circuit open for all models")
+        # Optional hedge: race the first primary attempt against the fallback model
+        if len(ladders) == 2 and hedge_policy.enabled() and not deadline.expired():
+            quota_state = {}
+            remaining = deadline.remaining()
             try:
-                import requests
-                response = requests.post(url, json=payload, headers=headers, timeout=15)
-                from .openrouter_monitor import update_quota_from_response, get_quota_warning
-                update_quota_from_response(response.headers)
-                warning = get_quota_warning()
-                if warning:
-                    last_warning = warning
-                    try:
-                        _msg = str(warning['message']).encode('ascii', 'backslashreplace').decode('ascii')
-                    except Exception:
-                        _msg = str(warning.get('message', ''))
-                    logger.warning(f"Quota warning: {_msg}")
-                    if warning['level'] == 'error':
-                        self.use_fallback = True
-                        logger.error("Critical quota reached. Switching to fallback mode.")
-                        raise RuntimeError(warning['message'])
-                # Special handling: if 429, observe cooldown
-                if response.status_code == 429:
-                    time.sleep(cooldown_429)
-                response.raise_for_status()
-                return response.json()
+                return hedged_call(
+                    lambda: self._post_chat_once(http, url, payload, headers, self.primary_model, deadline, quota_state),
+                    lambda: self._post_chat_once(http, url, payload, headers, self.fallback_model, deadline, quota_state),
+                    delay=hedge_policy.delay(self.primary_model), policy=hedge_policy,
+                    is_valid=lambda d: isinstance(d, dict) and bool(d.get('choices')),
+                    timeout=None if remaining == float('inf') else remaining)
             except Exception as e:
-                wait = min(max_delay, base_delay * (2 ** attempt)) + random.uniform(0, 1)
+                last_warning = quota_state.get('warning') or last_warning
+                logger.warning(f"[HEDGE] hedged attempt failed: {e}; continuing with retry ladder")
+        for ladder_idx, (label, model) in enumerate(ladders):
+            payload["model"] = model
+            breaker = openrouter_breakers.get(model)
+            # Reserve part of a bounded budget for the fallback model's ladder
+            is_last = ladder_idx == len(ladders) - 1
+            ladder_deadline = deadline if is_last else deadline.share(primary_share)
+            for attempt in range(max_retries):
+                if ladder_deadline.expired():
+                    break
+                if not breaker.allow():
+                    logger.info(f"[CIRCUIT] skipping {label} model '{model}' (breaker open)")
+                    break
+                _t0 = time.monotonic()
+                _recorded = False
                 try:
-                    _err = str(e).encode('ascii', 'backslashreplace').decode('ascii')
-                except Exception:
-                    _err = str(e)
-                logger.warning(f"API request failed (primary, attempt {attempt+1}/{max_retries}): {_err}. Retrying in {wait:.1f}s...")
-                time.sleep(wait)
-        # If all primary model attempts fail, try fallback model up to max_retries times
-        payload["model"] = self.fallback_model
-        for attempt in range(max_retries):
-            try:
-                import requests
-                response = requests.post(url, json=payload, headers=headers, timeout=15)
-                from .openrouter_monitor import update_quota_from_response, get_quota_warning
-                update_quota_from_response(response.headers)
-                warning = get_quota_warning()
-                if warning:
-                    last_warning = warning
+                    response = http.post(url, json=payload, headers=headers,
+                                         timeout=http.timeout(ladder_deadline.remaining()))
+                    from .openrouter_monitor import update_quota_from_response, get_quota_warning
+                    update_quota_from_response(response.headers)
+                    warning = get_quota_warning()
+                    if warning:
+                        last_warning = warning
+                        try:
+                            _msg = str(warning['message']).encode('ascii', 'backslashreplace').decode('ascii')
+                        except Exception:
+                            _msg = str(warning.get('message', ''))
+                        logger.warning(f"Quota warning: {_msg}")
+                        if warning['level'] == 'error':
+                            # Open every model's breaker for a long cooldown; half-open probes re-check later
+                            openrouter_breakers.trip_all([self.primary_model, self.fallback_model],
+                                                         env_float('OPENROUTER_CB_QUOTA_OPEN_S', 600.0), 'critical quota')
+                            logger.error("Critical quota reached. Switching to fallback mode.")
+                            raise RuntimeError(warning['message'])
+                    # Special handling: if 429, observe cooldown (or move on if it does not fit the budget)
+                    if response.status_code == 429:
+                        breaker.record_failure(time.monotonic() - _t0)
+                        _recorded = True
+                        if not ladder_deadline.sleep(cooldown_429):
+                            logger.warning(f"API 429 ({label}); cooldown {cooldown_429:.1f}s exceeds remaining budget")
+                            break
+                    response.raise_for_status()
+                    data = response.json()
+                    if not _recorded:
+                        breaker.record_success(time.monotonic() - _t0)
+                        latency_tracker.record(model, time.monotonic() - _t0)
+                    return data
+                except Exception as e:
+                    if not _recorded:
+                        breaker.record_failure(time.monotonic() - _t0)
+                    wait = min(max_delay, base_delay * (2 ** attempt)) + random.uniform(0, 1)
                     try:
-                        _msg2 = str(warning['message']).encode('ascii', 'backslashreplace').decode('ascii')
+                        _err = str(e).encode('ascii', 'backslashreplace').decode('ascii')
                     except Exception:
-                        _msg2 = str(warning.get('message', ''))
-                    logger.warning(f"Quota warning: {_msg2}")
-                    if warning['level'] == 'error':
-                        self.use_fallback = True
-                        logger.error("Critical quota reached. Switching to fallback mode.")
-                        raise RuntimeError(warning['message'])
-                if response.status_code == 429:
-                    time.sleep(cooldown_429)
-                response.raise_for_status()
-                return response.json()
-            except Exception as e:
-                wait = min(max_delay, base_delay * (2 ** attempt)) + random.uniform(0, 1)
-                try:
-                    _err2 = str(e).encode('ascii', 'backslashreplace').decode('ascii')
-                except Exception:
-                    _err2 = str(e)
-                logger.warning(f"API request failed (fallback, attempt {attempt+1}/{max_retries}): {_err2}. Retrying in {wait:.1f}s...")
-                time.sleep(wait)
+                        _err = str(e)
+                    if attempt + 1 >= max_retries:
+                        logger.warning(f"API request failed ({label}, attempt {attempt+1}/{max_retries}): {_err}.")
+                        break
+                    logger.warning(f"API request failed ({label}, attempt {attempt+1}/{max_retries}): {_err}. Retrying in {wait:.1f}s...")
+                    if not ladder_deadline.sleep(wait):
+                        logger.warning(f"[DEADLINE] no time left for {label} retry backoff ({ladder_deadline.remaining():.1f}s left)")
+                        break
+        if deadline.expired():
+            raise DeadlineExceeded("API request budget exhausted")
         if last_warning:
             raise RuntimeError(last_warning['message'])
         raise RuntimeError("API request failed after multiple retries")
 
+    def _post_chat_once(self, http, url, payload, headers, model, deadline, quota_state):
+        """Single POST of `payload` to `model` (no retries); used by the hedged path.
+
+        Records the breaker outcome and latency; raises on any failure.
+        """
+        breaker = openrouter_breakers.get(model)
+        if not breaker.allow():
+            raise CircuitOpenError(f"circuit open for '{model}'")
+        t0 = time.monotonic()
+        try:
+            response = http.post(url, json=dict(payload, model=model), headers=headers,
+                                 timeout=http.timeout(deadline.remaining()))
+            from .openrouter_monitor import update_quota_from_response, get_quota_warning
+            update_quota_from_response(response.headers)
+            warning = get_quota_warning()
+            if warning:
+                quota_state['warning'] = warning
+                if warning['level'] == 'error':
+                    openrouter_breakers.trip_all([self.primary_model, self.fallback_model],
+                                                 env_float('OPENROUTER_CB_QUOTA_OPEN_S', 600.0), 'critical quota')
+                    raise RuntimeError(warning['message'])
+            response.raise_for_status()
+            data = response.json()
+        except Exception:
+            breaker.record_failure(time.monotonic() - t0)
+            raise
+        latency = time.monotonic() - t0
+        breaker.record_success(latency)
+        latency_tracker.record(model, latency)
+        return data
+
     def get_api_hints_force(self, word: str, subject: str, n: int = 10, attempts: int | None = None) -> list:
         """Force API hint generation regardless of fallback flag (used for Personal/FlashCard).
         Optional 'attempts' allows callers to override the retry count.
         """
-        saved = getattr(self, 'use_fallback', False)
         try:
-            self.use_fallback = False
-            return self.get_api_hints(word, subject, n, attempts=attempts)
+            return self.get_api_hints(word, subject, n, attempts=attempts, force=True)
         except Exception:
             return []
+
+    async def iter_api_hints_many(self, words: List[str], subject: str, n: int = 10, concurrency: int | None = None,
+                                  attempts: int | None = None, force: bool = False):
+        """Async generator of (word, hints) for each word, yielded as requests complete.
+
+        Requests run in worker threads behind one shared semaphore of `concurrency`
+        (default OPENROUTER_FANOUT_CONCURRENCY). Once openrouter_monitor reports a critical
+        quota warning, words not yet started yield [] without calling the API.
+        force: bypass the fallback flag, as get_api_hints_force does.
+        """
+        import asyncio
+        from .openrouter_monitor import get_quota_warning
+        if concurrency is None:
+            try:
+                concurrency = int(os.getenv('OPENROUTER_FANOUT_CONCURRENCY', '4'))
+            except Exception:
+                concurrency = 4
+        semaphore = asyncio.Semaphore(max(1, int(concurrency)))
+        fetch = self.get_api_hints_force if force else self.get_api_hints
+
+        async def _one(word: str):
+            async with semaphore:
+                warning = get_quota_warning()
+                if warning and warning.get('level') == 'error':
+                    return word, []
+                try:
+                    return word, await asyncio.to_thread(fetch, word, subject, n, attempts=attempts)
+                except Exception as e:
+                    logger.info(f"[FANOUT] hints failed for '{word}': {e}")
+                    return word, []
+
+        tasks = [asyncio.ensure_future(_one(w)) for w in dict.fromkeys(words or [])]
+        try:
+            for done in asyncio.as_completed(tasks):
+                yield await done
         finally:
-            self.use_fallback = saved
+            for t in tasks:
+                t.cancel()
+
+    def get_api_hints_many(self, words: List[str], subject: str, n: int = 10, concurrency: int | None = None,
+                           attempts: int | None = None, force: bool = False, on_result=None) -> Dict[str, list]:
+        """Blocking front of iter_api_hints_many: {word: hints} for every distinct word.
+
+        on_result(word, hints) is called as each request completes.
+        """
+        import asyncio
+
+        async def _collect():
+            results: Dict[str, list] = {}
+            async for word, hints in self.iter_api_hints_many(words, subject, n, concurrency, attempts, force):
+                results[word] = hints
+                if on_result is not None:
+                    try:
+                        on_result(word, hints)
+                    except Exception as e:
+                        logger.warning(f"[FANOUT] on_result failed for '{word}': {e}")
+            return results
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(_collect())
+        # Called from inside a running event loop: run ours on a helper thread
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(asyncio.run, _collect()).result()
 
     def get_quota_warning_for_ui(self):
         """Get the current quota warning for the UI/frontend to display."""
@@ -4144,11 +4280,19 @@ class WordSelector:
             return warning['message']
         return None
 
-    def get_api_hints(self, word: str, subject: str, n: int = 10, attempts: int | None = None) -> list:
+    def get_api_hints(self, word: str, subject: str, n: int = 10, attempts: int | None = None, deadline=None,
+                      force: bool = False) -> list:
         """Use the API to generate n meaningful, diverse hints about the word, with improved prompt and post-processing.
         Optional 'attempts' controls retry loops (default 3).
+        deadline: Deadline or budget in seconds (default LLM_DEADLINE_HINTS_S); returns [] once it is spent.
+        force: call the API even when use_fallback is set (the flag itself is never changed).
         """
-        if self.use_fallback:
+        with deadline_scope(deadline, 'get_api_hints'):
+            return self._get_api_hints(word, subject, n, attempts, force=force)
+
+    def _get_api_hints(self, word: str, subject: str, n: int = 10, attempts: int | None = None,
+                       force: bool = False) -> list:
+        if (self.use_fallback and not force) or not self._api_available():
             return []
         import time
         import logging
@@ -4208,7 +4352,9 @@ class WordSelector:
                         "content": f"The word is: {word}\nGenerate exactly {n} hints as described."
                     }
                 ]
-                response = self._make_api_request_with_retry(messages)
+                # A retry means the previous (possibly cached) response was rejected; refresh it
+                response = self._make_api_request_with_retry(messages, cache_call='get_api_hints',
+                                                             cache_refresh=attempt > 0)
                 content = response["choices"][0]["message"]["content"].strip()
                 # Remove code block formatting if present
                 if content.startswith('```'):
@@ -4247,14 +4393,16 @@ class WordSelector:
                 except Exception:
                     _safe_hints2 = str(filtered_hints)
                 logger.debug(f"API returned insufficient valid hints, retrying (attempt {attempt+1}/{max_attempts}): {_safe_hints2}")
-                time.sleep(1.5 * (attempt + 1))
+                if not current_deadline().sleep(1.5 * (attempt + 1)):
+                    break
             except Exception as e:
                 try:
                     _safe_err = str(e).encode('ascii', 'backslashreplace').decode('ascii')
                 except Exception:
                     _safe_err = str(e)
                 logger.debug(f"Failed to get hints from API (attempt {attempt+1}): {_safe_err}")
-                time.sleep(1.5 * (attempt + 1))
+                if isinstance(e, DeadlineExceeded) or not current_deadline().sleep(1.5 * (attempt + 1)):
+                    break
         try:
             _safe_word2 = word.encode('ascii', 'backslashreplace').decode('ascii')
         except Exception:
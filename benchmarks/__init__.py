@@ -0,0 +1 @@
+"""Offline micro-benchmarks for hot paths (see benchmarks/run.py)."""
@@ -0,0 +1,47 @@
+"""bio_store reads and writes for 10 / 1k / 50k users, on the JSON and SQLite engines."""
+
+import os
+import json
+from typing import Dict, List
+
+from .harness import bench
+
+
+def make_bio_file(path: str, users: int) -> None:
+    data = {}
+    for i in range(users):
+        data[f"user{i:06d}"] = {
+            'bio': f"Teacher and hiker number {i} who loves astronomy, cooking and chess.",
+            'personal_pool': [{'word': f"word{j}", 'hint': f"A personal hint {j}", 'hint_source': 'api'}
+                              for j in range(10)],
+        }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def run(quick: bool = False, workdir: str = '.') -> List[Dict]:
+    from backend import bio_store
+    sizes = (10, 1000) if quick else (10, 1000, 50000)
+    results = []
+    saved = (bio_store.USERS_BIO_FILE, bio_store.BIO_STORE_BACKEND, bio_store.BIO_STORE_DB_PATH)
+    try:
+        for users in sizes:
+            path = os.path.join(workdir, f"users_bio_{users}.json")
+            make_bio_file(path, users)
+            db_path = os.path.join(workdir, f"bio_store_{users}.sqlite3")
+            bio_store.import_json(path, '', db_path)
+            bio_store.USERS_BIO_FILE = path
+            bio_store.BIO_STORE_DB_PATH = db_path
+            target = f"user{users // 2:06d}"
+            for backend in ('json', 'sqlite'):
+                bio_store.BIO_STORE_BACKEND = backend
+                repeat = 3 if users >= 50000 and backend == 'json' else (10 if quick else 30)
+                params = {'users': users, 'backend': backend, 'file_kb': round(os.path.getsize(path) / 1024)}
+                results.append(bench('bio_store.get_bio', lambda t=target: bio_store.get_bio(t), params, repeat=repeat))
+                results.append(bench('bio_store.get_personal_pool', lambda t=target: bio_store.get_personal_pool(t),
+                                     params, repeat=repeat))
+                results.append(bench('bio_store.set_bio', lambda t=target: bio_store.set_bio(t, "Updated bio text."),
+                                     params, repeat=repeat))
+    finally:
+        bio_store.USERS_BIO_FILE, bio_store.BIO_STORE_BACKEND, bio_store.BIO_STORE_DB_PATH = saved
+    return results
@@ -0,0 +1,60 @@
+"""get_global_leaderboard over synthetic game results logs of increasing size."""
+
+import os
+import json
+import random
+from typing import Dict, List
+
+from .harness import Skip, bench
+
+MODES = ['Fun', 'Wiz', 'Beat']
+CATEGORIES = ['general', 'animals', 'food', 'places', 'music', 'movies', 'flashcard']
+
+
+def make_results_file(path: str, games: int, users: int = 500, seed: int = 1) -> None:
+    """Legacy nickname -> [games] JSON; the app imports it into the .jsonl log on first read."""
+    rng = random.Random(seed)
+    data: Dict[str, List[Dict]] = {}
+    for i in range(games):
+        user = f"user{rng.randrange(users):04d}"
+        data.setdefault(user, []).append({
+            'word': 'garden', 'subject': rng.choice(CATEGORIES), 'mode': rng.choice(MODES),
+            'score': rng.randrange(0, 500), 'duration': rng.randrange(30, 300), 'time_taken': rng.randrange(30, 300),
+            'words_solved': rng.randrange(1, 12), 'nickname': user,
+            'timestamp': f"2025-0{rng.randrange(1, 10)}-1{rng.randrange(0, 10)}T12:00:00+00:00",
+        })
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def _app():
+    try:
+        # streamlit_app runs in Streamlit "bare mode" when imported outside `streamlit run`
+        import streamlit_app
+    except Exception as e:
+        raise Skip(f"streamlit_app unavailable: {e}")
+    return streamlit_app
+
+
+def run(quick: bool = False, workdir: str = '.') -> List[Dict]:
+    app = _app()
+    sizes = (1000, 10000) if quick else (1000, 10000, 100000)
+    results = []
+    saved = app.GAME_RESULTS_PATH
+    try:
+        for games in sizes:
+            path = os.path.join(workdir, f"game_results_{games}.json")
+            make_results_file(path, games)
+            app.GAME_RESULTS_PATH = path
+            params = {'games': games, 'file_kb': round(os.path.getsize(path) / 1024)}
+            app.get_all_game_results()  # one-time legacy import and first parse
+            app._leaderboard_views()  # views built once from the log
+            repeat = 3 if games >= 100000 else (5 if quick else 20)
+            results.append(bench('get_global_leaderboard', lambda: app.get_global_leaderboard(top_n=10),
+                                 dict(params, filter='all'), repeat=repeat))
+            results.append(bench('get_global_leaderboard',
+                                 lambda: app.get_global_leaderboard(top_n=10, mode='Beat', category='animals'),
+                                 dict(params, filter='Beat/animals'), repeat=repeat))
+    finally:
+        app.GAME_RESULTS_PATH = saved
+    return results
@@ -0,0 +1,78 @@
+"""WordSelector hot paths, offline: word selection, rule-based answers, FlashCard extraction."""
+
+import os
+import json
+from typing import Dict, List
+
+from .harness import Skip, bench
+
+LANGUAGES = ['english', 'spanish', 'french', 'arabic', 'chinese']
+
+# One question per answer_question regex family, plus one that falls through to the generic path
+QUESTION_FAMILIES = {
+    'length': "How many letters are in the word?",
+    'first_letter': "What is the first letter?",
+    'last_letter': "What does it end with?",
+    'contains_letter': "Does it contain the letter e?",
+    'category': "What category is it?",
+    'vowels': "How many vowels does it have?",
+    'generic': "Is it something you can eat?",
+}
+
+
+def _selector():
+    # No API key: every path below stays local
+    os.environ['OPENROUTER_API_KEY'] = ''
+    try:
+        from backend.word_selector import WordSelector, use_hints_language
+    except Exception as e:
+        raise Skip(f"backend.word_selector unavailable: {e}")
+    return WordSelector(), use_hints_language
+
+
+def document_text(words: int) -> str:
+    """Deterministic document-sized text built from the English hints corpus."""
+    with open(os.path.join('backend', 'data', 'hints.json'), 'r', encoding='utf-8') as f:
+        templates = json.load(f).get('templates', {})
+    sentences = [h for words_map in templates.values() for hints in words_map.values() for h in hints]
+    out: List[str] = []
+    count = 0
+    i = 0
+    while count < words and sentences:
+        s = sentences[i % len(sentences)]
+        out.append(s)
+        count += len(s.split())
+        i += 1
+    return ' '.join(out)
+
+
+def run(quick: bool = False) -> List[Dict]:
+    selector, use_hints_language = _selector()
+    from backend.hint_corpus import HINTS_FILES_BY_LANGUAGE, get_hint_index
+    repeat = 5 if quick else 30
+    results = []
+
+    for language in LANGUAGES:
+        path = os.path.join('backend', 'data', HINTS_FILES_BY_LANGUAGE[language])
+        if not os.path.exists(path):
+            continue
+        categories = get_hint_index(path).categories()
+        for category in (categories[:2] if quick else categories):
+            def select(language=language, category=category):
+                with use_hints_language(language):
+                    selector.select_word(5, category, username='bench')
+            results.append(bench('select_word', select, {'language': language, 'category': category}, repeat=repeat))
+
+    for family, question in QUESTION_FAMILIES.items():
+        results.append(bench('answer_question', lambda q=question: selector.answer_question('garden', q, 'general'),
+                             {'family': family}, repeat=repeat * 4))
+
+    for words in ((1000,) if quick else (1000, 10000)):
+        text = document_text(words)
+        results.append(bench('_extract_flash_words', lambda t=text: selector._extract_flash_words(t, max_items=10),
+                             {'doc_words': words}, repeat=repeat))
+        targets = selector._extract_flash_words(text, max_items=5) or ['garden']
+        results.append(bench('_make_flash_hint',
+                             lambda t=text, ws=targets: [selector._make_flash_hint(w, t) for w in ws],
+                             {'doc_words': words, 'words': len(targets)}, repeat=repeat))
+    return results
@@ -0,0 +1,60 @@
+"""
+Timing and memory measurement shared by the benchmark suites.
+
+bench() warms up, then repeats the call until `repeat` runs or `budget_s`
+seconds (whichever comes first) and reports min/median/mean/p95/max in ms.
+One extra run under tracemalloc records peak Python allocations. It runs
+separately because tracing slows the timed runs down.
+"""
+
+import gc
+import time
+import statistics
+import tracemalloc
+from typing import Any, Callable, Dict, Optional
+
+
+class Skip(Exception):
+    """Raised by a suite when its dependencies are unavailable."""
+
+
+def _percentile(values, p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))]
+
+
+def bench(name: str, fn: Callable[[], Any], params: Optional[Dict] = None, repeat: int = 20,
+          warmup: int = 2, budget_s: float = 5.0, measure_memory: bool = True) -> Dict:
+    for _ in range(warmup):
+        fn()
+    gc.collect()
+    timings = []
+    deadline = time.perf_counter() + budget_s
+    while len(timings) < repeat and (not timings or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    result = {
+        'name': name,
+        'params': params or {},
+        'runs': len(timings),
+        'min_ms': round(min(timings), 4),
+        'median_ms': round(statistics.median(timings), 4),
+        'mean_ms': round(statistics.fmean(timings), 4),
+        'p95_ms': round(_percentile(timings, 0.95), 4),
+        'max_ms': round(max(timings), 4),
+    }
+    if measure_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result['peak_alloc_kb'] = round(peak / 1024, 1)
+    return result
+
+
+def skipped(name: str, reason: str) -> Dict:
+    return {'name': name, 'params': {}, 'skipped': reason}
@@ -0,0 +1,137 @@
+"""
+Run the offline micro-benchmark suites and write the results as JSON.
+
+    python -m benchmarks.run --out bench/baseline.json
+    python -m benchmarks.run --quick --only word_selector,bio_store
+    python -m benchmarks.run --compare bench/baseline.json --out bench/new.json
+
+No network is used. WordSelector runs without an API key, stores go to a
+scratch directory, and the recent-word store is kept in memory. Suites whose
+dependencies are missing are reported as skipped. --compare matches results
+by (name, params) against an earlier run, flags median regressions above
+--threshold, and exits 1 if it finds any.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+SUITES = ['word_selector', 'bio_store', 'leaderboard']
+
+
+def _configure_env(workdir: str) -> None:
+    os.environ['OPENROUTER_API_KEY'] = ''
+    os.environ['RECENTS_STORE'] = 'memory'
+    os.environ['LLM_CACHE_ENABLED'] = 'false'
+    os.environ['HINT_BANK_ENABLED'] = 'false'
+    os.environ['BEAT_PREFETCH_ENABLED'] = 'false'
+    os.environ['ENABLE_FLASHCARD_BACKGROUND'] = 'false'
+    os.environ['ENABLE_PERSONAL_BACKGROUND'] = 'false'
+    os.environ['GAME_RESULTS_PATH'] = os.path.join(workdir, 'game_results.json')
+    os.environ['USERS_FILE'] = os.path.join(workdir, 'users.json')
+    os.environ['AGGREGATES_PATH'] = os.path.join(workdir, 'aggregates.json')
+    os.environ['USERS_BIO_FILE'] = os.path.join(workdir, 'users_bio.json')
+    os.environ['USERS_FLASH_FILE'] = os.path.join(workdir, 'users.flashcards.json')
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip()
+    except Exception:
+        return ''
+
+
+def _key(result: Dict) -> str:
+    return f"{result['name']} {json.dumps(result.get('params', {}), sort_keys=True)}"
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[Dict]:
+    """Median-time regressions of `current` against `baseline` above `threshold` (0.15 = 15%)."""
+    before = {_key(r): r for r in baseline.get('results', []) if 'median_ms' in r}
+    regressions = []
+    for r in current.get('results', []):
+        old = before.get(_key(r))
+        if not old or 'median_ms' not in r or old['median_ms'] <= 0:
+            continue
+        change = r['median_ms'] / old['median_ms'] - 1.0
+        if change > threshold:
+            regressions.append({'benchmark': _key(r), 'before_ms': old['median_ms'], 'after_ms': r['median_ms'],
+                                'change': round(change, 3)})
+    return regressions
+
+
+def run_suites(names: List[str], quick: bool, workdir: str) -> List[Dict]:
+    from .harness import Skip, skipped
+    results: List[Dict] = []
+    for name in names:
+        started = time.perf_counter()
+        try:
+            if name == 'word_selector':
+                from . import bench_word_selector
+                results.extend(bench_word_selector.run(quick))
+            elif name == 'bio_store':
+                from . import bench_bio_store
+                results.extend(bench_bio_store.run(quick, workdir))
+            elif name == 'leaderboard':
+                from . import bench_leaderboard
+                results.extend(bench_leaderboard.run(quick, workdir))
+        except Skip as e:
+            results.append(skipped(name, str(e)))
+        print(f"[bench] {name} done in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline micro-benchmarks")
+    parser.add_argument('--only', help=f"comma-separated suites ({', '.join(SUITES)})")
+    parser.add_argument('--quick', action='store_true', help='fewer sizes and repeats')
+    parser.add_argument('--out', help='write results JSON here')
+    parser.add_argument('--compare', help='baseline results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.15)
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.only.split(',')] if args.only else SUITES
+    unknown = [n for n in names if n not in SUITES]
+    if unknown:
+        parser.error(f"unknown suites: {unknown}")
+    os.chdir(ROOT)
+    workdir = tempfile.mkdtemp(prefix='wizword-bench-')
+    _configure_env(workdir)
+
+    report = {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'quick': args.quick,
+        },
+        'results': run_suites(names, args.quick, workdir),
+    }
+    exit_code = 0
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            report['regressions'] = compare(json.load(f), report, args.threshold)
+        exit_code = 1 if report['regressions'] else 0
+    text = json.dumps(report, indent=2)
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,315 @@
+"""
+End-to-end load test: N concurrent virtual players running full Beat rounds.
+
+Each virtual user plays --rounds Beat games. A game starts a GameLogic per
+word (select word), asks questions, takes hints and guesses wrong and then
+right for --words-per-round words. At game over it calls
+save_game_to_user_profile and update_aggregates_with_game from
+streamlit_app. LLM calls go to the local OpenRouter stand-in
+(backend/openrouter_stub.py) unless --base-url is given. All data files
+(game results, users, aggregates, SQLite stores) live in a scratch directory.
+
+The report (stdout, and --out as JSON) contains:
+    throughput        games/s and operations/s
+    ops               count, errors, p50/p95/p99/max ms per operation
+    contention        time spent in the unlocked JSON read-modify-write saves, and
+                      lost updates (games saved vs games found in game_results.jsonl)
+    rss               start / peak / end resident set size and growth (MB)
+    question_routing  how questions were answered (local routes vs API) and the local hit rate
+    answer_cache      shared answer cache hits, misses and API calls saved
+
+Optional --apptest K also runs K headless Streamlit AppTest script runs of
+streamlit_app.py and reports their latency as op 'app_script_run'.
+
+    python scripts/loadtest_beat.py --users 20 --rounds 2 --words-per-round 5
+    python scripts/loadtest_beat.py --users 50 --stub-latency-ms 400 --stub-rate-429 0.02 --out load.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+from collections import defaultdict
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+QUESTIONS = [
+    "Is it a living thing?",
+    "Can you find it indoors?",
+    "Does it contain the letter e?",
+    "Is it bigger than a car?",
+    "What is the first letter?",
+]
+CATEGORIES = ['general', 'animals', 'food', 'places', 'music', 'movies']
+
+
+def _rss_mb() -> float:
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except Exception:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))]
+
+
+class Recorder:
+    """Thread-safe per-operation latency and error collection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.error_examples: Dict[str, str] = {}
+
+    def timed(self, op: str, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            with self._lock:
+                self.errors[op] += 1
+                self.error_examples.setdefault(op, f"{type(e).__name__}: {e}")
+            return None
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._lock:
+                self.samples[op].append(elapsed_ms)
+
+    def summary(self) -> Dict:
+        out = {}
+        for op in sorted(set(self.samples) | set(self.errors)):
+            values = self.samples.get(op, [])
+            out[op] = {
+                'count': len(values),
+                'errors': self.errors.get(op, 0),
+                'p50_ms': round(_percentile(values, 0.50), 1),
+                'p95_ms': round(_percentile(values, 0.95), 1),
+                'p99_ms': round(_percentile(values, 0.99), 1),
+                'max_ms': round(max(values), 1) if values else 0.0,
+            }
+            if op in self.error_examples:
+                out[op]['example_error'] = self.error_examples[op]
+        return out
+
+
+class RssSampler(threading.Thread):
+    def __init__(self, interval: float = 0.25):
+        super().__init__(name='rss-sampler', daemon=True)
+        self.interval = interval
+        self.start_mb = _rss_mb()
+        self.peak_mb = self.start_mb
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, _rss_mb())
+
+    def stop(self) -> Dict:
+        self._stop_event.set()
+        end = _rss_mb()
+        self.peak_mb = max(self.peak_mb, end)
+        return {'start_mb': round(self.start_mb, 1), 'peak_mb': round(self.peak_mb, 1),
+                'end_mb': round(end, 1), 'growth_mb': round(end - self.start_mb, 1)}
+
+
+def _configure_env(data_dir: str, base_url: str) -> None:
+    os.environ['OPENROUTER_BASE_URL'] = base_url
+    # WordSelector only calls the API with a key of the form sk-or-...
+    os.environ.setdefault('OPENROUTER_API_KEY', 'sk-or-v1-loadtest')
+    os.environ['GAME_RESULTS_PATH'] = os.path.join(data_dir, 'game_results.json')
+    os.environ['USERS_FILE'] = os.path.join(data_dir, 'users.json')
+    os.environ['AGGREGATES_PATH'] = os.path.join(data_dir, 'aggregates.json')
+    os.environ['RECENTS_DB_PATH'] = os.path.join(data_dir, 'recents.sqlite3')
+    os.environ['LLM_CACHE_PATH'] = os.path.join(data_dir, 'llm_cache.sqlite3')
+    os.environ['ANSWER_CACHE_PATH'] = os.path.join(data_dir, 'answer_cache.sqlite3')
+    os.environ['HINT_BANK_PATH'] = os.path.join(data_dir, 'hint_bank.sqlite3')
+    os.environ['ATTRIBUTE_TABLE_LEARNED_PATH'] = os.path.join(data_dir, 'attributes_learned.sqlite3')
+    os.environ['QUESTION_LOG_PATH'] = os.path.join(data_dir, 'question_log.jsonl')
+    # Background helpers would compete with the measured players
+    os.environ.setdefault('BEAT_PREFETCH_ENABLED', 'false')
+    os.environ.setdefault('ENABLE_FLASHCARD_BACKGROUND', 'false')
+    os.environ.setdefault('ENABLE_PERSONAL_BACKGROUND', 'false')
+
+
+def play_user(user_idx: int, args, rec: Recorder, app, counters: Dict, lock: threading.Lock) -> None:
+    from backend.game_logic import GameLogic
+    rng = random.Random(args.seed * 1000 + user_idx)
+    username = f"loaduser{user_idx:04d}"
+    for _ in range(args.rounds):
+        subject = rng.choice(CATEGORIES)
+        score = 0
+        solved = 0
+        started = time.time()
+        game = None
+        for _ in range(args.words_per_round):
+            game = rec.timed('select_word', GameLogic, word_length=5, subject=subject, mode='Beat', nickname=username,
+                             initial_score=score, difficulty='Medium', username=username, lazy_init=False)
+            if game is None or not getattr(game, 'selected_word', None):
+                continue
+            for q in rng.sample(QUESTIONS, args.questions):
+                rec.timed('ask_question', game.ask_question, q)
+            for _ in range(args.hints):
+                rec.timed('get_hint', game.get_hint)
+            rec.timed('make_guess', game.make_guess, 'x' * len(game.selected_word))
+            result = rec.timed('make_guess', game.make_guess, game.selected_word)
+            if result and result[0]:
+                solved += 1
+            score = game.score
+            if args.think_ms:
+                time.sleep(args.think_ms / 1000.0)
+        if game is None:
+            continue
+        summary = game.get_game_summary()
+        summary.update({'nickname': username, 'words_solved': solved, 'time_taken': max(1, int(time.time() - started))})
+        if app is not None:
+            rec.timed('save_game_to_user_profile', app.save_game_to_user_profile, dict(summary))
+            rec.timed('update_aggregates_with_game', app.update_aggregates_with_game, dict(summary))
+        with lock:
+            counters['games'] += 1
+
+
+def run_apptest(k: int, rec: Recorder) -> None:
+    from streamlit.testing.v1 import AppTest
+    for _ in range(k):
+        def _run():
+            at = AppTest.from_file(os.path.join(ROOT, 'streamlit_app.py'), default_timeout=60)
+            at.run()
+            if at.exception:
+                raise RuntimeError(str(at.exception[0].message))
+        rec.timed('app_script_run', _run)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Concurrent Beat-mode load test")
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--rounds', type=int, default=2)
+    parser.add_argument('--words-per-round', type=int, default=5)
+    parser.add_argument('--questions', type=int, default=2)
+    parser.add_argument('--hints', type=int, default=2)
+    parser.add_argument('--think-ms', type=float, default=0.0, help='pause between words per user')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--base-url', help='use this OpenRouter-compatible endpoint instead of the local stand-in')
+    parser.add_argument('--stub-latency-ms', type=float, default=150.0)
+    parser.add_argument('--stub-rate-429', type=float, default=0.0)
+    parser.add_argument('--stub-rate-5xx', type=float, default=0.0)
+    parser.add_argument('--stub-profile', help='JSON profile for the stand-in (overrides the --stub-* flags)')
+    parser.add_argument('--data-dir', help='scratch directory for data files (default: a new temp dir)')
+    parser.add_argument('--no-app', action='store_true', help='skip streamlit_app persistence calls')
+    parser.add_argument('--apptest', type=int, default=0, help='also run K Streamlit AppTest script runs')
+    parser.add_argument('--out', help='write the JSON report here')
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix='wizword-load-')
+    os.makedirs(data_dir, exist_ok=True)
+    stub = None
+    if args.base_url:
+        base_url = args.base_url
+    else:
+        from backend.openrouter_stub import OpenRouterStub
+        if args.stub_profile:
+            with open(args.stub_profile, 'r', encoding='utf-8') as f:
+                profile = json.load(f)
+        else:
+            profile = {'latency': {'dist': 'lognormal', 'median_ms': args.stub_latency_ms, 'sigma': 0.4},
+                       'rate_429': args.stub_rate_429, 'rate_5xx': args.stub_rate_5xx, 'seed': args.seed}
+        stub = OpenRouterStub(profile).start()
+        base_url = stub.base_url
+    _configure_env(data_dir, base_url)
+
+    app = None
+    if not args.no_app:
+        try:
+            import streamlit_app as app  # runs in Streamlit "bare mode"
+        except Exception as e:
+            print(f"[loadtest] streamlit_app unavailable, skipping persistence ops: {e}", file=sys.stderr)
+
+    rec = Recorder()
+    counters = {'games': 0}
+    lock = threading.Lock()
+    sampler = RssSampler()
+    sampler.start()
+    threads = [threading.Thread(target=play_user, args=(i, args, rec, app, counters, lock), name=f"vu-{i}")
+               for i in range(args.users)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall_s = time.perf_counter() - started
+    if args.apptest:
+        run_apptest(args.apptest, rec)
+    rss = sampler.stop()
+
+    ops = rec.summary()
+    total_ops = sum(v['count'] for v in ops.values())
+    saved_games = ops.get('save_game_to_user_profile', {}).get('count', 0) - \
+        ops.get('save_game_to_user_profile', {}).get('errors', 0)
+    found_games = 0
+    try:
+        from backend.game_results_log import GameResultsLog, log_path_for
+        found_games = GameResultsLog(log_path_for(os.environ['GAME_RESULTS_PATH'])).count()
+    except Exception:
+        pass
+    persist_ms = sum(sum(rec.samples.get(op, [])) for op in ('save_game_to_user_profile', 'update_aggregates_with_game'))
+    report = {
+        'config': {k: v for k, v in vars(args).items() if k != 'out'},
+        'data_dir': data_dir,
+        'wall_s': round(wall_s, 2),
+        'throughput': {'games_per_s': round(counters['games'] / wall_s, 3) if wall_s else 0.0,
+                       'ops_per_s': round(total_ops / wall_s, 2) if wall_s else 0.0,
+                       'games': counters['games']},
+        'ops': ops,
+        'contention': {
+            'persist_time_share': round(persist_ms / 1000.0 / (wall_s * max(1, args.users)), 4) if wall_s else 0.0,
+            'games_saved': saved_games,
+            'games_in_results_file': found_games,
+            'lost_updates': max(0, saved_games - found_games),
+        },
+        'rss': rss,
+    }
+    try:
+        from backend.http_client import get_http_client
+        report['http'] = get_http_client().stats()
+    except Exception:
+        pass
+    try:
+        from backend.question_classifier import routing_stats
+        report['question_routing'] = routing_stats.stats()
+        from backend.answer_cache import get_answer_cache
+        answer_cache = get_answer_cache()
+        if answer_cache is not None:
+            report['answer_cache'] = answer_cache.stats()
+    except Exception:
+        pass
+    if stub is not None:
+        report['stub'] = dict(stub.stats)
+        stub.stop()
+
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if stub is not None and not report['stub'].get('requests'):
+        print("[loadtest] ERROR: the OpenRouter stand-in received 0 requests, so no LLM path was measured. "
+              "Check that OPENROUTER_API_KEY has the sk-or- prefix.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
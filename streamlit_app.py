@@ -193,7 +193,7 @@ def _write_live_sessions(data: dict) -> None:
         pass
 
 # Factory to create a GameLogic instance with Personal category gating
-def create_game_with_env_guard(*, word_length, subject, mode, nickname, difficulty, initial_score=None):
+def create_game_with_env_guard(*, word_length, subject, mode, nickname, difficulty, initial_score=None, prefetched=None):
     try:
         subject = _normalize_category(subject)
     except Exception:
@@ -207,7 +207,8 @@ def create_game_with_env_guard(*, word_length, subject, mode, nickname, difficul
             subject=subject,
             mode=mode,
             nickname=nickname,
-            difficulty=difficulty
+            difficulty=difficulty,
+            prefetched=prefetched
         )
     else:
         return GameLogic(
@@ -216,9 +217,54 @@ def create_game_with_env_guard(*, word_length, subject, mode, nickname, difficul
             mode=mode,
             nickname=nickname,
             difficulty=difficulty,
-            initial_score=initial_score
+            initial_score=initial_score,
+            prefetched=prefetched
         )
 
+def _beat_prefetch_username(game=None) -> str:
+    """Owner of this session's Beat prefetcher; the same key when starting it and when popping from it."""
+    if game is None:
+        game = st.session_state.get('game')
+    return (st.session_state.get('user') or {}).get('username') or getattr(game, 'nickname', '') or 'global'
+
+def _ensure_beat_prefetcher(game) -> None:
+    """Start (or retarget) this session's Beat prefetcher for the game's user/category/language."""
+    try:
+        from backend.prefetch import BeatPrefetcher, prefetch_enabled
+        if not prefetch_enabled() or game is None or getattr(game, 'mode', '') != 'Beat':
+            return
+        pf = st.session_state.get('beat_prefetcher')
+        # Category "any" re-picks the subject every word, so a per-subject deck would be thrown away each round
+        if str(st.session_state.get('original_category_choice') or '').lower() == 'any':
+            if pf is not None:
+                pf.stop()
+                st.session_state.pop('beat_prefetcher', None)
+            return
+        username = _beat_prefetch_username(game)
+        subject = getattr(game, 'subject', 'general')
+        hints_language = st.session_state.get('hints_language', 'english')
+        if pf is None or not pf.is_alive() or not pf.matches(username, subject, hints_language):
+            if pf is not None:
+                pf.stop()
+            pf = BeatPrefetcher(username, subject, hints_language, difficulty=getattr(game, 'difficulty', 'Medium'))
+            st.session_state['beat_prefetcher'] = pf
+        pf.set_current_word(getattr(game, 'selected_word', None))
+    except Exception as e:
+        logger.warning(f"[PREFETCH] could not start prefetcher: {e}")
+
+def _pop_beat_prefetched(subject):
+    """Ready (word, hints) bundle for the next Beat word in `subject`, or None."""
+    try:
+        pf = st.session_state.get('beat_prefetcher')
+        if pf is None:
+            return None
+        username = _beat_prefetch_username()
+        if not pf.matches(username, _normalize_category(subject), st.session_state.get('hints_language', 'english')):
+            return None
+        return pf.pop()
+    except Exception:
+        return None
+
 def heartbeat_live_session(session_id: str, username: str) -> None:
     """Record/refresh a heartbeat for a live Beat session."""
     try:
@@ -302,33 +348,16 @@ def _save_deleted_users(data: dict) -> None:
 
 def _remove_user_bio(username: str) -> None:
     try:
-        if not os.path.exists(USERS_BIO_FILE):
-            return
-        with open(USERS_BIO_FILE, 'r', encoding='utf-8') as f:
-            bio_data = json.load(f)
-        if isinstance(bio_data, dict):
-            key = (username or '').lower()
-            if key in bio_data:
-                bio_data.pop(key, None)
-                with open(USERS_BIO_FILE, 'w', encoding='utf-8') as wf:
-                    json.dump(bio_data, wf, ensure_ascii=False, indent=2)
+        from backend.bio_store import delete_user_record
+        delete_user_record(username)
     except Exception:
         pass
 
 def _purge_user_games(username: str) -> None:
     try:
-        games_path = 'game_results.json'
-        if not os.path.exists(games_path):
-            return
-        with open(games_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        if not isinstance(data, list):
-            return
-        uname = (username or '').lower()
-        filtered = [g for g in data if (str(g.get('nickname','')).lower() != uname)]
-        if len(filtered) != len(data):
-            with open(games_path, 'w', encoding='utf-8') as wf:
-                json.dump(filtered, wf, ensure_ascii=False, indent=2)
+        _game_results_log().delete_user(username)
+        # Top-K views cannot backfill a removed user; regenerate them
+        _leaderboard_views().rebuild(get_all_game_results())
     except Exception:
         pass
 def send_reset_email(to_email, reset_code):
@@ -573,6 +602,12 @@ st.set_page_config(
 
 # st.write("🚨 [DEBUG] THIS IS THE REAL streamlit_app.py - TEST MARKER")
 from backend.game_logic import GameLogic
+try:
+    # One-shot legacy FlashCard migration (no-op once the schema marker exists)
+    from backend.bio_store import ensure_flash_migrated
+    ensure_flash_migrated()
+except Exception:
+    pass
 try:
     from backend.flashcard_worker import start_flashcard_worker
     start_flashcard_worker()
@@ -2132,24 +2167,8 @@ def display_welcome():
         try:
             current_cat = getattr(st.session_state.game, 'subject', None)
             if current_cat:
-                all_games = get_all_game_results()
-                user_highest_sei = {}
-                for g in all_games:
-                    if (g.get('subject', '') or '').lower() != str(current_cat).lower():
-                        continue
-                    score = g.get('score', 0)
-                    time_taken = g.get('time_taken', g.get('duration', 0))
-                    words = g.get('words_solved', 1) if g.get('mode') == 'Beat' else 1
-                    denom = max(int(words or 0), 1)
-                    avg_score = score / denom
-                    avg_time = time_taken / denom
-                    sei = avg_score / avg_time if avg_time > 0 else None
-                    if sei is None:
-                        continue
-                    user = (g.get('nickname', '') or '').lower()
-                    if user not in user_highest_sei or sei > user_highest_sei[user]:
-                        user_highest_sei[user] = sei
-                top3 = sorted(user_highest_sei.items(), key=lambda x: x[1], reverse=True)[:3]
+                # Per-user highest SEI in this category, from the materialized view
+                top3 = [(r['user'], r['sei']) for r in _leaderboard_views().top_sei(str(current_cat), None, 'all', 3)]
                 nice_cat = str(current_cat).replace('_',' ').title()
                 try:
                     _show_top3 = os.getenv('ENABLE_TOP3_LEADERBOARD', 'true').strip().lower() in ('1','true','yes','on')
@@ -2283,28 +2302,9 @@ def display_welcome():
                 resolved_subject = random.choice(["general", "animals", "food", "places", "science", "spanish", "tech", "sports", "brands", "4th_grade", "8th_grade", "cities", "medicines", "anatomy", "psat", "sat", "gre"]) if subject == "any" else subject
                 # --- Global Top 3 by SEI for chosen category (start page) ---
                 try:
-                    all_games = get_all_game_results()
                     chosen_cat = subject.lower()
-                    # Build per-user highest SEI in this category (or all if 'any')
-                    user_highest_sei = {}
-                    for g in all_games:
-                        game_cat = (g.get('subject', '') or '').lower()
-                        if chosen_cat != 'any' and game_cat != chosen_cat:
-                            continue
-                        score = g.get('score', 0)
-                        time_taken = g.get('time_taken', g.get('duration', 0))
-                        words = g.get('words_solved', 1) if g.get('mode') == 'Beat' else 1
-                        denom = max(int(words or 0), 1)
-                        avg_score = score / denom
-                        avg_time = time_taken / denom
-                        sei = avg_score / avg_time if avg_time > 0 else None
-                        if sei is None:
-                            continue
-                        user = (g.get('nickname', '') or '').lower()
-                        if user not in user_highest_sei or sei > user_highest_sei[user]:
-                            user_highest_sei[user] = sei
-                    # Sort and present top 3
-                    top3 = sorted(user_highest_sei.items(), key=lambda x: x[1], reverse=True)[:3]
+                    # Per-user highest SEI in this category (or all if 'any'), from the materialized view
+                    top3 = [(r['user'], r['sei']) for r in _leaderboard_views().top_sei(chosen_cat, None, 'all', 3)]
                     nice_cat = ('All Categories' if chosen_cat == 'any' else subject.replace('_',' ').title())
                     st.markdown(f"""
                     <div style='font-size:1.0em; font-weight:700; color:#fff; margin:0.5em 0 0.25em 0;'>
@@ -2382,20 +2382,8 @@ def display_welcome():
                     token = None
                 if token:
                     try:
-                        import os as _os, json as _json
-                        flash_path = _os.getenv('USERS_FLASH_FILE', 'users.flashcards.json')
-                        users_flash = {}
-                        if _os.path.exists(flash_path):
-                            with open(flash_path, 'r', encoding='utf-8') as f:
-                                users_flash = _json.load(f)
-                        allowed = set()
-                        for un, rec in (users_flash or {}).items():
-                            sets = rec.get('flash_sets') or {}
-                            active = rec.get('flash_active_set')
-                            if isinstance(sets, dict) and active and active in sets:
-                                item = sets.get(active) or {}
-                                if str(item.get('ref_token') or '') == str(token) or str(item.get('token') or '') == str(token):
-                                    allowed.add((un or '').lower())
+                        from backend.bio_store import users_with_active_flash_token
+                        allowed = set(users_with_active_flash_token(token))
                         try:
                             import logging as _lg
                             _lg.getLogger('frontend.top3').info(f"[TOP3] ctx=pregame token={token} allowed_count={len(allowed)}")
@@ -2404,8 +2392,7 @@ def display_welcome():
                         # Always include the current user so their own FlashCard results appear
                         if uname:
                             allowed.add((uname or '').lower())
-                        games = get_all_game_results()
-                        games = [g for g in games if (g.get('subject','').lower() == 'flashcard') and ((g.get('nickname','') or '').lower() in allowed)]
+                        games = [g for u in allowed for g in get_user_game_results(u) if g.get('subject','').lower() == 'flashcard']
                         user_highest = {}
                         user_date = {}
                         for g in games:
@@ -3247,7 +3234,7 @@ def display_game():
                                         try:
                                             from backend.bio_store import get_active_flash_set_name, ensure_flash_set_token, get_flash_set_token
                                             _active_title = get_active_flash_set_name(username_lower) or 'flashcard'
-                                            # Ensure token exists for this set and persist it in users.flashcards.json
+                                            # Ensure token exists for this set and persist it in the flash store
                                             _set_token = ensure_flash_set_token(username_lower, _active_title)
                                         except Exception:
                                             _active_title = 'flashcard'
@@ -4135,6 +4122,7 @@ def display_game():
                     st.session_state['beat_start_time'] = _time.time()
                 except Exception:
                     st.session_state['beat_started'] = True
+                _ensure_beat_prefetcher(st.session_state.get('game'))
                 st.rerun()
             st.session_state['_pregame_start_rendered'] = True
             # My SEI performance collapsible below Start button
@@ -4152,9 +4140,7 @@ def display_game():
                 user = (st.session_state.get('user') or {}).get('username','guest')
                 category_label = game.subject.replace('_',' ')
                 # Use the same loader and filters as Game Over stats
-                all_games = get_all_game_results()
-                nickname = user.lower()
-                user_games = [g for g in all_games if g.get('nickname','').lower() == nickname]
+                user_games = get_user_game_results(user)
                 # Filter to current category (e.g., 'flashcard')
                 curr_subject = str(game.subject).lower()
                 user_games = [g for g in user_games if str(g.get('subject','')).lower() == curr_subject]
@@ -4667,6 +4653,7 @@ def display_game():
                 st.session_state.pop('start_idle_at', None)
                 st.session_state['beat_started'] = True
                 st.session_state['beat_start_time'] = _time.time()
+                _ensure_beat_prefetcher(st.session_state.get('game'))
                 st.rerun()
             # Place FlashCard Settings button AFTER the Start button (single instance)
             st.markdown("<div style='margin-top:8px;'></div>", unsafe_allow_html=True)
@@ -5048,22 +5035,9 @@ def display_game():
                             token = None
                         if token:
                             try:
-                                import os as _os, json as _json
-                                flash_path = _os.getenv('USERS_FLASH_FILE', 'users.flashcards.json')
-                                users_flash = {}
-                                if _os.path.exists(flash_path):
-                                    with open(flash_path, 'r', encoding='utf-8') as f:
-                                        users_flash = _json.load(f)
-                                allowed = set()
-                                for un, rec in (users_flash or {}).items():
-                                    sets = (rec or {}).get('flash_sets') or {}
-                                    active = (rec or {}).get('flash_active_set')
-                                    if isinstance(sets, dict) and active and active in sets:
-                                        item = sets.get(active) or {}
-                                        if str(item.get('ref_token') or '') == str(token) or str(item.get('token') or '') == str(token):
-                                            allowed.add((un or '').lower())
-                                games = get_all_game_results()
-                                games = [g for g in games if (g.get('subject','').lower() == 'flashcard') and ((g.get('nickname','') or '').lower() in allowed)]
+                                from backend.bio_store import users_with_active_flash_token
+                                allowed = set(users_with_active_flash_token(token))
+                                games = [g for u in allowed for g in get_user_game_results(u) if g.get('subject','').lower() == 'flashcard']
                                 user_highest = {}
                                 user_date = {}
                                 for g in games:
@@ -6019,8 +5993,10 @@ def display_game():
                         mode=game.mode,
                         nickname=game.nickname,
                         difficulty=game.difficulty,
-                        initial_score=game.score
+                        initial_score=game.score,
+                        prefetched=_pop_beat_prefetched(new_subject) if game.mode == 'Beat' else None
                     )
+                    _ensure_beat_prefetcher(st.session_state.game)
                     # Clear UI/session for new round
                     st.session_state['show_prev_questions'] = False
                     st.session_state['feedback'] = ''
@@ -6505,8 +6481,10 @@ def display_game():
                 mode=game.mode,
                 nickname=game.nickname,
                 difficulty=game.difficulty,
-                initial_score=game.score
+                initial_score=game.score,
+                prefetched=_pop_beat_prefetched(new_subject) if game.mode == 'Beat' else None
             )
+            _ensure_beat_prefetcher(st.session_state.game)
             st.session_state['current_round_id'] = str(uuid.uuid4())
             st.session_state['feedback'] = ''
             st.session_state['show_word'] = False
@@ -6958,25 +6936,22 @@ def display_game_over(game_summary):
         avg_time_cur = (time_cur / denom_cur) if time_cur else 0
         sei_cur = (avg_score_cur / avg_time_cur) if avg_time_cur > 0 else None
         category = (game_summary.get('subject') or '').lower()
-        games = get_all_game_results()
+        from backend.leaderboard_views import game_sei
+        _cur_ts = game_summary.get('timestamp')
+        _cur_user = (game_summary.get('nickname') or '').lower()
         highest = None
-        for g in games:
+        # Best other player from the category view; the current game (already saved) is
+        # excluded by checking this player's own earlier games instead of their view entry
+        for row in _leaderboard_views().top_sei(category, None, 'all', 2):
+            if row['user'] != _cur_user:
+                highest = row['sei']
+                break
+        for g in get_user_game_results(_cur_user):
             if (g.get('subject','') or '').lower() != category:
                 continue
-            # Exclude the current game result (already saved) from comparison
-            try:
-                _cur_ts = game_summary.get('timestamp')
-                if _cur_ts and g.get('timestamp') == _cur_ts:
-                    continue
-            except Exception:
-                pass
-            s = g.get('score', 0)
-            t = g.get('time_taken', g.get('duration', 0))
-            w = g.get('words_solved', 1) if g.get('mode') == 'Beat' else 1
-            d = max(int(w or 0), 1)
-            asw = s / d
-            atw = (t / d) if t else 0
-            val = (asw / atw) if atw > 0 else None
+            if _cur_ts and g.get('timestamp') == _cur_ts:
+                continue
+            val = game_sei(g)
             if val is not None and (highest is None or val > highest):
                 highest = val
         is_top = False
@@ -7281,8 +7256,7 @@ def display_game_over(game_summary):
         )
         st.markdown(f"### {_uname_stats} performance")
         username = game_summary.get('nickname', '').lower()
-        all_games = get_all_game_results()
-        user_games = [g for g in all_games if g.get('nickname', '').lower() == username]
+        user_games = get_user_game_results(username)
         # Filter user_games to only include games from the running category
         running_category = None
         if 'game' in st.session_state and st.session_state.game:
@@ -7380,9 +7354,8 @@ def display_game_over(game_summary):
             with st.spinner("Generating share card..."):
                 # In display_game_over, before calling create_share_card
                 # Calculate total average score and time per word across all games for the user
-                all_games = get_all_game_results()
                 username = game_summary.get('nickname', '').lower()
-                user_games = [g for g in all_games if g.get('nickname', '').lower() == username]
+                user_games = get_user_game_results(username)
                 total_score = sum(g.get('score', 0) for g in user_games)
                 total_time = sum(g.get('time_taken', g.get('duration', 0)) for g in user_games)
                 total_words = sum(g.get('words_solved', 1) for g in user_games)
@@ -7523,8 +7496,7 @@ def display_game_over(game_summary):
     with stats_leader_tab:
         st.markdown("## 📈 My Historical Stats")
         username = game_summary.get('nickname', '').lower()
-        all_games = get_all_game_results()
-        user_games = [g for g in all_games if g.get('nickname', '').lower() == username]
+        user_games = get_user_game_results(username)
         if user_games:
             col1, col2, col3 = st.columns(3)
             total_games = len(user_games)
@@ -7643,23 +7615,8 @@ def display_game_over(game_summary):
             if token_gc:
                 token_label = f" — Token: {token_gc}"
                 # Build allowed users by active set matching token (ref or owner)
-                import os as _os, json as _json
-                flash_path = _os.getenv('USERS_FLASH_FILE', 'users.flashcards.json')
-                users_flash = {}
-                if _os.path.exists(flash_path):
-                    with open(flash_path, 'r', encoding='utf-8') as f:
-                        users_flash = _json.load(f)
-                allowed_users = set()
-                for un, rec in (users_flash or {}).items():
-                    try:
-                        sets = rec.get('flash_sets') or {}
-                        active = rec.get('flash_active_set')
-                        if isinstance(sets, dict) and active and active in sets:
-                            item = sets.get(active) or {}
-                            if str(item.get('ref_token') or '') == str(token_gc) or str(item.get('token') or '') == str(token_gc):
-                                allowed_users.add((un or '').lower())
-                    except Exception:
-                        continue
+                from backend.bio_store import users_with_active_flash_token
+                allowed_users = set(users_with_active_flash_token(token_gc))
         except Exception:
             token_label = ''
             allowed_users = None
@@ -7987,6 +7944,12 @@ def reset_game():
     ]:
         if key in st.session_state:
             del st.session_state[key]
+    try:
+        _pf = st.session_state.pop('beat_prefetcher', None)
+        if _pf is not None:
+            _pf.stop()
+    except Exception:
+        pass
     st.session_state['game'] = None
     if "game_over" in st.session_state:
         del st.session_state.game_over
@@ -8214,7 +8177,6 @@ def save_game_to_user_profile(game_summary):
     # Skip writes entirely in guest mode
     if st.session_state.get('guest_mode'):
         return
-    game_file = GAME_RESULTS_PATH
     # Ensure timestamp exists
     if 'timestamp' not in game_summary:
         from datetime import datetime, UTC
@@ -8227,28 +8189,16 @@ def save_game_to_user_profile(game_summary):
     for key in ['hints_given', 'max_hints', 'questions_asked', 'available_hints']:
         if key in game_summary:
             del game_summary[key]
-    # Load or initialize grouped results
-    if os.path.exists(game_file):
-        with open(game_file, "r", encoding="utf-8") as f:
-            all_games = json.load(f)
-    else:
-        all_games = {}
-    user = game_summary['nickname']
-    if user not in all_games:
-        all_games[user] = []
-    all_games[user].append(dict(game_summary))
-    with open(game_file, "w", encoding="utf-8") as f:
-        json.dump(all_games, f, indent=2)
-        abs_path = os.path.abspath(game_file)
-        try:
-            mtime = os.path.getmtime(game_file)
-            import datetime
-            mtime_str = datetime.datetime.fromtimestamp(mtime).isoformat()
-        except Exception as e:
-            mtime_str = f"(could not get mtime: {e})"
+    # Append one line to the results log (no read/rewrite of earlier games)
+    results_log = _game_results_log()
+    results_log.append(dict(game_summary))
+    try:
+        _leaderboard_views().add_game(dict(game_summary))
+    except Exception as e:
         import logging
-        logging.info(f"[DEBUG] game_results.json path: {abs_path}, last modified: {mtime_str}")
-        print(f"[DEBUG] game_results.json path: {abs_path}, last modified: {mtime_str}")
+        logging.warning(f"[LEADERBOARD] failed to update views: {e}")
+    import logging
+    logging.info(f"[DEBUG] game results log: {os.path.abspath(results_log.path)}")
 
     # Also persist per-user games count in users.json for admin scalability
     try:
@@ -8297,23 +8247,32 @@ def load_all_users():
         return data if isinstance(data, dict) else {}
     except Exception:
         return {}
+def _game_results_log():
+    from backend.game_results_log import get_game_results_log
+    # Keyed by GAME_RESULTS_PATH so the legacy JSON next to it is imported on first use
+    return get_game_results_log(GAME_RESULTS_PATH)
+
 def get_all_game_results():
-    import os, json
-    game_file = GAME_RESULTS_PATH
-    if not os.path.exists(game_file):
-        return []
-    with open(game_file, "r", encoding="utf-8") as f:
-        all_games = json.load(f)
-    # Flatten to a list of games with user info
-    results = []
-    for user, games in all_games.items():
-        for game in games:
-            game = dict(game)
-            game['nickname'] = user
-            results.append(game)
-    return results
+    # Flat list of games with user info (parsed once per process, then extended from the log tail)
+    return _game_results_log().all_games()
+
+def get_user_game_results(username):
+    # Only this user's games, read via the log's per-user offset index
+    return _game_results_log().user_games(username)
+
+def _leaderboard_views():
+    from backend.leaderboard_views import get_leaderboard_views
+    # Top-K views next to the results log; rebuilt from it when missing
+    return get_leaderboard_views(GAME_RESULTS_PATH)
 
 def get_global_leaderboard(top_n=10, mode=None, category=None, flash_ref_token: str | None = None):
+    if not (category == 'flashcard' and flash_ref_token):
+        try:
+            views = _leaderboard_views()
+            if top_n <= views.k:
+                return views.top_scores(category, mode, 'all', top_n)
+        except Exception:
+            pass
     games = get_all_game_results()
     if mode and mode != "All":
         games = [g for g in games if g.get("mode") == mode]
@@ -8322,23 +8281,8 @@ def get_global_leaderboard(top_n=10, mode=None, category=None, flash_ref_token:
     # If filtering FlashCard by shared token, include only games from users whose active set references that token
     if category == 'flashcard' and flash_ref_token:
         try:
-            import json as _json, os as _os
-            flash_path = _os.getenv('USERS_FLASH_FILE', 'users.flashcards.json')
-            users_flash = {}
-            if _os.path.exists(flash_path):
-                with open(flash_path, 'r', encoding='utf-8') as f:
-                    users_flash = _json.load(f)
-            allowed_users = set()
-            for uname, rec in (users_flash or {}).items():
-                try:
-                    sets = rec.get('flash_sets') or {}
-                    active = rec.get('flash_active_set')
-                    if isinstance(sets, dict) and active and active in sets:
-                        item = sets.get(active) or {}
-                        if str(item.get('ref_token') or '') == str(flash_ref_token):
-                            allowed_users.add(uname)
-                except Exception:
-                    continue
+            from backend.bio_store import users_with_active_flash_token
+            allowed_users = set(users_with_active_flash_token(flash_ref_token, include_owner=False))
             if allowed_users:
                 games = [g for g in games if (g.get('nickname','').lower() in allowed_users)]
         except Exception:
@@ -8589,4 +8533,7 @@ def run_daily_miss_you_check() -> None:
         pass
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    from backend.bio_store import snapshot as bio_snapshot
+    # Every rerun shares one parsed copy of the bio/flash files (writes invalidate it)
+    with bio_snapshot():
+        main()
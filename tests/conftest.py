@@ -0,0 +1,61 @@
+import sys
+import pytest
+
+# Env var -> file name for every store the backend writes by default (repo root or game_data/)
+STORE_PATHS = {
+    'USERS_FILE': 'users.json',
+    'USERS_BIO_FILE': 'users_bio.json',
+    'USERS_FLASH_FILE': 'users.flashcards.json',
+    'BIO_STORE_DB_PATH': 'bio_store.sqlite3',
+    'FLASH_SHARE_FILE': 'flash_shares.json',
+    'GAME_RESULTS_PATH': 'game_results.json',
+    'AGGREGATES_PATH': 'aggregates.json',
+    'RECENTS_DB_PATH': 'recents.sqlite3',
+    'LLM_CACHE_PATH': 'llm_cache.sqlite3',
+    'HINT_BANK_PATH': 'hint_bank.sqlite3',
+    'ANSWER_CACHE_PATH': 'answer_cache.sqlite3',
+    'ATTRIBUTE_TABLE_LEARNED_PATH': 'attributes_learned.sqlite3',
+    'QUESTION_LOG_PATH': 'question_log.jsonl',
+    'QUESTION_CLASSIFIER_PATH': 'question_classifier.npz',
+}
+
+# Paths captured at import time: module -> {attribute: env var}
+MODULE_PATHS = {
+    'backend.bio_store': {'USERS_BIO_FILE': 'USERS_BIO_FILE', 'USERS_FLASH_FILE': 'USERS_FLASH_FILE',
+                          'BIO_STORE_DB_PATH': 'BIO_STORE_DB_PATH'},
+    'backend.flash_share': {'FLASH_SHARE_FILE': 'FLASH_SHARE_FILE'},
+}
+
+# Process-wide singletons that keep the path they were first opened with
+SINGLETONS = {
+    'backend.llm_cache': {'_cache': None, '_cache_failed': False},
+    'backend.hint_bank': {'_bank': None, '_bank_failed': False},
+    'backend.answer_cache': {'_cache': None, '_cache_failed': False},
+    'backend.attribute_table': {'_table': None, '_table_failed': False},
+    'backend.question_classifier': {'_classifier': None, '_classifier_failed': False},
+    'backend.recents_store': {'_store': None},
+    'backend.game_results_log': {'_logs': dict},
+    'backend.leaderboard_views': {'_views': dict},
+}
+
+
+@pytest.fixture(autouse=True)
+def isolated_stores(tmp_path, monkeypatch):
+    """Point every on-disk store at this test's tmp_path so tests never touch repo data."""
+    data_dir = tmp_path / 'stores'
+    data_dir.mkdir()
+    paths = {name: str(data_dir / filename) for name, filename in STORE_PATHS.items()}
+    for name, path in paths.items():
+        monkeypatch.setenv(name, path)
+    # Modules imported later read the env above; patch the ones already loaded
+    for module_name, attrs in MODULE_PATHS.items():
+        module = sys.modules.get(module_name)
+        if module is not None:
+            for attr, env_name in attrs.items():
+                monkeypatch.setattr(module, attr, paths[env_name])
+    for module_name, attrs in SINGLETONS.items():
+        module = sys.modules.get(module_name)
+        if module is not None:
+            for attr, value in attrs.items():
+                monkeypatch.setattr(module, attr, value() if callable(value) else value)
+    return data_dir
@@ -0,0 +1,47 @@
+import time
+import pytest
+from backend.answer_cache import AnswerCache, normalize_question
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.delenv("ANSWER_CACHE_SECRET", raising=False)
+    return AnswerCache(str(tmp_path / "answers.sqlite3"), ttl_s=60, max_entries=100)
+
+
+@pytest.mark.unit
+def test_normalized_questions_share_an_entry(cache):
+    assert normalize_question("  Is it an ANIMAL?? ") == "is it an animal"
+    assert cache.get("tiger", "Is it an animal?") is None
+    assert cache.put("Tiger", "Is it an animal?", "Yes, it is a big cat.")
+    assert cache.get("tiger", "is it  an animal") == "Yes, it is a big cat."
+    assert cache.get("lion", "Is it an animal?") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2 and stats["api_calls_saved"] == 1
+
+
+@pytest.mark.unit
+def test_word_never_stored(cache, tmp_path):
+    assert not cache.put("tiger", "Is it striped?", "Yes, a tiger has stripes.")
+    assert cache.stats()["rejected"] == 1
+    cache.put("tiger", "Is it a cat?", "Yes")
+    for path in tmp_path.glob("answers.sqlite3*"):
+        assert b"tiger" not in path.read_bytes()
+    # The key is keyed by a secret kept outside the database
+    other = AnswerCache(str(tmp_path / "other.sqlite3"), ttl_s=60)
+    assert other.key("tiger", "Is it a cat?") != cache.key("tiger", "Is it a cat?")
+
+
+@pytest.mark.unit
+def test_ttl_and_size_bounds(tmp_path):
+    cache = AnswerCache(str(tmp_path / "answers.sqlite3"), ttl_s=0.05, max_entries=2)
+    cache.put("cat", "q1", "Yes")
+    time.sleep(0.06)
+    assert cache.get("cat", "q1") is None
+    cache.ttl_s = 60
+    for q in ("q1", "q2", "q3"):
+        cache.put("cat", q, "No")
+    cache.get("cat", "q1")
+    cache.evict()
+    assert cache.stats()["entries"] == 2
+    assert cache.get("cat", "q1") == "No" and cache.get("cat", "q2") is None
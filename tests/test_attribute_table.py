@@ -0,0 +1,61 @@
+import json
+import pytest
+from backend.attribute_table import AttributeTable, attributes_from_hints, build_table, match_attribute, merge_learned
+
+
+@pytest.fixture
+def table(tmp_path):
+    path = tmp_path / "attributes.json"
+    path.write_text(json.dumps({"version": 1, "attributes": {"animals": {"eagle": {"alive": True, "can_fly": True}}}}))
+    return AttributeTable(str(path), str(tmp_path / "learned.sqlite3"))
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("question,expected", [
+    ("Is it alive?", ("alive", True)),
+    ("Is it a living thing?", ("alive", True)),
+    ("Can you eat it?", ("edible", True)),
+    ("Is it bigger than a car?", ("bigger_than_car", True)),
+    ("Is it smaller than a car?", ("bigger_than_car", False)),
+    ("Is it natural?", ("man_made", False)),
+    ("Can it fly?", ("can_fly", True)),
+    ("Does it have fur?", None),
+    ("Does it contain the letter a?", None),
+])
+def test_match_attribute(question, expected):
+    assert match_attribute(question) == expected
+
+
+@pytest.mark.unit
+def test_lookup_and_learn(table, tmp_path):
+    assert table.lookup("Animals", "Eagle", "can_fly") is True
+    assert table.lookup("animals", "eagle", "alive", polarity=False) is False
+    assert table.lookup("animals", "eagle", "edible") is None
+
+    assert table.learn_answer("animals", "eagle", "bigger_than_car", False, "Yes, it is much smaller.")
+    assert table.lookup("animals", "eagle", "bigger_than_car") is False
+    assert not table.learn_answer("animals", "eagle", "edible", True, "Some people might.")
+    assert table.lookup("animals", "eagle", "edible") is None
+
+    assert merge_learned(table) == 1
+    data = json.loads((tmp_path / "attributes.json").read_text())
+    assert data["attributes"]["animals"]["eagle"]["bigger_than_car"] is False
+
+
+@pytest.mark.unit
+def test_build_from_hints_keeps_existing_values(tmp_path):
+    path = str(tmp_path / "attributes.json")
+    assert attributes_from_hints("animals", ["A flightless bird from Australia."])["can_fly"] is False
+    corpus = {"animals": {"hawk": ["A bird of prey that soars high."]}, "SAT": {"abate": ["To lessen."]}}
+    stats = build_table(path, corpus, source="hints")
+    assert stats["words"] == 1
+    table = AttributeTable(path)
+    assert table.get("animals", "hawk", "can_fly") is True and table.get("sat", "abate", "alive") is None
+    # Category defaults are guesses: never stored per word, only offered by default()
+    assert table.get("animals", "hawk", "alive") is None
+    assert table.default("Animals", "alive") is True and table.default("animals", "alive", polarity=False) is False
+    assert table.default("sat", "alive") is None
+
+    build_table(path, {"animals": {"hawk": []}}, source="llm", generate=lambda w, c: {"can_fly": False, "has_legs": True})
+    table = AttributeTable(path)
+    assert table.get("animals", "hawk", "can_fly") is True and table.get("animals", "hawk", "has_legs") is True
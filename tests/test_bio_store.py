@@ -0,0 +1,129 @@
+import json
+import threading
+import pytest
+from backend import bio_store
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def store(request, tmp_path, monkeypatch):
+    monkeypatch.setattr(bio_store, "USERS_BIO_FILE", str(tmp_path / "users_bio.json"))
+    monkeypatch.setattr(bio_store, "USERS_FLASH_FILE", str(tmp_path / "users.flashcards.json"))
+    monkeypatch.setattr(bio_store, "BIO_STORE_BACKEND", request.param)
+    monkeypatch.setattr(bio_store, "BIO_STORE_DB_PATH", str(tmp_path / "bio_store.sqlite3"))
+    monkeypatch.setenv("USERS_FILE", str(tmp_path / "users.json"))
+    return bio_store
+
+
+@pytest.mark.unit
+def test_profile_roundtrip(store):
+    store.set_bio("Alice", "Likes chess")
+    store.set_personal_pool("alice", [{"word": "rook"}])
+    assert store.get_bio("ALICE") == "Likes chess"
+    assert store.get_personal_pool("alice") == [{"word": "rook"}]
+    assert store.get_user_record("bob") == {}
+    assert store.delete_user_record("alice") and store.get_bio("alice") == ""
+
+
+@pytest.mark.unit
+def test_flash_sets(store):
+    assert store.upsert_flash_set("alice", "bio", text="cells", pool=[{"word": "cell"}])
+    assert store.get_active_flash_set_name("alice") == "bio"
+    assert store.get_flash_text("alice") == "cells"
+    store.set_flash_pool("alice", [{"word": "gene"}])
+    assert store.get_flash_set_pool("alice", "bio") == [{"word": "gene"}]
+    token = store.get_flash_set_token("alice", "bio")
+    assert token and store.ensure_flash_set_token("alice", "bio") == token
+
+    store.add_flash_set_ref("bob", "shared", token, owner="alice", title="bio")
+    assert store.list_flash_set_names("bob") == ["shared"]
+    assert store.delete_flash_set("alice", "bio")
+    assert store.list_flash_set_names("alice") == [] and store.list_flash_set_names("bob") == []
+    assert not store.delete_flash_set("alice", "bio")
+
+
+@pytest.mark.unit
+def test_flash_token_lookups(store):
+    store.upsert_flash_set("Alice", "bio", pool=[{"word": "cell"}])
+    token = store.get_flash_set_token("alice", "bio")
+    store.add_flash_set_ref("bob", "shared", token, owner="alice", title="bio")
+    store.upsert_flash_set("carol", "other")
+    assert sorted(store.users_with_active_flash_token(token)) == ["alice", "bob"]
+    assert store.users_with_active_flash_token(token, include_owner=False) == ["bob"]
+    assert store.find_flash_set_by_token(token) == ("alice", "bio", [{"word": "cell"}])
+    assert store.find_flash_set_by_token("missing") is None
+
+
+@pytest.mark.unit
+def test_legacy_flash_migration(store):
+    store.update_user_record("carol", {"flash_text": "old text", "flash_pool": [{"word": "x"}]})
+    assert store.get_flash_text("carol") == "old text"
+    assert store.list_flash_set_names("carol") == ["default"]
+
+
+@pytest.mark.unit
+def test_bulk_flash_migration_writes_marker(store, monkeypatch):
+    store.update_user_record("carol", {"flash_text": "old text"})
+    store.update_user_record("dave", {"flash_sets": {"s": {"text": "t"}}})
+    store.upsert_flash_set("erin", "mine", text="kept")
+    store.update_user_record("erin", {"flash_text": "stale"})
+    assert store.flash_schema_version() == 0
+    assert store.migrate_flash_store(batch_size=1) == {"scanned": 3, "migrated": 2, "version": store.FLASH_SCHEMA_VERSION}
+    assert store.flash_schema_version() == store.FLASH_SCHEMA_VERSION
+    assert store.get_flash_text("carol") == "old text"
+    assert store.get_active_flash_set_name("dave") == "s"
+    assert store.get_flash_text("erin") == "kept"
+    # After the marker, legacy fields written later are no longer picked up per call
+    store.update_user_record("frank", {"flash_text": "late"})
+    assert store.get_flash_text("frank") == ""
+    assert store.ensure_flash_migrated()
+
+
+@pytest.mark.unit
+def test_sqlite_concurrent_updates_are_not_lost(store):
+    if store.BIO_STORE_BACKEND != "sqlite":
+        pytest.skip("the JSON engine rewrites the whole file and can lose concurrent writes")
+
+    def worker(i):
+        for j in range(20):
+            store.update_user_record("shared", {f"k{i}_{j}": j})
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(store.get_user_record("shared")) == 80
+
+
+@pytest.mark.unit
+def test_import_export_roundtrip(tmp_path):
+    bio = tmp_path / "users_bio.json"
+    flash = tmp_path / "users.flashcards.json"
+    bio.write_text(json.dumps({"Alice": {"bio": "hi"}, "bob": {"bio": "yo"}}))
+    flash.write_text(json.dumps({"alice": {"flash_sets": {"a": {"text": "t"}}, "flash_active_set": "a"}}))
+    db = str(tmp_path / "store.sqlite3")
+    assert bio_store.import_json(str(bio), str(flash), db) == {"bio": 2, "flash": 1}
+    out_bio, out_flash = tmp_path / "bio.out.json", tmp_path / "flash.out.json"
+    bio_store.export_json(db, str(out_bio), str(out_flash))
+    assert json.loads(out_bio.read_text()) == {"alice": {"bio": "hi"}, "bob": {"bio": "yo"}}
+    assert json.loads(out_flash.read_text())["alice"]["flash_active_set"] == "a"
+
+
+@pytest.mark.unit
+def test_snapshot_parses_once_and_sees_writes(tmp_path, monkeypatch):
+    monkeypatch.setattr(bio_store, "USERS_BIO_FILE", str(tmp_path / "users_bio.json"))
+    monkeypatch.setattr(bio_store, "USERS_FLASH_FILE", str(tmp_path / "users.flashcards.json"))
+    monkeypatch.setattr(bio_store, "BIO_STORE_BACKEND", "json")
+    bio_store.set_bio("alice", "one")
+    loads = []
+    real_load = bio_store._JsonEngine._load
+    monkeypatch.setattr(bio_store._JsonEngine, "_load", lambda self: loads.append(self.path) or real_load(self))
+    with bio_store.snapshot():
+        for _ in range(5):
+            assert bio_store.get_bio("alice") == "one"
+        bio_store.get_user_record("alice")["bio"] = "mutated"
+        assert bio_store.get_bio("alice") == "one"
+        assert loads.count(bio_store.USERS_BIO_FILE) == 1
+        bio_store.set_bio("alice", "two")
+        assert bio_store.get_bio("alice") == "two"
+    assert bio_store._snapshot_state.cache is None
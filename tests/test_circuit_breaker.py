@@ -0,0 +1,47 @@
+import time
+import pytest
+from backend.circuit_breaker import CircuitBreaker, BreakerRegistry, CLOSED, OPEN, HALF_OPEN
+
+
+def _breaker(**kw):
+    params = dict(window_s=60, min_calls=4, error_rate=0.5, slow_call_s=1.0, open_s=0.05)
+    params.update(kw)
+    return CircuitBreaker("m", **params)
+
+
+@pytest.mark.unit
+def test_opens_on_error_rate_and_recovers_via_probe():
+    b = _breaker()
+    for ok in (True, False, True, False):
+        assert b.allow()
+        b.record(ok)
+    assert b.state == OPEN
+    assert not b.allow() and not b.available()
+
+    time.sleep(0.06)
+    assert b.available()
+    assert b.allow() and b.state == HALF_OPEN
+    assert not b.allow()  # only one probe at a time
+    b.record_success(0.1)
+    assert b.state == CLOSED and b.allow()
+
+
+@pytest.mark.unit
+def test_slow_calls_count_and_failed_probe_reopens():
+    b = _breaker()
+    for _ in range(4):
+        b.record_success(latency_s=2.0)
+    assert b.state == OPEN
+    time.sleep(0.06)
+    assert b.allow()
+    b.record_failure()
+    assert b.state == OPEN
+
+
+@pytest.mark.unit
+def test_registry_trip_all():
+    reg = BreakerRegistry()
+    assert reg.any_available(["a", "b"])
+    reg.trip_all(["a", "b"], duration=30, reason="quota")
+    assert not reg.any_available(["a", "b"])
+    assert reg.snapshot()["a"]["state"] == OPEN
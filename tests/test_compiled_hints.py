@@ -0,0 +1,77 @@
+import os
+import json
+import pytest
+from backend import hint_corpus
+from backend.compiled_hints import CompiledHints, compile_hints
+
+
+@pytest.fixture
+def sources(tmp_path):
+    en = tmp_path / "hints.json"
+    en.write_text(json.dumps({
+        "templates": {
+            "general": {"house": ["Provides shelter."], "art": ["Made with skill."]},
+            "SAT": {"abate": ["To lessen.", "To subside."]}
+        }
+    }), encoding="utf-8")
+    es = tmp_path / "hints_es.json"
+    es.write_text(json.dumps({"templates": {"general": {"casa": ["Un hogar."]}}}), encoding="utf-8")
+    return {"english": str(en), "spanish": str(es)}
+
+
+@pytest.mark.unit
+def test_compiled_lookups_match_json(sources, tmp_path):
+    out = tmp_path / "hints.bin"
+    stats = compile_hints(sources, str(out))
+    assert stats["languages"] == 2 and stats["words"] == 4
+
+    reader = CompiledHints(str(out))
+    assert reader.languages() == ["english", "spanish"]
+    view = reader.language("english")
+    json_index = hint_corpus.HintCorpus().get(sources["english"])
+    assert view.subject_key("sat") == json_index.subject_key("sat") == "SAT"
+    assert sorted(view.words("GENERAL")) == sorted(json_index.words("general"))
+    assert view.words_of_length("general", 5) == ("house",)
+    assert view.hints("sat", "abate") == ["To lessen.", "To subside."]
+    assert view.has_word("sat", "abate") and not view.has_word("sat", "zebra")
+    assert view.hints("unknown", "abate") == []
+    assert reader.language("spanish").hints("general", "casa") == ["Un hogar."]
+    assert reader.language("french") is None
+    reader.close()
+
+
+@pytest.mark.unit
+def test_corpus_prefers_fresh_compiled_file(sources, tmp_path, monkeypatch):
+    out = tmp_path / "hints.bin"
+    compile_hints(sources, str(out))
+    monkeypatch.setattr(hint_corpus, "HINTS_COMPILED_PATH", str(out))
+
+    index = hint_corpus.HintCorpus().get(sources["spanish"])
+    assert index.__class__.__name__ == "CompiledHintView"
+    assert index.hints("general", "casa") == ["Un hogar."]
+
+    # A source edited after the build is read from JSON again
+    with open(sources["english"], "w", encoding="utf-8") as f:
+        json.dump({"templates": {"general": {"zebra": []}}}, f)
+    st = os.stat(sources["english"])
+    os.utime(sources["english"], ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    index = hint_corpus.HintCorpus().get(sources["english"])
+    assert index.__class__.__name__ == "HintIndex"
+    assert index.words("general") == ("zebra",)
+
+
+@pytest.mark.unit
+def test_corpus_ignores_compiled_file_for_other_sources(sources, tmp_path, monkeypatch):
+    out = tmp_path / "hints.bin"
+    compile_hints(sources, str(out))
+    monkeypatch.setattr(hint_corpus, "HINTS_COMPILED_PATH", str(out))
+    assert hint_corpus.language_for_hints_file("custom_hints.json") is None
+
+    # Same mtime as the compiled English source, but a different (unknown) file
+    custom = tmp_path / "custom_hints.json"
+    custom.write_text(json.dumps({"templates": {"general": {"zebra": []}}}), encoding="utf-8")
+    st = os.stat(sources["english"])
+    os.utime(custom, ns=(st.st_atime_ns, st.st_mtime_ns))
+    index = hint_corpus.HintCorpus().get(str(custom))
+    assert index.__class__.__name__ == "HintIndex"
+    assert index.words("general") == ("zebra",)
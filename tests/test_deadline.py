@@ -0,0 +1,32 @@
+import time
+import pytest
+from backend.deadline import Deadline, DeadlineExceeded, current_deadline, deadline_scope
+
+
+@pytest.mark.unit
+def test_budget_sleep_and_share():
+    dl = Deadline(0.2)
+    assert not dl.expired() and 0 < dl.remaining() <= 0.2
+    assert dl.sleep(5) is False  # does not fit: returns immediately
+    assert dl.sleep(0.01) is True
+    half = dl.share(0.5)
+    assert half.remaining() <= dl.remaining() / 2 + 0.01
+    assert Deadline(None).remaining() == float("inf")
+    expired = Deadline(0)
+    assert expired.expired()
+    with pytest.raises(DeadlineExceeded):
+        expired.check()
+
+
+@pytest.mark.unit
+def test_scopes_nest_to_the_earliest_deadline(monkeypatch):
+    monkeypatch.setenv("LLM_DEADLINE_ANSWER_S", "0")
+    assert current_deadline().at is None
+    with deadline_scope(0.05, "select_word") as outer:
+        with deadline_scope(None, "answer_question") as inner:
+            # env budget 0 means unbounded, but the outer deadline still applies
+            assert inner is outer
+            assert current_deadline() is outer
+        time.sleep(0.06)
+        assert current_deadline().expired()
+    assert current_deadline().at is None
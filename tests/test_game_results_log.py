@@ -0,0 +1,67 @@
+import json
+import pytest
+from backend.game_results_log import GameResultsLog, log_path_for
+
+
+def _game(user, score, subject="animals"):
+    return {"nickname": user, "score": score, "subject": subject, "mode": "Fun"}
+
+
+@pytest.mark.unit
+def test_append_and_per_user_reads(tmp_path):
+    log = GameResultsLog(str(tmp_path / "games.jsonl"))
+    for i in range(3):
+        log.append(_game("Alice", i))
+        log.append(_game("bob", 10 + i))
+    assert [g["score"] for g in log.user_games("alice")] == [0, 1, 2]
+    assert all(g["nickname"] == "alice" for g in log.user_games("ALICE"))
+    assert log.user_games("carol") == []
+    assert sorted(g["score"] for g in log.all_games()) == [0, 1, 2, 10, 11, 12]
+    with pytest.raises(ValueError):
+        log.append({"score": 1})
+
+
+@pytest.mark.unit
+def test_sees_appends_from_other_writers(tmp_path):
+    path = str(tmp_path / "games.jsonl")
+    reader, writer = GameResultsLog(path), GameResultsLog(path)
+    writer.append(_game("alice", 1))
+    assert len(reader.all_games()) == 1
+    writer.append(_game("alice", 2))
+    with open(path, "ab") as f:
+        f.write(b'{"nickname": "bob", "sco')  # torn append in progress
+    assert [g["score"] for g in reader.user_games("alice")] == [1, 2]
+    assert reader.count() == 2
+
+
+@pytest.mark.unit
+def test_delete_and_compact(tmp_path):
+    path = str(tmp_path / "games.jsonl")
+    log = GameResultsLog(path)
+    log.append(_game("alice", 1))
+    log.append(_game("bob", 2))
+    log.append(_game("alice", 3))
+    log.delete_user("alice")
+    log.append(_game("alice", 4))
+    assert [g["score"] for g in log.all_games()] == [2, 4]
+    result = log.compact()
+    assert result["lines_after"] == 2
+    assert [g["score"] for g in log.user_games("alice")] == [4]
+    # A fresh reader starts from the snapshot written by compaction
+    fresh = GameResultsLog(path)
+    assert sorted(g["score"] for g in fresh.all_games()) == [2, 4]
+    assert fresh.stats()["dead_lines"] == 0
+
+
+@pytest.mark.unit
+def test_auto_compaction_and_legacy_import(tmp_path):
+    legacy = tmp_path / "game_results.json"
+    legacy.write_text(json.dumps({"Alice": [{"score": 5}], "bob": [{"score": 6}, {"score": 7}]}))
+    log = GameResultsLog(log_path_for(str(legacy)), str(legacy), compact_every=2)
+    assert log.path.endswith("game_results.jsonl")
+    assert [g["score"] for g in log.user_games("alice")] == [5]
+    log.delete_user("bob")
+    log.append(_game("carol", 8))
+    log.append(_game("carol", 9))
+    assert log.stats() == {"games": 3, "users": 2, "lines": 3, "dead_lines": 0,
+                           "bytes": log.stats()["bytes"], "deleted_users": 0}
@@ -0,0 +1,98 @@
+import time
+import threading
+import pytest
+from backend.hedging import LatencyTracker, HedgePolicy, hedged_call
+
+
+def _policy(monkeypatch, max_rate="1.0"):
+    monkeypatch.setenv("OPENROUTER_HEDGE_MAX_RATE", max_rate)
+    return HedgePolicy(LatencyTracker())
+
+
+def _slow(value, delay):
+    def call():
+        time.sleep(delay)
+        return value
+    return call
+
+
+@pytest.mark.unit
+def test_fast_primary_is_not_hedged(monkeypatch):
+    policy = _policy(monkeypatch)
+    fallback_calls = []
+    result = hedged_call(lambda: {"who": "primary"}, lambda: fallback_calls.append(1) or {"who": "fallback"},
+                         delay=0.5, policy=policy)
+    assert result == {"who": "primary"} and not fallback_calls
+    assert policy.hedge_rate() == 0.0
+
+
+@pytest.mark.unit
+def test_slow_primary_loses_to_fallback(monkeypatch):
+    policy = _policy(monkeypatch)
+    threads = []
+
+    def primary():
+        threads.append(threading.current_thread().name)
+        time.sleep(0.5)
+        return {"who": "primary"}
+
+    start = time.monotonic()
+    result = hedged_call(primary, _slow({"who": "fallback"}, 0.01), delay=0.05, policy=policy)
+    assert result == {"who": "fallback"}
+    assert time.monotonic() - start < 0.4
+    assert threads and not threads[0].startswith("openrouter-hedge")  # primary never takes a hedge-pool slot
+    assert policy.hedge_rate() == 1.0
+
+
+@pytest.mark.unit
+def test_failed_primary_uses_inflight_hedge(monkeypatch):
+    policy = _policy(monkeypatch)
+
+    def primary():
+        time.sleep(0.3)
+        raise RuntimeError("primary down")
+
+    start = time.monotonic()
+    result = hedged_call(primary, _slow({"who": "fallback"}, 0.2), delay=0.05, policy=policy)
+    assert result == {"who": "fallback"}
+    assert time.monotonic() - start < 0.45  # the hedge ran alongside, not after, the primary
+
+
+@pytest.mark.unit
+def test_invalid_or_failed_winner_waits_for_other(monkeypatch):
+    policy = _policy(monkeypatch)
+
+    def boom():
+        raise RuntimeError("fallback down")
+
+    result = hedged_call(_slow({"choices": [1]}, 0.1), boom, delay=0.01, policy=policy,
+                         is_valid=lambda d: bool(d.get("choices")))
+    assert result == {"choices": [1]}
+
+
+@pytest.mark.unit
+def test_hedge_rate_cap(monkeypatch):
+    policy = _policy(monkeypatch, max_rate="0.5")
+    first = policy.note_request()
+    assert not policy.try_acquire_hedge(first)   # 1/1 would exceed 50%
+    second = policy.note_request()
+    third = policy.note_request()
+    assert policy.try_acquire_hedge(first)       # 1/3, and marks `first`, not the latest entry
+    assert not policy.try_acquire_hedge(first)   # already hedged
+    assert not policy.try_acquire_hedge(third)   # 2/3
+    assert policy.hedge_rate() == pytest.approx(1 / 3)
+    assert policy.try_acquire_hedge(second) is False
+
+
+@pytest.mark.unit
+def test_delay_uses_percentile_once_warm(monkeypatch):
+    monkeypatch.setenv("OPENROUTER_HEDGE_MIN_SAMPLES", "5")
+    monkeypatch.setenv("OPENROUTER_HEDGE_DEFAULT_DELAY_S", "3")
+    monkeypatch.setenv("OPENROUTER_HEDGE_MIN_DELAY_S", "0.1")
+    policy = _policy(monkeypatch)
+    assert policy.delay("m") == 3.0
+    for s in (1.0, 2.0, 3.0, 4.0, 10.0):
+        policy.tracker.record("m", s)
+    assert policy.delay("m") == 10.0
+    monkeypatch.setenv("OPENROUTER_HEDGE_PERCENTILE", "0.5")
+    assert policy.delay("m") == 3.0
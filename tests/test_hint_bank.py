@@ -0,0 +1,52 @@
+import json
+import pytest
+from backend.hint_bank import HintBank
+
+
+@pytest.fixture
+def bank(tmp_path):
+    return HintBank(str(tmp_path / "bank.sqlite3"))
+
+
+@pytest.mark.unit
+def test_put_get_with_provenance(bank):
+    assert bank.get("english", "animals", "zebra") == []
+    bank.put("English", "Animals", "Zebra", ["Striped grazer", "Lives on savannas"], source="api", model="m1")
+    assert bank.get("english", "animals", "zebra") == ["Striped grazer", "Lives on savannas"]
+    entry = bank.get_entry("english", "animals", "zebra")
+    assert entry["source"] == "api" and entry["model"] == "m1"
+    created = entry["created_at"]
+
+    bank.put("english", "animals", "zebra", ["Black and white"], source="batch", model="m2")
+    entry = bank.get_entry("english", "animals", "zebra")
+    assert entry["hints"] == ["Black and white"] and entry["source"] == "batch"
+    assert entry["created_at"] == created and entry["updated_at"] >= created
+
+
+@pytest.mark.unit
+def test_empty_hints_are_not_stored(bank):
+    bank.put("english", "food", "pasta", ["", "  "])
+    assert bank.get_entry("english", "food", "pasta") is None
+
+
+@pytest.mark.unit
+def test_export_import_roundtrip(bank, tmp_path):
+    bank.put("english", "animals", "zebra", ["Striped grazer"], model="m1")
+    bank.put("spanish", "animals", "cebra", ["Tiene rayas"], model="m1")
+    out = str(tmp_path / "bank.jsonl")
+    assert bank.export_jsonl(out) == 2
+    assert bank.export_jsonl(str(tmp_path / "es.jsonl"), language="spanish") == 1
+
+    other = HintBank(str(tmp_path / "other.sqlite3"))
+    assert other.import_file(out) == 2
+    assert other.get_entry("spanish", "animals", "cebra")["model"] == "m1"
+    assert other.stats()["by_language"] == {"english": 1, "spanish": 1}
+
+
+@pytest.mark.unit
+def test_import_corpus_file(bank, tmp_path):
+    path = tmp_path / "hints_fr.json"
+    path.write_text(json.dumps({"templates": {"animals": {"chat": ["Il miaule"], "vide": []}}}), encoding="utf-8")
+    assert bank.import_file(str(path), source="corpus") == 1
+    entry = bank.get_entry("french", "animals", "chat")
+    assert entry["hints"] == ["Il miaule"] and entry["source"] == "corpus"
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+from backend.hint_batch import HintBatchJob, OpenRouterHintGenerator, find_missing, validate_hints
+from backend.hint_bank import HintBank
+from backend.openrouter_stub import OpenRouterStub
+
+
+def _write_corpus(data_dir, name, templates):
+    (data_dir / name).write_text(json.dumps({"templates": templates}), encoding="utf-8")
+
+
+def _fake_generate(word, category, language, n):
+    return [f"{language} clue number {i} about this thing" for i in range(n)]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    d = tmp_path / "data"
+    d.mkdir()
+    _write_corpus(d, "hints.json", {"Zzcat": {"alpha": ["one clue here!", "two clue here!", "three clue here"],
+                                              "beta": []}})
+    _write_corpus(d, "hints_es.json", {"Zzcat": {"alpha": ["una pista aqui"]}})
+    return d
+
+
+@pytest.mark.unit
+def test_validate_hints_drops_leaks_and_duplicates():
+    hints = ["Has four legs and a tail", "Has four legs and a tail", "A zebra is striped", "short", 7]
+    assert validate_hints("zebra", hints, 10) == ["Has four legs and a tail"]
+
+
+@pytest.mark.unit
+def test_find_missing_across_languages(data_dir):
+    tasks = find_missing(["english", "spanish"], str(data_dir), min_hints=3, categories=["zzcat"])
+    assert ("english", "zzcat", "beta") in tasks
+    assert ("english", "zzcat", "alpha") not in tasks
+    assert ("spanish", "zzcat", "alpha") in tasks and ("spanish", "zzcat", "beta") in tasks
+
+
+@pytest.mark.unit
+def test_run_writes_back_and_resumes(data_dir, tmp_path):
+    tasks = find_missing(["english", "spanish"], str(data_dir), min_hints=3, categories=["zzcat"])
+    checkpoint = str(tmp_path / "ckpt.json")
+    bank = HintBank(str(tmp_path / "bank.sqlite3"))
+    calls = []
+
+    def generate(word, category, language, n):
+        calls.append((language, word))
+        if word == "beta" and language == "spanish":
+            return ["beta is beta"]  # leaks the word -> rejected
+        return _fake_generate(word, category, language, n)
+
+    job = HintBatchJob(generate, str(data_dir), checkpoint, n=6, min_valid=5, concurrency=2, flush_every=1,
+                       bank=bank, model="stub")
+    stats = job.run(tasks)
+    assert stats == {"total": 3, "skipped": 0, "ok": 2, "failed": 1}
+
+    es = json.loads((data_dir / "hints_es.json").read_text(encoding="utf-8"))["templates"]["Zzcat"]
+    assert len(es["alpha"]) == 6 and "beta" not in es
+    en = json.loads((data_dir / "hints.json").read_text(encoding="utf-8"))["templates"]["Zzcat"]
+    assert len(en["beta"]) == 6 and len(en["alpha"]) == 3
+    assert bank.get_entry("spanish", "zzcat", "alpha")["source"] == "batch"
+
+    calls.clear()
+    again = HintBatchJob(generate, str(data_dir), checkpoint, n=6, min_valid=5).run(tasks)
+    assert again["skipped"] == 3 and not calls
+    retried = HintBatchJob(generate, str(data_dir), checkpoint, n=6, min_valid=5).run(tasks, retry_failed=True)
+    assert calls == [("spanish", "beta")] and retried["failed"] == 1
+
+
+@pytest.mark.integration
+def test_run_against_local_openrouter_stand_in(data_dir, tmp_path):
+    with OpenRouterStub() as stub:
+        generator = OpenRouterHintGenerator(base_url=stub.base_url, api_key="test", model="stub")
+        tasks = [("english", "zzcat", "beta")]
+        stats = HintBatchJob(generator, str(data_dir), str(tmp_path / "ckpt.json"), n=10).run(tasks)
+    assert stats["ok"] == 1
+    en = json.loads((data_dir / "hints.json").read_text(encoding="utf-8"))["templates"]["Zzcat"]
+    assert len(en["beta"]) == 10 and all("beta" not in h for h in en["beta"])
@@ -0,0 +1,39 @@
+import os
+import json
+import pytest
+from backend.hint_corpus import HintCorpus
+
+
+@pytest.fixture
+def hints_file(tmp_path):
+    path = tmp_path / "hints.json"
+    path.write_text(json.dumps({
+        "templates": {
+            "general": {"art": ["Made with skill."], "house": ["Provides shelter."]},
+            "SAT": {"abate": ["To lessen."]}
+        }
+    }), encoding="utf-8")
+    return path
+
+
+@pytest.mark.unit
+def test_lookups(hints_file):
+    index = HintCorpus().get(str(hints_file))
+    assert index.subject_key("sat") == "SAT"
+    assert index.words("GENERAL") == ("art", "house")
+    assert index.words_of_length("general", 5) == ("house",)
+    assert index.hints("sat", "abate") == ["To lessen."]
+    assert index.hints("unknown", "abate") == []
+
+
+@pytest.mark.unit
+def test_reload_on_mtime_change(hints_file):
+    corpus = HintCorpus()
+    first = corpus.get(str(hints_file))
+    assert corpus.get(str(hints_file)) is first
+    hints_file.write_text(json.dumps({"templates": {"general": {"zebra": []}}}), encoding="utf-8")
+    st = os.stat(hints_file)
+    os.utime(hints_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    second = corpus.get(str(hints_file))
+    assert second is not first
+    assert second.words("general") == ("zebra",)
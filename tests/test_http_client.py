@@ -0,0 +1,51 @@
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from backend.http_client import HttpClient, chat_completions_url
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"choices": [{"message": {"content": "yes"}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+@pytest.mark.unit
+def test_connections_are_reused_and_timed(server):
+    client = HttpClient(pool_size=2, connect_timeout=2, read_timeout=5)
+    first = client.post(f"{server}/chat/completions", json={"model": "m"})
+    second = client.post(f"{server}/chat/completions", json={"model": "m"})
+    assert first.json()["choices"][0]["message"]["content"] == "yes"
+    assert first.timings["reused"] is False and first.timings["connect_ms"] >= 0
+    assert second.timings["reused"] is True
+    stats = client.stats()
+    assert stats["requests"] == 2 and stats["new_connections"] == 1
+    assert "ttfb_ms_p50" in stats
+
+
+@pytest.mark.unit
+def test_base_url_from_env(monkeypatch):
+    monkeypatch.setenv("OPENROUTER_BASE_URL", "http://127.0.0.1:9999/api/v1/")
+    assert chat_completions_url() == "http://127.0.0.1:9999/api/v1/chat/completions"
+    monkeypatch.delenv("OPENROUTER_BASE_URL")
+    assert chat_completions_url() == "https://openrouter.ai/api/v1/chat/completions"
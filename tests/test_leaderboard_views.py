@@ -0,0 +1,68 @@
+import random
+from datetime import datetime, UTC
+import pytest
+from backend.game_results_log import GameResultsLog
+from backend.leaderboard_views import LeaderboardViews, game_sei, get_leaderboard_views, view_key
+
+NOW = datetime(2026, 10, 17, 12, 0, tzinfo=UTC)
+
+
+def _game(user, score, time_taken, subject="animals", mode="Fun", ts="2026-10-17T10:00:00+00:00", words=1):
+    return {"nickname": user, "score": score, "time_taken": time_taken, "subject": subject,
+            "mode": mode, "timestamp": ts, "words_solved": words}
+
+
+@pytest.mark.unit
+def test_game_sei():
+    assert game_sei(_game("a", 100, 50)) == 2.0
+    assert game_sei(_game("a", 100, 50, mode="Beat", words=5)) == 2.0
+    assert game_sei(_game("a", 100, 0)) is None
+
+
+@pytest.mark.unit
+def test_views_match_full_recompute(tmp_path):
+    rng = random.Random(3)
+    games = [_game(f"u{rng.randrange(30)}", rng.randrange(500), rng.randrange(1, 300),
+                   subject=rng.choice(["animals", "food"]), mode=rng.choice(["Fun", "Beat"]),
+                   ts=f"2026-{rng.choice(['09', '10'])}-1{rng.randrange(8)}T10:00:00+00:00",
+                   words=rng.randrange(1, 5)) for _ in range(400)]
+    views = LeaderboardViews(str(tmp_path / "views.json"), k=10)
+    for g in games[:200]:
+        views.add_game(g, now=NOW)
+    views.rebuild(games[:200], now=NOW)  # rebuild == incremental
+    for g in games[200:]:
+        views.add_game(g, now=NOW)
+
+    animals = [g for g in games if g["subject"] == "animals"]
+    expected_scores = sorted(animals, key=lambda g: g["score"], reverse=True)[:5]
+    assert views.top_scores("animals", n=5) == expected_scores
+    best = {}
+    for g in animals:
+        if g["mode"] == "Beat" and g["timestamp"].startswith("2026-10"):
+            best[g["nickname"]] = max(best.get(g["nickname"], 0), game_sei(g))
+    expected_sei = sorted(best.items(), key=lambda x: x[1], reverse=True)[:3]
+    got = views.top_sei("animals", "Beat", "month:2026-10", n=3)
+    assert [(r["user"], r["sei"]) for r in got] == expected_sei
+
+
+@pytest.mark.unit
+def test_windows_and_pruning(tmp_path):
+    views = LeaderboardViews(str(tmp_path / "views.json"), k=5, keep_days=2, keep_months=1)
+    views.add_game(_game("old", 100, 10, ts="2026-09-30T10:00:00+00:00"), now=NOW)
+    views.add_game(_game("new", 50, 10), now=NOW)
+    assert [r["user"] for r in views.top_sei(window="all")] == ["old", "new"]
+    assert [r["user"] for r in views.top_sei("any", "All", "day:2026-10-17")] == ["new"]
+    assert view_key(None, "All", "month:2026-09") not in views._data["views"]
+    # Another instance (another process) sees the same views from disk
+    assert LeaderboardViews(views.path).top_scores(n=1)[0]["nickname"] == "old"
+
+
+@pytest.mark.unit
+def test_bootstrap_from_results_log(tmp_path):
+    results = str(tmp_path / "game_results.json")
+    log = GameResultsLog(str(tmp_path / "game_results.jsonl"))
+    log.append(_game("alice", 10, 5))
+    log.append(_game("bob", 30, 5))
+    views = get_leaderboard_views(results)
+    assert views.games_applied() == 2
+    assert [r["user"] for r in views.top_sei("animals")] == ["bob", "alice"]
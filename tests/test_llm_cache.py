@@ -0,0 +1,64 @@
+import time
+import pytest
+from backend import llm_cache
+from backend.llm_cache import LLMCache, cache_key, ttl_for
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMCache(str(tmp_path / "llm.sqlite3"), max_entries=3)
+
+
+def _resp(text):
+    return {"choices": [{"message": {"content": text}}]}
+
+
+@pytest.mark.unit
+def test_key_is_stable_and_content_addressed():
+    msgs = [{"role": "user", "content": "hi"}]
+    assert cache_key(["a", "b"], msgs) == cache_key(["a", "b"], [{"content": "hi", "role": "user"}])
+    assert cache_key(["a", "b"], msgs) != cache_key(["a", "c"], msgs)
+    assert cache_key(["a"], msgs, {"temperature": 0.2}) != cache_key(["a"], msgs)
+
+
+@pytest.mark.unit
+def test_hit_miss_and_ttl(cache):
+    assert cache.get("k", "answer_question") is None
+    cache.put("k", "answer_question", _resp("yes"), ttl_s=60)
+    assert cache.get("k", "answer_question") == _resp("yes")
+    cache.put("old", "answer_question", _resp("no"), ttl_s=0.01)
+    time.sleep(0.02)
+    assert cache.get("old", "answer_question") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+    assert stats["by_call"]["answer_question"] == {"hits": 1, "misses": 2}
+
+
+@pytest.mark.unit
+def test_lru_eviction_keeps_recently_used(cache):
+    for i in range(3):
+        cache.put(f"k{i}", "get_api_hints", _resp(str(i)), ttl_s=60)
+        time.sleep(0.001)
+    cache.get("k0", "get_api_hints")
+    cache.put("k3", "get_api_hints", _resp("3"), ttl_s=60)
+    cache.evict()
+    assert cache.get("k1", "get_api_hints") is None
+    assert cache.get("k0", "get_api_hints") is not None
+    assert cache.stats()["entries"] == 3
+
+
+@pytest.mark.unit
+def test_shared_across_instances(tmp_path):
+    path = str(tmp_path / "shared.sqlite3")
+    LLMCache(path).put("k", "flash_pool", _resp("x"), ttl_s=60)
+    assert LLMCache(path).get("k", "flash_pool") == _resp("x")
+
+
+@pytest.mark.unit
+def test_ttl_config(monkeypatch):
+    assert ttl_for("select_word") == 0
+    assert ttl_for("answer_question") > 0
+    monkeypatch.setenv("LLM_CACHE_TTL_SELECT_WORD_S", "30")
+    assert ttl_for("select_word") == 30
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    assert llm_cache.get_llm_cache() is None
@@ -0,0 +1,78 @@
+import json
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+from backend.openrouter_stub import OpenRouterStub
+
+
+def _post(stub, messages, model="m"):
+    req = urllib.request.Request(f"{stub.base_url}/chat/completions",
+                                 data=json.dumps({"model": model, "messages": messages}).encode(),
+                                 headers={"Content-Type": "application/json"}, method="POST")
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return resp.status, dict(resp.headers), resp.read()
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), e.read()
+
+
+def _content(raw):
+    return json.loads(raw)["choices"][0]["message"]["content"]
+
+
+@pytest.mark.unit
+def test_templated_responses_match_app_prompts():
+    with OpenRouterStub() as stub:
+        status, headers, raw = _post(stub, [
+            {"role": "system", "content": 'Respond with {"selected_word": "WORD"}.'},
+            {"role": "user", "content": 'Choose a 5-letter English word under the subject "animals".'}])
+        assert status == 200 and len(json.loads(_content(raw))["selected_word"]) == 5
+        assert int(headers["x-ratelimit-remaining"]) == 999
+
+        _, _, raw = _post(stub, [
+            {"role": "system", "content": "Generate exactly 4 short hints for the secret word in the category 'food'."},
+            {"role": "user", "content": "The word is: pasta\nGenerate exactly 4 hints as described."}])
+        hints = json.loads(_content(raw))
+        assert len(hints) == 4 and all(h.endswith(".") and "pasta" not in h for h in hints)
+
+        _, _, raw = _post(stub, [{"role": "user", "content": "The word is: cat\nPlayer's question: Is it alive?\n"}])
+        assert _content(raw).split(",")[0] in ("Yes", "No")
+
+        _, _, raw = _post(stub, [{"role": "user", "content": "Select exactly 2 distinct words. EXACTLY 3 short hints."
+                                                             "\n---\nPhotosynthesis converts sunlight in chloroplasts\n---\n"}])
+        terms = json.loads(_content(raw))
+        assert len(terms) == 2 and all(len(h) == 3 for h in terms.values())
+
+
+@pytest.mark.unit
+def test_responses_are_deterministic():
+    messages = [{"role": "system", "content": '{"selected_word": "WORD"}'},
+                {"role": "user", "content": "Choose a 6-letter English word"}]
+    with OpenRouterStub({"seed": 7}) as a, OpenRouterStub({"seed": 7}) as b:
+        assert _content(_post(a, messages)[2]) == _content(_post(b, messages)[2])
+
+
+@pytest.mark.unit
+def test_fault_profile_injects_429_5xx_and_malformed():
+    profile = {"rate_429": 0.25, "rate_5xx": 0.25, "rate_malformed": 0.25, "seed": 3}
+    with OpenRouterStub(profile) as stub:
+        results = [_post(stub, [{"role": "user", "content": "ping"}]) for _ in range(40)]
+        assert stub.stats["requests"] == 40
+        assert all(stub.stats[k] > 0 for k in ("ok", "429", "5xx", "malformed"))
+    limited = [r for r in results if r[0] == 429]
+    assert all(h["x-ratelimit-remaining"] == "0" and "Retry-After" in h for _, h, _ in limited)
+    assert any(r[0] == 502 for r in results)
+    malformed = [r for r in results if r[0] == 200 and not r[2].rstrip().endswith(b"}")]
+    assert len(malformed) == stub.stats["malformed"]
+    with OpenRouterStub(profile) as again:
+        assert [_post(again, [{"role": "user", "content": "ping"}])[0] for _ in range(40)] == [r[0] for r in results]
+
+
+@pytest.mark.unit
+def test_latency_profile():
+    with OpenRouterStub({"latency": {"dist": "uniform", "min_ms": 50, "max_ms": 80}}) as stub:
+        start = time.monotonic()
+        _post(stub, [{"role": "user", "content": "ping"}])
+        assert 0.05 <= time.monotonic() - start < 1.0
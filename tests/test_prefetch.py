@@ -0,0 +1,65 @@
+import time
+import itertools
+import pytest
+from unittest.mock import patch
+from backend.prefetch import BeatPrefetcher
+
+
+def _wait_ready(pf, n, timeout=2.0):
+    deadline = time.time() + timeout
+    while pf.ready() < n and time.time() < deadline:
+        time.sleep(0.01)
+    return pf.ready()
+
+
+@pytest.mark.unit
+def test_prefetch_fills_queue_and_pops_bundles():
+    words = itertools.cycle(["apple", "apple", "bread", "cheese", "dates"])
+
+    def fake_build(self):
+        return {"word": next(words), "hints": ["h1", "h2"], "subject": self.subject, "created_at": time.time()}
+
+    with patch.object(BeatPrefetcher, "_build_bundle", fake_build):
+        pf = BeatPrefetcher("alice", "general", "english", depth=2)
+        try:
+            assert _wait_ready(pf, 2) == 2
+            first, second = pf.pop(), pf.pop()
+            # Duplicate "apple" was skipped rather than queued twice
+            assert [first["word"], second["word"]] == ["apple", "bread"]
+            assert first["hints"] == ["h1", "h2"]
+            assert pf.matches("ALICE", "General", "English")
+            assert not pf.matches("alice", "science", "english")
+        finally:
+            pf.stop()
+
+
+@pytest.mark.unit
+def test_pop_returns_none_when_nothing_ready():
+    with patch.object(BeatPrefetcher, "_build_bundle", lambda self: None):
+        pf = BeatPrefetcher("bob", "sat", depth=1)
+        try:
+            assert pf.pop() is None
+        finally:
+            pf.stop()
+
+
+@pytest.mark.unit
+def test_bundles_use_a_private_word_selector():
+    from backend.game_logic import GameLogic
+    calls = []
+
+    class FakeGame:
+        def __init__(self, **kwargs):
+            calls.append(kwargs)
+            self.selected_word = "apple"
+            self.available_hints = ["h1"]
+
+    with patch("backend.game_logic.GameLogic", FakeGame), \
+         patch("backend.word_selector.WordSelector", lambda: object()), \
+         patch.object(BeatPrefetcher, "_run", lambda self: None):
+        pf = BeatPrefetcher("carol", "general", depth=1)
+        pf._build_bundle()
+        pf._build_bundle()
+    selectors = {id(kw["word_selector"]) for kw in calls}
+    assert len(selectors) == 1
+    assert calls[0]["word_selector"] is not getattr(GameLogic, "word_selector", None)
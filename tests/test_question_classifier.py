@@ -0,0 +1,93 @@
+import json
+import pytest
+from backend.question_classifier import (
+    DIM, SEED_QUESTIONS, RoutingStats, extract_letter, hash_features, is_category_question,
+    is_length_question, is_presence_question, log_question,
+    read_question_log, weak_label,
+)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("question,label", [
+    ("Does it contain the letter e?", "letter"),
+    ("Is the third letter r?", "letter"),
+    ("How many letters?", "length"),
+    ("What category is it?", "category"),
+    ("Can you eat it?", "attribute"),
+    ("Is it a mammal?", "open"),
+])
+def test_weak_label(question, label):
+    assert weak_label(question) == label
+
+
+@pytest.mark.unit
+def test_features_and_letter_extraction():
+    ids = hash_features("Is there a Z somewhere?")
+    assert ids == hash_features("is there a z somewhere") and all(0 <= i < DIM for i in ids)
+    assert extract_letter("Does the spelling include 'q'?") == "q"
+    assert extract_letter("is there a z somewhere") == "z"
+    assert extract_letter("is x or y in it") is None
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("question,expected", [
+    ("Does the word use the letter q at all?", True),
+    ("Is there a z anywhere in the word?", True),
+    ("Is x somewhere in the spelling?", True),
+    ("Is the second-to-last letter an r?", False),
+    ("Does the word have two o's?", False),
+    ("Does it start with b?", False),
+    ("Does it have a vowel?", False),
+])
+def test_presence_questions(question, expected):
+    assert is_presence_question(question) is expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("question,expected", [
+    ("How many letters does the word have?", True),
+    ("Is it more than 6 letters long?", True),
+    ("How long is the word?", True),
+    ("Does it have more than 3 syllables?", False),
+    ("Is it shorter than the word elephant?", False),
+])
+def test_length_questions(question, expected):
+    assert is_length_question(question) is expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("question,expected", [
+    ("What category is it in?", True),
+    ("Which category does the word belong to?", True),
+    ("Is it in the fruit category?", False),
+])
+def test_category_questions(question, expected):
+    assert is_category_question(question) is expected
+
+
+@pytest.mark.unit
+def test_routing_stats_and_log(tmp_path, monkeypatch):
+    stats = RoutingStats()
+    for route in ("features", "attribute_table", "classifier", "api"):
+        stats.record(route)
+    assert stats.hit_rate() == 0.75 and stats.stats()["total"] == 4
+
+    path = tmp_path / "log.jsonl"
+    monkeypatch.setenv("QUESTION_LOG_PATH", str(path))
+    log_question("Is it red?", "api", "open")
+    assert json.loads(path.read_text())["route"] == "api"
+    assert list(read_question_log(str(path))) == ["Is it red?"]
+
+
+@pytest.mark.unit
+def test_train_predict_roundtrip(tmp_path):
+    pytest.importorskip("numpy")
+    from backend.question_classifier import QuestionClassifier
+    questions = [q for q, _ in SEED_QUESTIONS]
+    labels = [label for _, label in SEED_QUESTIONS]
+    model = QuestionClassifier.train(questions, labels, epochs=30)
+    assert model.accuracy(questions, labels) > 0.9
+    path = str(tmp_path / "model.npz")
+    model.save(path)
+    loaded = QuestionClassifier.load(path)
+    assert loaded.predict("How many letters does it have?")[0] == "length"
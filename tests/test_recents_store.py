@@ -0,0 +1,45 @@
+import pytest
+from backend.recents_store import RecentsStore, _SqliteBackend
+from backend.word_deck import WordDeckStore, deck_key
+
+
+@pytest.mark.unit
+def test_sqlite_state_survives_restart(tmp_path):
+    db = str(tmp_path / "recents.sqlite3")
+    store = RecentsStore(backend=_SqliteBackend(db))
+    store.recent_words["alice:sat"] = ["abate", "zeal"]
+    store.last_words["alice:sat"] = "abate"
+
+    restarted = RecentsStore(backend=_SqliteBackend(db))
+    assert restarted.recent_words.get("alice:sat", []) == ["abate", "zeal"]
+    assert restarted.last_words.get("alice:sat") == "abate"
+    assert restarted.recent_words.get("bob:sat", []) == []
+    assert "bob:sat" not in restarted.last_words
+
+
+@pytest.mark.unit
+def test_lru_is_bounded_and_idle_keys_purged(tmp_path, monkeypatch):
+    store = RecentsStore(backend=_SqliteBackend(str(tmp_path / "r.sqlite3")), cache_size=2, idle_ttl_secs=60)
+    for user in ("a", "b", "c"):
+        store.last_words[f"{user}:general"] = "word"
+    assert store.cached_keys() == 2
+    # Evicted from memory but still durable
+    assert store.last_words.get("a:general") == "word"
+
+    import backend.recents_store as rs
+    real_time = rs.time.time
+    monkeypatch.setattr(rs.time, "time", lambda: real_time() + 3600)
+    assert store.last_words.get("b:general") is None
+    assert store.cached_keys() == 1
+
+
+@pytest.mark.unit
+def test_deck_state_persists_across_processes(tmp_path):
+    db = str(tmp_path / "recents.sqlite3")
+    words = ("apple", "bread", "cheese", "dates")
+    key = deck_key("alice", "english", "general")
+    first = WordDeckStore(persistence=RecentsStore(backend=_SqliteBackend(db)))
+    drawn = [first.draw(key, words), first.draw(key, words)]
+    second = WordDeckStore(persistence=RecentsStore(backend=_SqliteBackend(db)))
+    drawn += [second.draw(key, words), second.draw(key, words)]
+    assert sorted(drawn) == sorted(words)
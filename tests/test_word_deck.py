@@ -0,0 +1,37 @@
+import pytest
+from backend.word_deck import WordDeck, WordDeckStore, deck_key
+
+
+WORDS = ("apple", "bread", "cheese", "dates", "eggs")
+
+
+@pytest.mark.unit
+def test_no_repeats_until_exhausted():
+    deck = WordDeck(len(WORDS), seed=7)
+    first_pass = [deck.draw(WORDS) for _ in WORDS]
+    assert sorted(first_pass) == sorted(WORDS)
+    second_pass = [deck.draw(WORDS) for _ in WORDS]
+    assert sorted(second_pass) == sorted(WORDS)
+    # The reshuffle never starts with the word that was just played
+    assert second_pass[0] != first_pass[-1]
+
+
+@pytest.mark.unit
+def test_state_round_trip_resumes_sequence():
+    deck = WordDeck(len(WORDS), seed=11)
+    deck.draw(WORDS)
+    deck.draw(WORDS)
+    restored = WordDeck.from_state(deck.to_state())
+    assert set(deck.to_state()) == {"seed", "cursor", "epoch", "last", "size"}
+    assert [restored.draw(WORDS) for _ in range(6)] == [deck.draw(WORDS) for _ in range(6)]
+
+
+@pytest.mark.unit
+def test_store_keys_and_avoid():
+    store = WordDeckStore()
+    key = deck_key("Alice", "english", "SAT")
+    assert key == ("alice", "english", "sat", "")
+    drawn = [store.draw(key, WORDS) for _ in WORDS]
+    assert sorted(drawn) == sorted(WORDS)
+    assert store.draw(key, ("solo",), avoid="solo") == "solo"
+    assert store.draw(deck_key("bob", "english", "sat"), ()) is None
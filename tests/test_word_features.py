@@ -0,0 +1,50 @@
+import pytest
+from backend.word_features import WordFeatures, features_for, parse_question, answer_question
+
+
+@pytest.mark.unit
+def test_features_record():
+    f = WordFeatures("Mousse")
+    assert f.word == "mousse" and f.length == 6
+    assert f.first == "m" and f.last == "e"
+    assert f.pattern == "CVVCCV" and f.vowels == 3 and f.consonants == 3
+    assert f.has("s") and not f.has("z")
+    assert f.count("s") == 2 and f.positions["s"] == (4, 5)
+    assert f.has_double and f.has_repeat
+    assert f.letter_at(2) == "o" and f.letter_at(-1) == "e" and f.letter_at(9) == ""
+    assert features_for("mousse") is features_for("mousse")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("question,expected", [
+    ("Does it contain the letter 'e'?", "Yes"),
+    ("Is there an a in it?", "No"),
+    ("How many letters?", "The word has 5 letters"),
+    ("How long is the word?", "The word has 5 letters"),
+    ("What is the length of the word?", "The word has 5 letters"),
+    ("Is it five letters long?", "Yes"),
+    ("Does it have 6 letters?", "No, it does not have 6 letters"),
+    ("How many vowels?", "The word has 3 vowels"),
+    ("How many e's?", "The letter 'e' appears 1 time"),
+    ("Does it have double letters?", "No"),
+    ("Does it start with 'm'?", "Yes, the first letter is 'm'"),
+    ("Does it end in s?", "No, the last letter is not 's'"),
+    ("Is the third letter u?", "Yes, the third letter is 'u'"),
+    ("Is the first letter a vowel?", "No, the first letter is not a vowel"),
+    ("Is the last letter a consonant?", "No, the last letter is not a consonant"),
+    ("Does it start with a consonant?", "Yes, the first letter is a consonant"),
+    ("What is the last letter?", "The last letter is 'e'"),
+    ("What category is it?", "This word belongs to the animals category."),
+])
+def test_answers(question, expected):
+    assert answer_question("mouse", question, "animals") == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("question", [
+    "Is it a mammal?", "Does it have fur?", "Does it have a tail?", "Is it bigger than a car?", "Is it anything like a cat?",
+    "How long does it live?", "How long does it last?", "How long is it?", "What is the length of its tail?",
+    "Is the letter a vowel?",
+])
+def test_semantic_questions_are_not_parsed(question):
+    assert parse_question(question) is None
@@ -1,9 +1,18 @@
 import pytest
 import json
+import time
 from unittest.mock import patch, Mock
 from backend.word_selector import WordSelector
 from backend.fallback_words import FALLBACK_WORDS
 
+@pytest.fixture(autouse=True)
+def no_llm_cache(monkeypatch):
+    # Keep mocked API responses from leaking between tests through the shared response cache
+    monkeypatch.setenv('LLM_CACHE_ENABLED', 'false')
+    # ...and keep test questions out of the question log and answer cache
+    monkeypatch.setenv('QUESTION_LOG_ENABLED', 'false')
+    monkeypatch.setenv('ANSWER_CACHE_ENABLED', 'false')
+
 @pytest.fixture
 def word_selector():
     with patch.dict('os.environ', {'OPENROUTER_API_KEY': 'test_key'}):
@@ -37,7 +46,7 @@ def test_build_prompt():
 
 @pytest.mark.api
 def test_select_word_api_success(word_selector, mock_api_response):
-    with patch('requests.post') as mock_post:
+    with patch('requests.Session.post') as mock_post:
         mock_post.return_value.json.return_value = mock_api_response
         mock_post.return_value.raise_for_status = Mock()
         
@@ -47,7 +56,7 @@ def test_select_word_api_success(word_selector, mock_api_response):
 
 @pytest.mark.api
 def test_select_word_api_failure_fallback(word_selector):
-    with patch('requests.post') as mock_post:
+    with patch('requests.Session.post') as mock_post:
         mock_post.side_effect = Exception("API Error")
         
         word = word_selector.select_word(5, "Animals")
@@ -66,7 +75,7 @@ def test_answer_question(word_selector):
         }]
     }
     
-    with patch('requests.post') as mock_post:
+    with patch('requests.Session.post') as mock_post:
         mock_post.return_value.json.return_value = mock_response
         mock_post.return_value.raise_for_status = Mock()
         
@@ -84,7 +93,7 @@ def test_verify_guess():
 
 @pytest.mark.api
 def test_api_retry_logic(word_selector, mock_api_response):
-    with patch('requests.post') as mock_post:
+    with patch('requests.Session.post') as mock_post:
         # First two calls fail, third succeeds
         mock_post.side_effect = [
             Exception("First failure"),
@@ -97,4 +106,102 @@ def test_api_retry_logic(word_selector, mock_api_response):
         
         word = word_selector.select_word(5, "Animals")
         assert word == "mouse"
-        assert mock_post.call_count == 3 
\ No newline at end of file
+        assert mock_post.call_count == 3
+
+
+@pytest.mark.api
+def test_api_calls_respect_deadline(word_selector):
+    with patch('requests.Session.post') as mock_post, patch('time.sleep'):
+        mock_post.side_effect = Exception("API Error")
+        start = time.monotonic()
+        word = word_selector.select_word(5, "Animals", deadline=0.5)
+        assert word
+        assert time.monotonic() - start < 5
+
+@pytest.mark.unit
+def test_semantic_hint_reads_bank_before_api(word_selector, tmp_path):
+    from backend.hint_bank import HintBank
+    bank = HintBank(str(tmp_path / "bank.sqlite3"))
+    word_selector.current_username = 'global'
+    with patch('backend.word_selector.get_hint_bank', return_value=bank), \
+         patch.object(word_selector, 'get_api_hints', return_value=["Made of folded paper"]) as api:
+        assert word_selector.get_semantic_hint("zzorigami", "zzcrafts") == "Made of folded paper"
+        assert api.call_count == 1
+        assert bank.get_entry("english", "zzcrafts", "zzorigami")["source"] == "api"
+        word_selector._api_hint_cache.clear()
+        assert word_selector.get_semantic_hint("zzorigami", "zzcrafts") == "Made of folded paper"
+        assert api.call_count == 1
+
+@pytest.mark.unit
+def test_game_hint_path_reads_bank_before_api(word_selector, tmp_path):
+    from backend.hint_bank import HintBank
+    bank = HintBank(str(tmp_path / "bank.sqlite3"))
+    bank.put("english", "zzcrafts", "zzorigami", ["Banked hint"], source="batch")
+    word_selector.current_username = 'global'
+    with patch('backend.word_selector.get_hint_bank', return_value=bank), \
+         patch.object(word_selector, 'get_api_hints', return_value=["Fresh hint"]) as api:
+        assert word_selector.get_bank_or_api_hints("zzorigami", "zzcrafts", n=3) == ["Banked hint"]
+        assert word_selector.get_bank_or_api_hints("zzpaper", "zzcrafts", n=3) == ["Fresh hint"]
+        assert api.call_count == 1
+        assert bank.get("english", "zzcrafts", "zzpaper") == ["Fresh hint"]
+
+@pytest.mark.unit
+def test_predicted_letter_intent_only_answers_presence_questions(word_selector):
+    assert word_selector._answer_predicted_intent("garden", "Is the second-to-last letter an r?", "general", "letter") is None
+    assert word_selector._answer_predicted_intent("garden", "Is there an r anywhere in the word?", "general", "letter") == "Yes"
+
+@pytest.mark.unit
+def test_answer_cache_is_used_while_offline(word_selector):
+    cache = Mock()
+    cache.get.return_value = "Yes, it is often kept as a pet."
+    with patch('backend.word_selector.get_answer_cache', return_value=cache), \
+         patch('backend.word_selector.get_question_classifier', return_value=None), \
+         patch.object(word_selector, '_api_available', return_value=False):
+        answer, route, _ = word_selector._route_question("parrot", "Do people keep it at home?", "animals")
+    assert (answer, route) == ("Yes, it is often kept as a pet.", "answer_cache")
+    cache.get.assert_called_once_with("parrot", "Do people keep it at home?")
+
+@pytest.mark.unit
+def test_predicted_length_and_category_intents_need_explicit_phrasing(word_selector):
+    answer = word_selector._answer_predicted_intent
+    assert answer("garden", "Does it have more than 3 syllables?", "general", "length") is None
+    assert answer("garden", "Is it shorter than the word elephant?", "general", "length") is None
+    assert answer("garden", "Is it in the fruit category?", "food", "category") is None
+    assert answer("garden", "How many letters are in the word?", "general", "length") == "The word has 6 letters"
+    assert answer("garden", "What category is it?", "places", "category") == "This word belongs to the places category."
+
+@pytest.mark.unit
+def test_get_api_hints_many_runs_concurrently(word_selector):
+    def slow_hints(word, subject, n=10, attempts=None):
+        time.sleep(0.2)
+        return [f"hint for {word}"]
+
+    seen = []
+    with patch.object(word_selector, 'get_api_hints', side_effect=slow_hints), \
+         patch('backend.openrouter_monitor.get_quota_warning', return_value=None):
+        start = time.monotonic()
+        results = word_selector.get_api_hints_many(["a", "b", "c", "d", "a"], "animals", n=1, concurrency=4,
+                                                   on_result=lambda w, h: seen.append(w))
+        elapsed = time.monotonic() - start
+    assert results == {w: [f"hint for {w}"] for w in "abcd"}
+    assert sorted(seen) == ["a", "b", "c", "d"]
+    assert elapsed < 0.6
+
+@pytest.mark.unit
+def test_get_api_hints_force_leaves_fallback_flag_alone(word_selector):
+    word_selector.use_fallback = True
+    word_selector.api_key, word_selector.api_key_valid = "sk-or-test", True
+    with patch.object(word_selector, '_make_api_request_with_retry', side_effect=Exception("down")) as api:
+        assert word_selector.get_api_hints("cat", "animals", n=1) == []
+        api.assert_not_called()
+        word_selector.get_api_hints_force("cat", "animals", n=1, attempts=1)
+        assert api.called
+    assert word_selector.use_fallback is True
+
+@pytest.mark.unit
+def test_get_api_hints_many_stops_on_critical_quota(word_selector):
+    with patch.object(word_selector, 'get_api_hints_force') as api, \
+         patch('backend.openrouter_monitor.get_quota_warning', return_value={'level': 'error', 'message': 'quota'}):
+        results = word_selector.get_api_hints_many(["a", "b"], "flashcard", n=1, force=True)
+    assert results == {"a": [], "b": []}
+    api.assert_not_called()